@@ -0,0 +1,66 @@
+"""
+Compares the cost of reading the current time at 10,000 calls per second,
+between the offset-aware `clock` and patching the process clock with
+`time_machine`, which Solie used before.
+Run with `python benchmarks/clock_overhead.py` after installing `time-machine`.
+"""
+
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import time_machine
+
+from solie.utility import clock
+
+CALLS_PER_SECOND = 10_000
+SECONDS = 3
+
+
+def measure(function) -> list[float]:
+    # Calls are paced to the target rate instead of being made back to back
+    durations = []
+    interval = 1 / CALLS_PER_SECOND
+    next_call = time.perf_counter()
+    for _ in range(CALLS_PER_SECOND * SECONDS):
+        while time.perf_counter() < next_call:
+            pass
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+        next_call += interval
+    return durations
+
+
+def report(name: str, durations: list[float]):
+    mean = statistics.fmean(durations)
+    p99 = statistics.quantiles(durations, n=100)[98]
+    busy_share = mean * CALLS_PER_SECOND
+    text = f"{name:36} mean {mean * 10**9:7.0f}ns"
+    text += f"  p99 {p99 * 10**9:7.0f}ns  busy {busy_share:.3%}"
+    print(text)  # noqa: T201
+
+
+def main():
+    clock.set_offset(0.25)
+    report("datetime.now", measure(lambda: datetime.now(timezone.utc)))
+    report("time.time", measure(time.time))
+    report("clock.now", measure(clock.now))
+    report("clock.timestamp", measure(clock.timestamp))
+
+    traveller = time_machine.travel(
+        datetime.now(timezone.utc) + timedelta(seconds=0.25)
+    )
+    traveller.start()
+    try:
+        report(
+            "datetime.now under time_machine",
+            measure(lambda: datetime.now(timezone.utc)),
+        )
+        report("time.time under time_machine", measure(time.time))
+    finally:
+        traveller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Measures the time from a decision to the last order acknowledgement
+when orders are placed over REST, one request per order or in batches of five.
+Requests go to a local stand-in server that adds a fixed latency to each one.
+Run with `python -m benchmarks.order_placement_latency` from the package folder.
+"""
+
+import asyncio
+import json
+import statistics
+import time
+
+from solie.definition.api_requester import ApiRequester
+from solie.utility import clock
+from tests.stand_in_binance import StandInBinance
+
+SYMBOL_COUNTS = (1, 10, 50)
+LATENCY = 0.02  # Seconds
+REPEATS = 10
+BATCH_SIZE = 5
+
+
+def make_waves(symbol_count: int) -> list[list[dict]]:
+    # Each symbol gets a market order, a limit order and a stop order,
+    # which are placed in three waves like `Transactor.place_orders` does
+    waves = []
+    for order_type in ("MARKET", "LIMIT", "STOP_MARKET"):
+        wave = []
+        for turn in range(symbol_count):
+            payload = {
+                "timestamp": int(clock.now().timestamp() * 1000),
+                "symbol": f"SYMBOL{turn}USDT",
+                "type": order_type,
+                "side": "BUY",
+                "quantity": 1,
+            }
+            wave.append(payload)
+        waves.append(wave)
+    return waves
+
+
+async def place_singly(api_requester: ApiRequester, wave: list[dict]):
+    await asyncio.gather(
+        *(api_requester.binance("POST", "/fapi/v1/order", payload) for payload in wave)
+    )
+
+
+async def place_in_batches(api_requester: ApiRequester, wave: list[dict]):
+    async def job(payloads: list[dict]):
+        batch_orders = []
+        for payload in payloads:
+            batch_order = {k: str(v) for k, v in payload.items() if k != "timestamp"}
+            batch_orders.append(batch_order)
+        await api_requester.binance(
+            "POST",
+            "/fapi/v1/batchOrders",
+            {
+                "timestamp": int(clock.now().timestamp() * 1000),
+                "batchOrders": json.dumps(batch_orders),
+            },
+        )
+
+    await asyncio.gather(
+        *(
+            job(wave[turn : turn + BATCH_SIZE])
+            for turn in range(0, len(wave), BATCH_SIZE)
+        )
+    )
+
+
+async def measure(place_wave, symbol_count: int) -> list[float]:
+    server = StandInBinance(latency=LATENCY)
+    await server.start()
+    api_requester = ApiRequester()
+    api_requester.futures_url = server.rest_url
+    durations = []
+    try:
+        for _ in range(REPEATS):
+            waves = make_waves(symbol_count)
+            start = time.perf_counter()
+            for wave in waves:
+                await place_wave(api_requester, wave)
+            durations.append(time.perf_counter() - start)
+    finally:
+        await ApiRequester.close_sessions()
+        await server.stop()
+    return durations
+
+
+async def main():
+    for symbol_count in SYMBOL_COUNTS:
+        for name, place_wave in (
+            ("single", place_singly),
+            ("batched", place_in_batches),
+        ):
+            durations = await measure(place_wave, symbol_count)
+            median = statistics.median(durations) * 1000
+            worst = max(durations) * 1000
+            text = f"{symbol_count:3} symbols {name:8}"
+            text += f" median {median:6.1f}ms  max {worst:6.1f}ms"
+            print(text)  # noqa: T201
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
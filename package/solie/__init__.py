@@ -3,7 +3,6 @@ import logging
 import math
 import os
 import sys
-from datetime import datetime, timezone
 from importlib import import_module, metadata
 from inspect import getfile
 from typing import Callable, Coroutine
@@ -16,8 +15,11 @@ from PySide6 import QtCore, QtGui, QtWidgets
 
 from solie import parallel
 from solie.definition.api_requester import ApiRequester
+from solie.definition.chart_cache import ChartCache
+from solie.definition.event_bus import EventBus
 from solie.definition.log_handler import LogHandler
 from solie.definition.percent_axis_item import PercentAxisItem
+from solie.definition.qt_event_loop import QtEventLoopPolicy
 from solie.definition.time_axis_item import TimeAxisItem
 from solie.overlay.coin_selection import CoinSelection
 from solie.overlay.datapath_input import DatapathInput
@@ -25,8 +27,10 @@ from solie.overlay.token_selection import TokenSelection
 from solie.user_interface import Ui_MainWindow
 from solie.utility import (
     check_internet,
+    clock,
     examine_data_files,
     outsource,
+    trace_cycles,
     user_settings,
 )
 from solie.widget.ask_popup import AskPopup
@@ -48,7 +52,7 @@ class Window(QtWidgets.QMainWindow, Ui_MainWindow):
         self.app_close_event = asyncio.Event()
 
         self.price_labels = {}
-        self.last_interaction = datetime.now(timezone.utc)
+        self.last_interaction = clock.now()
 
         self.plot_widget = pyqtgraph.PlotWidget()
         self.plot_widget_1 = pyqtgraph.PlotWidget()
@@ -72,10 +76,12 @@ class Window(QtWidgets.QMainWindow, Ui_MainWindow):
         self.initialize_functions: list[Callable[..., Coroutine]] = []
         self.finalize_functions: list[Callable[..., Coroutine]] = []
         self.scheduler = AsyncIOScheduler(timezone="UTC")
+        self.event_bus = EventBus()
+        self.chart_cache = ChartCache()
 
         self.should_finalize = False
         self.should_confirm_closing = False
-        self.last_interaction = datetime.now(timezone.utc)
+        self.last_interaction = clock.now()
 
     def closeEvent(self, event):  # noqa:N802
         event.ignore()
@@ -119,7 +125,7 @@ class Window(QtWidgets.QMainWindow, Ui_MainWindow):
         asyncio.create_task(job_close())
 
     def mouseReleaseEvent(self, event):  # noqa:N802
-        self.last_interaction = datetime.now(timezone.utc)
+        self.last_interaction = clock.now()
 
         if self.board.isEnabled():
             return
@@ -139,7 +145,6 @@ class Window(QtWidgets.QMainWindow, Ui_MainWindow):
 
     async def live(self):
         asyncio.create_task(self.boot())
-        asyncio.create_task(self.process_app_events())
         await self.app_close_event.wait()
 
     async def boot(self):
@@ -185,6 +190,10 @@ class Window(QtWidgets.QMainWindow, Ui_MainWindow):
         splash_screen = SplashScreen()
         self.centralWidget().layout().addWidget(splash_screen)
 
+        # ■■■■■ Warm up the process pool ■■■■■
+
+        warm_up_task = asyncio.create_task(parallel.warm_up())
+
         # ■■■■■ Start basic things ■■■■■
 
         await user_settings.load()
@@ -925,9 +934,9 @@ class Window(QtWidgets.QMainWindow, Ui_MainWindow):
         # ■■■■■ Finalize functions
 
         self.finalize_functions.append(self.transactor.save_large_data)
-        self.finalize_functions.append(self.transactor.save_scribbles)
         self.finalize_functions.append(self.strategist.save_strategies)
         self.finalize_functions.append(self.collector.save_candle_data)
+        self.finalize_functions.append(ApiRequester.close_sessions)
 
         # ■■■■■ Connect events to functions ■■■■■
 
@@ -936,10 +945,14 @@ class Window(QtWidgets.QMainWindow, Ui_MainWindow):
         outsource.do(self.plot_widget.sigRangeChanged, job)
         job = self.transactor.set_minimum_view_range
         outsource.do(self.plot_widget.sigRangeChanged, job)
+        job = self.transactor.display_candles
+        outsource.do(self.plot_widget.sigRangeChanged, job)
         job = self.simulator.display_range_information
         outsource.do(self.plot_widget_2.sigRangeChanged, job)
         job = self.simulator.set_minimum_view_range
         outsource.do(self.plot_widget_2.sigRangeChanged, job)
+        job = self.simulator.display_candles
+        outsource.do(self.plot_widget_2.sigRangeChanged, job)
 
         # Normal widgets
         job = self.simulator.update_calculation_settings
@@ -1066,8 +1079,23 @@ class Window(QtWidgets.QMainWindow, Ui_MainWindow):
         log_path = f"{datapath}/+logs"
         log_handler = LogHandler(log_path)
         logging.getLogger().addHandler(log_handler)
+        trace_cycles.prepare(f"{datapath}/+traces")
         logger.info("Started up")
 
+        # ■■■■■ Wait for the process pool ■■■■■
+
+        # Warming up only saves time on the first tasks,
+        # so the app goes on without it when it fails.
+        try:
+            await warm_up_task
+        except Exception:
+            logger.exception("Could not warm up the process pool")
+        else:
+            durations = parallel.warm_up_durations.values()
+            text = f"Warmed up {len(durations)} processes in the pool"
+            text += f" taking {min(durations):.3f}s to {max(durations):.3f}s each"
+            logger.info(text)
+
         # ■■■■■ Initialize functions ■■■■■
 
         await asyncio.wait(
@@ -1110,15 +1138,6 @@ class Window(QtWidgets.QMainWindow, Ui_MainWindow):
 
         await self.app_close_event.wait()
 
-    async def process_app_events(self):
-        interval = 1 / 240
-        app_instance = QtCore.QCoreApplication.instance()
-        if app_instance is None:
-            raise ValueError("App instance is none, cannot process events")
-        while True:
-            app_instance.processEvents()
-            await asyncio.sleep(interval)
-
     # show an ask popup and blocks the stack
     async def ask(self, question):
         ask_popup = AskPopup(self, question)
@@ -1187,6 +1206,7 @@ def bring_to_life():
     window.setPalette(dark_palette)
 
     parallel.prepare()
+    asyncio.set_event_loop_policy(QtEventLoopPolicy())
     asyncio.run(window.live())
 
     # ■■■■■ Make sure nothing happens after Solie ■■■■■
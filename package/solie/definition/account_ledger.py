@@ -0,0 +1,185 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+
+def _to_key(symbol: str, order_id) -> tuple[str, int]:
+    return (symbol, int(order_id))
+
+
+class AccountLedger:
+    """
+    Keeps orders placed by automation and fills of the account indexed by
+    symbol and order ID. Fills are buffered here as they arrive
+    and written into the pandas records in batches,
+    so that each fill takes constant time regardless of the record length.
+    """
+
+    def __init__(self):
+        self._auto_order_keys: set[tuple[str, int]] = set()
+        self._fill_times: dict[tuple[str, int], datetime] = {}
+        self._pending_order_rows: list[tuple[datetime, str, int]] = []
+        # Fills are applied in the order they arrived
+        self._pending_fills: list[tuple[str, tuple[str, int], dict]] = []
+        self._pending_fill_times: set[datetime] = set()
+
+    def rebuild(self, auto_order_record: pd.DataFrame, asset_record: pd.DataFrame):
+        self._auto_order_keys = {
+            _to_key(symbol, order_id)
+            for symbol, order_id in zip(
+                auto_order_record["Symbol"], auto_order_record["Order ID"]
+            )
+            if not pd.isna(order_id)
+        }
+        self._fill_times = {}
+        for record_time, symbol, order_id in zip(
+            asset_record.index, asset_record["Symbol"], asset_record["Order ID"]
+        ):
+            if pd.isna(order_id):
+                continue
+            key = _to_key(symbol, order_id)
+            if key not in self._fill_times:
+                self._fill_times[key] = record_time
+
+    def has_pending(self) -> bool:
+        return len(self._pending_order_rows) > 0 or len(self._pending_fills) > 0
+
+    def add_auto_order(self, update_time: datetime, symbol: str, order_id: int):
+        self._auto_order_keys.add(_to_key(symbol, order_id))
+        self._pending_order_rows.append((update_time, symbol, order_id))
+
+    def add_fill(
+        self,
+        event_time: datetime,
+        symbol: str,
+        order_id: int,
+        side: str,
+        fill_price: float,
+        is_maker: bool,
+        margin_ratio: float,
+        revenue: float,
+    ):
+        key = _to_key(symbol, order_id)
+        if key in self._fill_times:
+            # Partial fills of an order are merged into its first record
+            change = {"margin_ratio": margin_ratio, "revenue": revenue}
+            self._pending_fills.append(("existing", key, change))
+            return
+
+        record_time = event_time
+        while record_time in self._pending_fill_times:
+            record_time += timedelta(milliseconds=1)
+        self._pending_fill_times.add(record_time)
+        self._fill_times[key] = record_time
+
+        is_auto_order = key in self._auto_order_keys
+        row = {
+            "record_time": record_time,
+            "Cause": "auto_trade" if is_auto_order else "manual_trade",
+            "Symbol": symbol,
+            "Side": "sell" if side == "SELL" else "buy",
+            "Fill Price": fill_price,
+            "Role": "maker" if is_maker else "taker",
+            "Margin Ratio": margin_ratio,
+            "Order ID": order_id,
+            "revenue": revenue,
+        }
+        self._pending_fills.append(("new", key, row))
+
+    def flush_auto_orders(self, auto_order_record: pd.DataFrame) -> pd.DataFrame:
+        if len(self._pending_order_rows) == 0:
+            return auto_order_record
+
+        taken_times = set()
+        record_times = []
+        for update_time, _, _ in self._pending_order_rows:
+            while update_time in auto_order_record.index or update_time in taken_times:
+                update_time += timedelta(milliseconds=1)
+            taken_times.add(update_time)
+            record_times.append(update_time)
+
+        new_rows = pd.DataFrame(
+            {
+                "Symbol": [r[1] for r in self._pending_order_rows],
+                "Order ID": [r[2] for r in self._pending_order_rows],
+            },
+            index=pd.DatetimeIndex(record_times),
+        )
+        self._pending_order_rows = []
+
+        auto_order_record = pd.concat([auto_order_record, new_rows])
+        return auto_order_record
+
+    def flush_fills(
+        self, asset_record: pd.DataFrame
+    ) -> tuple[pd.DataFrame, list[datetime]]:
+        # Times of the rows that were added or changed are returned as well
+        if len(self._pending_fills) == 0:
+            return asset_record, []
+
+        if len(asset_record) > 0:
+            last_asset = float(asset_record["Result Asset"].iloc[-1])
+        else:
+            last_asset = 0.0
+        added_last_asset = 0.0
+        added_margin_ratios: dict[datetime, float] = {}
+        new_rows: list[dict] = []
+        new_row_positions: dict[tuple[str, int], int] = {}
+
+        for kind, key, content in self._pending_fills:
+            if kind == "existing":
+                if key in new_row_positions:
+                    row = new_rows[new_row_positions[key]]
+                    row["Margin Ratio"] += content["margin_ratio"]
+                else:
+                    recorded_time = self._fill_times[key]
+                    before_ratio = added_margin_ratios.get(recorded_time, 0.0)
+                    added_ratio = before_ratio + content["margin_ratio"]
+                    added_margin_ratios[recorded_time] = added_ratio
+                # Revenue always goes to the latest record
+                if len(new_rows) > 0:
+                    new_rows[-1]["Result Asset"] += content["revenue"]
+                else:
+                    added_last_asset += content["revenue"]
+            else:
+                if len(new_rows) > 0:
+                    before_asset = new_rows[-1]["Result Asset"]
+                else:
+                    before_asset = last_asset + added_last_asset
+                row = content.copy()
+                row["Result Asset"] = before_asset + row.pop("revenue")
+                new_row_positions[key] = len(new_rows)
+                new_rows.append(row)
+
+        self._pending_fills = []
+        self._pending_fill_times = set()
+
+        changed_times = []
+        for recorded_time, added_ratio in added_margin_ratios.items():
+            if recorded_time not in asset_record.index:
+                continue
+            before_ratio = asset_record.at[recorded_time, "Margin Ratio"]
+            asset_record.at[recorded_time, "Margin Ratio"] = before_ratio + added_ratio
+            changed_times.append(recorded_time)
+        if added_last_asset != 0 and len(asset_record) > 0:
+            last_index = asset_record.index[-1]
+            asset_record.at[last_index, "Result Asset"] = last_asset + added_last_asset
+            changed_times.append(last_index)
+
+        if len(new_rows) > 0:
+            taken_times = set()
+            record_times = []
+            for row in new_rows:
+                record_time = row.pop("record_time")
+                key = _to_key(row["Symbol"], row["Order ID"])
+                while record_time in asset_record.index or record_time in taken_times:
+                    record_time += timedelta(milliseconds=1)
+                self._fill_times[key] = record_time
+                taken_times.add(record_time)
+                record_times.append(record_time)
+            new_df = pd.DataFrame(new_rows, index=pd.DatetimeIndex(record_times))
+            new_df = new_df.reindex(columns=asset_record.columns)
+            asset_record = pd.concat([asset_record, new_df])
+            changed_times.extend(record_times)
+
+        return asset_record, changed_times
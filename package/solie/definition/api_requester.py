@@ -1,15 +1,28 @@
 import hashlib
 import hmac
-from datetime import datetime, timezone
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlsplit
 
 import aiohttp
 
 from solie.definition.errors import ApiRequestError
+from solie.definition.request_scheduler import RequestScheduler
+from solie.utility import clock
 
 
 class ApiRequester:
     used_rates = {}
+    scheduler = RequestScheduler()
+
+    # Can be pointed to a stand-in server when measuring
+    spot_url = "https://api.binance.com"
+    futures_url = "https://fapi.binance.com"
+
+    # Connections are kept alive and shared by all requesters, per host
+    connection_limit = 100
+    connection_limit_per_host = 20
+    dns_cache_seconds = 300
+    keepalive_seconds = 60
+    _sessions: dict[str, aiohttp.ClientSession] = {}
 
     def __init__(self):
         self.keys = {
@@ -20,9 +33,47 @@ class ApiRequester:
     def update_keys(self, keys):
         self.keys.update(keys)
 
+    @classmethod
+    def _get_session(cls, url: str) -> aiohttp.ClientSession:
+        split_url = urlsplit(url)
+        origin = f"{split_url.scheme}://{split_url.netloc}"
+        session = cls._sessions.get(origin)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=cls.connection_limit,
+                limit_per_host=cls.connection_limit_per_host,
+                ttl_dns_cache=cls.dns_cache_seconds,
+                keepalive_timeout=cls.keepalive_seconds,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            cls._sessions[origin] = session
+        return session
+
+    @classmethod
+    async def close_sessions(cls, *args, **kwargs):
+        sessions = list(cls._sessions.values())
+        cls._sessions.clear()
+        for session in sessions:
+            await session.close()
+
     async def binance(
-        self, http_method: str, path: str, payload: dict = {}, server="futures"
+        self,
+        http_method: str,
+        path: str,
+        payload: dict = {},
+        server="futures",
+        priority: str | None = None,
     ):
+        # wait for the rate limits, only futures server is scheduled
+        if server == "futures":
+            if priority is None:
+                priority = self.scheduler.guess_priority(http_method, path)
+            await self.scheduler.acquire(http_method, path, priority)
+            # The request may have waited for a new window,
+            # and Binance rejects timestamps older than its receive window
+            if "timestamp" in payload:
+                payload = {**payload, "timestamp": int(clock.now().timestamp() * 1000)}
+
         query_string = urlencode(payload)
         # replace single quote to double quote
         query_string = query_string.replace("%27", "%22")
@@ -35,25 +86,28 @@ class ApiRequester:
         headers = {"X-MBX-APIKEY": self.keys["binance_api"]}
 
         if server == "spot":
-            url = "https://api.binance.com"
+            url = self.spot_url
         elif server == "futures":
-            url = "https://fapi.binance.com"
+            url = self.futures_url
         else:
             raise ApiRequestError("This Binance server is supported")
         url += path
         url += "?" + query_string + "&signature=" + signature
 
-        async with aiohttp.ClientSession() as session:
-            async with session.request(
-                method=http_method, url=url, headers=headers
-            ) as raw_response:
-                response = await raw_response.json()
+        session = self._get_session(url)
+        async with session.request(
+            method=http_method, url=url, headers=headers
+        ) as raw_response:
+            response = await raw_response.json()
+
+        if server == "futures":
+            self.scheduler.observe(raw_response.headers)
 
         # record api usage
         for header_key in raw_response.headers.keys():
             if "X-MBX" in header_key:
                 write_value = raw_response.headers[header_key]
-                current_time = datetime.now(timezone.utc)
+                current_time = clock.now()
                 self.used_rates[header_key] = (write_value, current_time)
 
         # check if the response contains error message
@@ -62,7 +116,7 @@ class ApiRequester:
             error_message = response["msg"]
             text = "There was a problem with Binance API request"
             text += f" (Error {error_code}: {error_message})"
-            raise ApiRequestError(text)
+            raise ApiRequestError(text, code=error_code)
 
         return response
 
@@ -73,9 +127,9 @@ class ApiRequester:
 
         url = "https://api.coingecko.com" + path + "?" + query_string
 
-        async with aiohttp.ClientSession() as session:
-            async with session.request(method=http_method, url=url) as raw_response:
-                response = await raw_response.json()
+        session = self._get_session(url)
+        async with session.request(method=http_method, url=url) as raw_response:
+            response = await raw_response.json()
 
         return response
 
@@ -84,11 +138,11 @@ class ApiRequester:
             "User-agent": "Mozilla/5.0",
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.request(
-                method="GET", url=url, headers=headers
-            ) as raw_response:
-                response = await raw_response.read()
+        session = self._get_session(url)
+        async with session.request(
+            method="GET", url=url, headers=headers
+        ) as raw_response:
+            response = await raw_response.read()
 
         status_code = raw_response.status
         if status_code != 200:
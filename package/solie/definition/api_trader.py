@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import hmac
+import random
+from urllib.parse import urlencode
+
+import aiohttp
+
+import solie
+from solie.definition.api_requester import ApiRequester
+from solie.definition.errors import ApiRequestError
+from solie.utility import clock
+
+# Binance error code for querying an order that was never placed
+ORDER_DOES_NOT_EXIST = -2013
+
+
+class ApiTrader:
+    """
+    Sends orders over a persistent connection to Binance futures WebSocket API.
+    Requests are multiplexed by their IDs, and `ConnectionError` or
+    `asyncio.TimeoutError` is raised when the caller should fall back to REST.
+    """
+
+    def __init__(
+        self,
+        url: str = "wss://ws-fapi.binance.com/ws-fapi/v1",
+        timeout: float = 5,
+    ):
+        self._url = url
+        self._timeout = timeout
+        self._websocket: aiohttp.ClientWebSocketResponse | None = None
+        self._pending_requests: dict[str, asyncio.Future[dict]] = {}
+        self._last_request_id = 0
+        self.keys = {
+            "binance_api": "",
+            "binance_secret": "",
+        }
+        self.session = aiohttp.ClientSession()
+
+        self._websocket_task: asyncio.Task | None = None
+        if url != "":
+            self._websocket_task = asyncio.create_task(self._run_websocket())
+
+    def __del__(self):
+        if not self.session.closed:
+            asyncio.create_task(self._close_self())
+
+    def update_keys(self, keys):
+        self.keys.update(keys)
+
+    def is_connected(self) -> bool:
+        return self._websocket is not None and not self._websocket.closed
+
+    async def _run_websocket(self):
+        while True:
+            try:
+                async with self.session.ws_connect(self._url) as websocket:
+                    solie.logger.info(f"Websocket connected: {self._url}")
+                    self._websocket = websocket
+                    async for received_raw in websocket:
+                        if received_raw.type in (
+                            aiohttp.WSMsgType.CLOSED,
+                            aiohttp.WSMsgType.ERROR,
+                        ):
+                            solie.logger.info(f"Websocket closed: {self._url}")
+                            break
+                        else:
+                            received = received_raw.json()
+                            future = self._pending_requests.pop(received["id"], None)
+                            if future is not None and not future.done():
+                                future.set_result(received)
+                    solie.logger.info(f"Websocket stopped: {self._url}")
+            except Exception as error:
+                # Handle errors that might occur due to network issues
+                solie.logger.exception(f"Websocket error: {error}")
+            finally:
+                self._websocket = None
+                pending_requests = self._pending_requests
+                self._pending_requests = {}
+                for future in pending_requests.values():
+                    if not future.done():
+                        future.set_exception(ConnectionError("Websocket closed"))
+            # Wait for a few seconds before attempting to reconnect
+            await asyncio.sleep(5)
+
+    async def _request(self, method: str, payload: dict) -> dict:
+        websocket = self._websocket
+        if websocket is None or websocket.closed:
+            raise ConnectionError("Websocket is not connected")
+
+        params = {"apiKey": self.keys["binance_api"]}
+        for key, value in payload.items():
+            if isinstance(value, bool):
+                params[key] = "true" if value else "false"
+            else:
+                params[key] = str(value)
+        params = dict(sorted(params.items()))
+        params["signature"] = hmac.new(
+            self.keys["binance_secret"].encode("utf-8"),
+            urlencode(params).encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
+        self._last_request_id += 1
+        request_id = str(self._last_request_id)
+        future = asyncio.get_running_loop().create_future()
+        self._pending_requests[request_id] = future
+
+        try:
+            await websocket.send_json(
+                {
+                    "id": request_id,
+                    "method": method,
+                    "params": params,
+                }
+            )
+            response = await asyncio.wait_for(future, self._timeout)
+        finally:
+            self._pending_requests.pop(request_id, None)
+
+        # Throttling of REST requests should know about orders sent here
+        ApiRequester.scheduler.observe_rate_limits(response.get("rateLimits", []))
+
+        if response["status"] != 200:
+            error_code = response["error"]["code"]
+            error_message = response["error"]["msg"]
+            text = "There was a problem with Binance API request"
+            text += f" (Error {error_code}: {error_message})"
+            raise ApiRequestError(text, code=error_code)
+
+        return response["result"]
+
+    async def place_order(self, payload: dict) -> dict:
+        return await self._request("order.place", payload)
+
+    async def cancel_order(self, payload: dict) -> dict:
+        return await self._request("order.cancel", payload)
+
+    async def place_order_with_failover(
+        self, payload: dict, api_requester: ApiRequester
+    ) -> dict:
+        # Places the order over REST when the websocket fails.
+        # Binance only rejects a reused client order ID while that order is open,
+        # so an order that was filled before its ack got lost is looked up
+        # instead of being sent again.
+        client_order_id = f"solie_{random.getrandbits(96):024x}"
+        payload = {**payload, "newClientOrderId": client_order_id}
+        try:
+            return await self.place_order(payload)
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+
+        try:
+            return await api_requester.binance(
+                http_method="GET",
+                path="/fapi/v1/order",
+                payload={
+                    "timestamp": int(clock.now().timestamp() * 1000),
+                    "symbol": payload["symbol"],
+                    "origClientOrderId": client_order_id,
+                },
+            )
+        except ApiRequestError as error:
+            if error.code != ORDER_DOES_NOT_EXIST:
+                raise
+
+        # The original timestamp can be as old as the websocket timeout
+        payload["timestamp"] = int(clock.now().timestamp() * 1000)
+        return await api_requester.binance(
+            http_method="POST",
+            path="/fapi/v1/order",
+            payload=payload,
+        )
+
+    async def close(self):
+        # Stops reconnecting, and pending requests fail with `ConnectionError`
+        if self._websocket_task is not None:
+            self._websocket_task.cancel()
+            try:
+                await self._websocket_task
+            except asyncio.CancelledError:
+                pass
+        await self._close_self()
+
+    async def _close_self(self):
+        await self.session.close()
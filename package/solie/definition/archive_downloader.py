@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+import os
+
+import aiofiles
+import aiohttp
+
+import solie
+
+
+def _hash_file(filepath: str) -> str:
+    hasher = hashlib.sha256()
+    with open(filepath, "rb") as file:
+        while True:
+            content = file.read(2**20)
+            if len(content) == 0:
+                break
+            hasher.update(content)
+    return hasher.hexdigest()
+
+
+class ArchiveDownloader:
+    """
+    Downloads data archives of Binance into a cache folder
+    over a limited number of connections.
+    Archives are verified against their published checksums,
+    and interrupted downloads are resumed from where they stopped.
+    URLs of archives that couldn't be downloaded are kept in `failed_urls`.
+    """
+
+    def __init__(self, cachepath: str, connection_count: int = 8):
+        self._cachepath = cachepath
+        os.makedirs(cachepath, exist_ok=True)
+        connector = aiohttp.TCPConnector(limit=connection_count)
+        self._session = aiohttp.ClientSession(connector=connector)
+        self.downloaded_bytes = 0
+        self.failed_urls: list[str] = []
+
+    async def close(self):
+        await self._session.close()
+
+    def _report_failure(self, url: str, last_error: str):
+        self.failed_urls.append(url)
+        solie.logger.warning(f"Could not download {url}\n{last_error}")
+
+    async def _get_checksum(self, url: str) -> str | None:
+        # Published archives don't change, so their checksums are kept as well
+        archive_name = url.rsplit("/", 1)[1].removesuffix(".zip")
+        checksum_path = f"{self._cachepath}/{archive_name}.CHECKSUM"
+        if os.path.isfile(checksum_path):
+            async with aiofiles.open(checksum_path, "r") as file:
+                content = await file.read()
+            return content.split()[0]
+
+        last_error = ""
+        for _ in range(5):
+            try:
+                async with self._session.get(url + ".CHECKSUM") as response:
+                    if response.status == 404:
+                        # when the archive is not published
+                        return
+                    response.raise_for_status()
+                    content = await response.text()
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                last_error = repr(error)
+        else:
+            self._report_failure(url, f"Checksum is unavailable: {last_error}")
+            return
+
+        async with aiofiles.open(checksum_path + ".new", "w") as file:
+            await file.write(content)
+        os.replace(checksum_path + ".new", checksum_path)
+        return content.split()[0]
+
+    async def download(self, url: str) -> str | None:
+        # Returns the checksum, which is also the name of the cached archive
+        checksum = await self._get_checksum(url)
+        if checksum is None:
+            return
+
+        archive_path = f"{self._cachepath}/{checksum}.zip"
+        if os.path.isfile(archive_path):
+            return checksum
+
+        partial_path = archive_path + ".part"
+        loop = asyncio.get_running_loop()
+        last_error = ""
+        for _ in range(5):
+            try:
+                # Continue from where the last download stopped
+                downloaded_size = 0
+                if os.path.isfile(partial_path):
+                    downloaded_size = os.path.getsize(partial_path)
+                headers = {}
+                if downloaded_size > 0:
+                    headers["Range"] = f"bytes={downloaded_size}-"
+                async with self._session.get(url, headers=headers) as response:
+                    if response.status != 416:
+                        # 416 means that the file was already complete
+                        response.raise_for_status()
+                        file_mode = "ab" if response.status == 206 else "wb"
+                        async with aiofiles.open(partial_path, file_mode) as file:
+                            async for chunk in response.content.iter_chunked(2**16):
+                                await file.write(chunk)
+                                self.downloaded_bytes += len(chunk)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                last_error = repr(error)
+                continue
+
+            if not os.path.isfile(partial_path):
+                last_error = "Nothing was received"
+                continue
+            if await loop.run_in_executor(None, _hash_file, partial_path) == checksum:
+                os.replace(partial_path, archive_path)
+                return checksum
+            else:
+                last_error = "Checksum didn't match"
+                os.remove(partial_path)
+
+        self._report_failure(url, last_error)
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+SLOT_NANOSECONDS = 10 * 10**9
+
+
+class CandleAssembler:
+    """
+    Collects candle data frames of a fixed period into one preallocated array.
+    Each frame is written at the offset of its 10-second slots,
+    so the cost of adding a frame doesn't grow with the amount already added.
+    """
+
+    def __init__(
+        self, columns: pd.MultiIndex, moment_from: datetime, moment_until: datetime
+    ):
+        # `moment_until` is exclusive
+        self._columns = columns
+        self._start_slot = int(moment_from.timestamp() * 10**9) // SLOT_NANOSECONDS
+        end_slot = int(moment_until.timestamp() * 10**9) // SLOT_NANOSECONDS
+        self._slot_count = max(end_slot - self._start_slot, 0)
+        self._values = np.full(
+            (self._slot_count, len(columns)), np.nan, dtype=np.float32
+        )
+        self._column_positions = {c: i for i, c in enumerate(columns)}
+
+    def write(self, candle_data: pd.DataFrame):
+        # Values of later frames take priority over what's already there
+        offsets = candle_data.index.asi8 // SLOT_NANOSECONDS - self._start_slot
+        is_inside = (offsets >= 0) & (offsets < self._slot_count)
+        offsets = offsets[is_inside]
+        for column_name in candle_data.columns:
+            column_position = self._column_positions.get(column_name)
+            if column_position is None:
+                continue
+            column_values = candle_data[column_name].to_numpy()[is_inside]
+            self._values[offsets, column_position] = column_values
+
+    def to_frame(self) -> pd.DataFrame:
+        # Rows before the first and after the last value are left out
+        has_value = ~np.isnan(self._values).all(axis=1)
+        value_positions = np.flatnonzero(has_value)
+        if len(value_positions) == 0:
+            return pd.DataFrame(
+                index=pd.DatetimeIndex([], tz="UTC"),
+                columns=self._columns,
+                dtype=np.float32,
+            )
+        first_position = value_positions[0]
+        last_position = value_positions[-1]
+        index = pd.date_range(
+            start=pd.Timestamp(
+                (self._start_slot + first_position) * SLOT_NANOSECONDS, tz="UTC"
+            ),
+            periods=last_position - first_position + 1,
+            freq="10S",
+        )
+        return pd.DataFrame(
+            self._values[first_position : last_position + 1],
+            index=index,
+            columns=self._columns,
+        )
@@ -0,0 +1,211 @@
+import numpy as np
+import pandas as pd
+
+# Bar sizes of the levels, from the finest to the coarsest
+LEVEL_SECONDS = (10, 60, 300, 3600, 86400)
+
+
+def _make_candle_points(
+    index_ar: np.ndarray,
+    open_ar: np.ndarray,
+    high_ar: np.ndarray,
+    low_ar: np.ndarray,
+    close_ar: np.ndarray,
+    bar_seconds: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Each candle is drawn with 9 points,
+    # which are the open tick, the close tick and the wick separated by NaN.
+    nan_ar = np.full(len(index_ar), np.nan)
+    data_x = np.stack(
+        [
+            index_ar + bar_seconds * 0.2,
+            index_ar + bar_seconds * 0.5,
+            index_ar,
+            index_ar + bar_seconds * 0.5,
+            index_ar + bar_seconds * 0.8,
+            index_ar,
+            index_ar + bar_seconds * 0.5,
+            index_ar + bar_seconds * 0.5,
+            index_ar,
+        ],
+        axis=1,
+    ).reshape(-1)
+    data_y = np.stack(
+        [
+            open_ar,
+            open_ar,
+            nan_ar,
+            close_ar,
+            close_ar,
+            nan_ar,
+            high_ar,
+            low_ar,
+            nan_ar,
+        ],
+        axis=1,
+    ).reshape(-1)
+    return data_x, data_y
+
+
+def _read_bars(candle_data: pd.DataFrame, symbol: str) -> dict[str, np.ndarray]:
+    return {
+        "index": candle_data.index.to_numpy(dtype=np.int64) // 10**9,
+        "open": candle_data[(symbol, "Open")].to_numpy(dtype=np.float64),
+        "high": candle_data[(symbol, "High")].to_numpy(dtype=np.float64),
+        "low": candle_data[(symbol, "Low")].to_numpy(dtype=np.float64),
+        "close": candle_data[(symbol, "Close")].to_numpy(dtype=np.float64),
+        "volume": candle_data[(symbol, "Volume")].to_numpy(dtype=np.float64),
+    }
+
+
+def _merge_bars(
+    finer_bars: dict[str, np.ndarray], bar_seconds: int, grid_from: int | None
+) -> dict[str, np.ndarray]:
+    # Bars are placed on a grid starting from `grid_from` if it's given,
+    # and buckets without any bar are kept as NaN so that lines break there.
+    is_valid = ~np.isnan(finer_bars["open"]) & ~np.isnan(finer_bars["close"])
+    buckets = finer_bars["index"][is_valid] // bar_seconds * bar_seconds
+    if len(buckets) == 0:
+        return {k: np.array([], dtype=v.dtype) for k, v in finer_bars.items()}
+
+    unique_buckets, first_positions = np.unique(buckets, return_index=True)
+    last_positions = np.append(first_positions[1:], len(buckets)) - 1
+    volumes = np.nan_to_num(finer_bars["volume"][is_valid])
+
+    if grid_from is None:
+        grid_from = int(unique_buckets[0])
+    index_ar = np.arange(grid_from, unique_buckets[-1] + bar_seconds, bar_seconds)
+    positions = (unique_buckets - grid_from) // bar_seconds
+    bars = {
+        "index": index_ar,
+        "open": np.full(len(index_ar), np.nan),
+        "high": np.full(len(index_ar), np.nan),
+        "low": np.full(len(index_ar), np.nan),
+        "close": np.full(len(index_ar), np.nan),
+        "volume": np.zeros(len(index_ar)),
+    }
+    bars["open"][positions] = finer_bars["open"][is_valid][first_positions]
+    bars["high"][positions] = np.fmax.reduceat(
+        finer_bars["high"][is_valid], first_positions
+    )
+    bars["low"][positions] = np.fmin.reduceat(
+        finer_bars["low"][is_valid], first_positions
+    )
+    bars["close"][positions] = finer_bars["close"][is_valid][last_positions]
+    bars["volume"][positions] = np.add.reduceat(volumes, first_positions)
+    return bars
+
+
+class CandlePyramid:
+    """
+    Holds candles of a symbol in several resolutions, from 10 seconds to a day.
+    Charts draw the level whose bar count fits the width of the view,
+    so the number of points stays small no matter how long the range is.
+    Each level has spare capacity so that new bars can be added in place.
+    """
+
+    def __init__(self, candle_data: pd.DataFrame, symbol: str):
+        bars = _read_bars(candle_data, symbol)
+        self._levels = [
+            {k: np.array([], dtype=v.dtype) for k, v in bars.items()}
+            for _ in LEVEL_SECONDS
+        ]
+        self._lengths = [0 for _ in LEVEL_SECONDS]
+        for level_number, bar_seconds in enumerate(LEVEL_SECONDS):
+            if level_number > 0:
+                bars = _merge_bars(bars, bar_seconds, None)
+            self._write_bars(level_number, 0, bars)
+
+    def _write_bars(self, level_number: int, position: int, bars: dict):
+        level = self._levels[level_number]
+        new_length = position + len(bars["index"])
+        capacity = len(level["index"])
+        if new_length > capacity:
+            new_capacity = max(capacity * 2, new_length + 1024)
+            for field_name, values in level.items():
+                new_values = np.empty(new_capacity, dtype=values.dtype)
+                new_values[:position] = values[:position]
+                level[field_name] = new_values
+        for field_name, values in bars.items():
+            level[field_name][position:new_length] = values
+        self._lengths[level_number] = new_length
+
+    def _get_bars(self, level_number: int) -> dict[str, np.ndarray]:
+        length = self._lengths[level_number]
+        return {k: v[:length] for k, v in self._levels[level_number].items()}
+
+    def update(self, candle_data: pd.DataFrame, symbol: str):
+        # Bars from the first row of the new candle data are replaced,
+        # along with the coarser bars that contain them
+        new_bars = _read_bars(candle_data, symbol)
+        if len(new_bars["index"]) == 0:
+            return
+        update_from = int(new_bars["index"][0])
+
+        for level_number, bar_seconds in enumerate(LEVEL_SECONDS):
+            level_bars = self._get_bars(level_number)
+            bucket_from = update_from // bar_seconds * bar_seconds
+            position = int(np.searchsorted(level_bars["index"], bucket_from))
+            if level_number > 0:
+                finer_bars = self._get_bars(level_number - 1)
+                finer_position = np.searchsorted(finer_bars["index"], bucket_from)
+                finer_bars = {k: v[finer_position:] for k, v in finer_bars.items()}
+                if position > 0:
+                    grid_from = int(level_bars["index"][position - 1]) + bar_seconds
+                else:
+                    grid_from = None
+                new_bars = _merge_bars(finer_bars, bar_seconds, grid_from)
+            self._write_bars(level_number, position, new_bars)
+
+    def choose_level(self, view_seconds: float, pixel_count: int) -> int:
+        # The finest level that has at most one bar per pixel
+        for level_number, bar_seconds in enumerate(LEVEL_SECONDS):
+            if view_seconds / bar_seconds <= pixel_count:
+                return level_number
+        return len(LEVEL_SECONDS) - 1
+
+    def get_range(self) -> tuple[float, float]:
+        index_ar = self._get_bars(0)["index"]
+        if len(index_ar) == 0:
+            return 0.0, 0.0
+        return float(index_ar[0]), float(index_ar[-1] + LEVEL_SECONDS[0])
+
+    def make_lines(
+        self, level_number: int, slice_from: float, slice_until: float
+    ) -> dict[str, list[tuple[np.ndarray, np.ndarray]]]:
+        # Keys are the names of chart lines,
+        # and each list is in the same order as the lines of that name
+        level = self._get_bars(level_number)
+        bar_seconds = LEVEL_SECONDS[level_number]
+        start_position = np.searchsorted(level["index"], slice_from - bar_seconds)
+        end_position = np.searchsorted(level["index"], slice_until, side="right")
+        index_ar = level["index"][start_position:end_position].astype(np.float64)
+        open_ar = level["open"][start_position:end_position]
+        high_ar = level["high"][start_position:end_position]
+        low_ar = level["low"][start_position:end_position]
+        close_ar = level["close"][start_position:end_position]
+        volume_ar = level["volume"][start_position:end_position]
+
+        lines = {}
+        for line_name, is_target in (
+            ("price_rise", close_ar > open_ar),
+            ("price_fall", close_ar < open_ar),
+            ("price_stay", close_ar == open_ar),
+        ):
+            candle_points = _make_candle_points(
+                index_ar[is_target],
+                open_ar[is_target],
+                high_ar[is_target],
+                low_ar[is_target],
+                close_ar[is_target],
+                bar_seconds,
+            )
+            lines[line_name] = [candle_points]
+        lines["wobbles"] = [
+            (index_ar, high_ar.astype(np.float32)),
+            (index_ar, low_ar.astype(np.float32)),
+        ]
+        lines["volume"] = [
+            (index_ar, np.nan_to_num(volume_ar).astype(np.float32)),
+        ]
+        return lines
@@ -0,0 +1,130 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import solie
+from solie.definition.candle_pyramid import CandlePyramid
+from solie.definition.structs import BarClosed
+from solie.parallel import go, go_thread
+from solie.utility import prepare_lines
+
+# Candle pyramids of ranges that aren't requested anymore are dropped
+MAX_CANDLE_ENTRIES = 4
+
+
+@dataclass
+class _CandleEntry:
+    candle_pyramid: CandlePyramid
+    updated_until: datetime  # Start of the last bar written to the pyramid
+    bar_moment: datetime | None  # Latest closed bar when it was brought up to date
+
+
+class ChartCache:
+    """
+    Prepares chart data that the transaction and simulation charts have in common,
+    so that each symbol's data is processed once even when both charts show it.
+    Light lines are reused until the collector receives more realtime data,
+    and candle pyramids are brought up to date only when a new bar is closed.
+    """
+
+    def __init__(self):
+        self._light_tasks: dict[str, tuple[tuple, asyncio.Task]] = {}
+        self._candle_entries: dict[tuple[str, datetime], _CandleEntry] = {}
+        self._candle_lock = asyncio.Lock()
+
+    async def _make_light_lines(
+        self, symbol: str
+    ) -> dict[str, list[tuple[np.ndarray, np.ndarray]]]:
+        collector = solie.window.collector
+        async with collector.realtime_data_chunks.read_lock as cell:
+            before_chunk = cell.data[-2].copy()
+            current_chunk = cell.data[-1].copy()
+        realtime_data = np.concatenate((before_chunk, current_chunk))
+        async with collector.aggregate_trades.read_lock as cell:
+            aggregate_trades = cell.data.copy()
+        return await go_thread(
+            prepare_lines.light_lines, realtime_data, aggregate_trades, symbol
+        )
+
+    async def get_light_lines(
+        self, symbol: str
+    ) -> dict[str, list[tuple[np.ndarray, np.ndarray]]]:
+        # Realtime data only grows until it's replaced,
+        # so its sizes tell whether anything was received since the last time
+        collector = solie.window.collector
+        async with collector.realtime_data_chunks.read_lock as cell:
+            current_chunk = cell.data[-1]
+            realtime_state = (len(cell.data), id(current_chunk), len(current_chunk))
+        async with collector.aggregate_trades.read_lock as cell:
+            trades_state = (id(cell.data), len(cell.data))
+        data_state = (realtime_state, trades_state)
+
+        light_task = self._light_tasks.get(symbol)
+        if light_task is None or light_task[0] != data_state:
+            task = asyncio.create_task(self._make_light_lines(symbol))
+            self._light_tasks[symbol] = (data_state, task)
+        else:
+            task = light_task[1]
+
+        # A chart that stops waiting shouldn't cancel the work for the other one
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # A failed task shouldn't be handed out again for the same data
+            if self._light_tasks.get(symbol, (None, None))[1] is task:
+                self._light_tasks.pop(symbol)
+            raise
+
+    async def get_candle_pyramid(
+        self, symbol: str, slice_from: datetime, should_rebuild: bool = False
+    ) -> CandlePyramid:
+        # Candles from `slice_from` to the latest one in the collector are included.
+        # The returned pyramid is updated in place later, so it shouldn't be modified.
+        key = (symbol, slice_from)
+        latest_event = solie.window.event_bus.get_latest(BarClosed)
+        bar_moment = None if latest_event is None else latest_event.moment
+        collector = solie.window.collector
+
+        async with self._candle_lock:
+            candle_entry = self._candle_entries.pop(key, None)
+
+            if candle_entry is None or should_rebuild:
+                async with collector.candle_data.read_lock as cell:
+                    candle_data = await go_thread(
+                        prepare_lines.pick_candle_data,
+                        cell.data,
+                        symbol,
+                        slice_from,
+                        None,
+                    )
+                candle_pyramid = await go(CandlePyramid, candle_data, symbol)
+                candle_entry = _CandleEntry(candle_pyramid, slice_from, None)
+            elif candle_entry.bar_moment != bar_moment or bar_moment is None:
+                # Bars from the last written one are replaced
+                async with collector.candle_data.read_lock as cell:
+                    candle_data = await go_thread(
+                        prepare_lines.pick_candle_data,
+                        cell.data,
+                        symbol,
+                        candle_entry.updated_until,
+                        None,
+                    )
+                candle_entry.candle_pyramid.update(candle_data, symbol)
+            else:
+                candle_data = None
+
+            if candle_data is not None:
+                # The right end of picked candle data is an empty row
+                if len(candle_data) > 0:
+                    last_written_moment = candle_data.index[-1] - timedelta(seconds=10)
+                    candle_entry.updated_until = last_written_moment
+                candle_entry.bar_moment = bar_moment
+
+            self._candle_entries[key] = candle_entry
+            while len(self._candle_entries) > MAX_CANDLE_ENTRIES:
+                oldest_key = next(iter(self._candle_entries))
+                self._candle_entries.pop(oldest_key)
+
+            return candle_entry.candle_pyramid
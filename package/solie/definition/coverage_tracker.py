@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+SLOT_NANOSECONDS = 10 * 10**9
+
+
+def _to_slot(moment: datetime) -> int:
+    return int(moment.timestamp() * 10**9) // SLOT_NANOSECONDS
+
+
+def _to_moment(slot: int) -> datetime:
+    return datetime.fromtimestamp(slot * SLOT_NANOSECONDS / 10**9, tz=timezone.utc)
+
+
+class CoverageTracker:
+    """
+    Remembers which 10-second slots of the recent days have complete candles.
+    Each symbol has a ring that holds the ID of the slot written at each
+    position, so that old entries become invalid by themselves
+    without having to be cleared.
+    """
+
+    def __init__(self, symbols: list[str], days: int = 2):
+        self._slot_count = days * 24 * 60 * 6
+        self._symbols = symbols
+        self._rings = {s: np.full(self._slot_count, -1, np.int64) for s in symbols}
+        self._complete_ring = np.full(self._slot_count, -1, np.int64)
+        self._newest_slot = -1
+
+    def update(self, candle_data: pd.DataFrame):
+        # Rows of the data frame are marked if all of their symbol's values exist
+        if len(candle_data) == 0:
+            return
+        all_slots = candle_data.index.asi8 // SLOT_NANOSECONDS
+        self._newest_slot = max(self._newest_slot, int(all_slots.max()))
+        oldest_slot = self._newest_slot - self._slot_count + 1
+
+        for symbol in self._symbols:
+            if symbol not in candle_data.columns.get_level_values(0):
+                continue
+            is_complete = candle_data[symbol].notna().all(axis=1).to_numpy()
+            slots = all_slots[is_complete & (all_slots >= oldest_slot)]
+            self._rings[symbol][slots % self._slot_count] = slots
+
+        slots = all_slots[all_slots >= oldest_slot]
+        positions = slots % self._slot_count
+        is_complete = np.ones(len(slots), dtype=np.bool_)
+        for ring in self._rings.values():
+            is_complete &= ring[positions] == slots
+        self._complete_ring[positions[is_complete]] = slots[is_complete]
+
+    def count_complete(self, since: datetime) -> int:
+        # Counts slots that are complete in every symbol
+        return int(np.count_nonzero(self._complete_ring >= _to_slot(since)))
+
+    def find_missing_ranges(
+        self, symbol: str, since: datetime, until: datetime
+    ) -> list[tuple[datetime, datetime]]:
+        # Each range is given as the first and the last missing slot
+        slots = np.arange(_to_slot(since), _to_slot(until) + 1, dtype=np.int64)
+        is_missing = self._rings[symbol][slots % self._slot_count] != slots
+        edges = np.diff(np.concatenate(([0], is_missing.astype(np.int8), [0])))
+        range_starts = slots[np.flatnonzero(edges == 1)]
+        range_ends = slots[np.flatnonzero(edges == -1) - 1]
+        return [
+            (_to_moment(int(range_start)), _to_moment(int(range_end)))
+            for range_start, range_end in zip(range_starts, range_ends)
+        ]
@@ -1,5 +1,8 @@
 class ApiRequestError(Exception):
-    pass
+    def __init__(self, *args, code: int | None = None):
+        # Error code from Binance, if the server gave one
+        super().__init__(*args)
+        self.code = code
 
 
 class SimulationError(Exception):
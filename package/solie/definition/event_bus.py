@@ -0,0 +1,51 @@
+import asyncio
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class EventBus:
+    """
+    Delivers events published by one worker to the tasks awaiting them.
+    The latest event of each type is kept, so a task that starts waiting
+    after the event was already published does not miss it.
+    """
+
+    def __init__(self):
+        self._latest_events: dict[type, object] = {}
+        self._waiters: dict[type, list[tuple[Callable, asyncio.Future]]] = {}
+
+    def publish(self, event: object):
+        event_type = type(event)
+        self._latest_events[event_type] = event
+        remaining_waiters = []
+        for predicate, future in self._waiters.get(event_type, []):
+            if future.done():
+                continue
+            elif predicate(event):
+                future.set_result(event)
+            else:
+                remaining_waiters.append((predicate, future))
+        self._waiters[event_type] = remaining_waiters
+
+    def get_latest(self, event_type: type[T]) -> T | None:
+        return self._latest_events.get(event_type)  # type:ignore
+
+    async def wait_for(
+        self,
+        event_type: type[T],
+        predicate: Callable[[T], bool] = lambda _: True,
+        timeout: float | None = None,
+    ) -> T:
+        latest_event = self._latest_events.get(event_type)
+        if latest_event is not None and predicate(latest_event):  # type:ignore
+            return latest_event  # type:ignore
+
+        future = asyncio.get_running_loop().create_future()
+        if event_type not in self._waiters:
+            self._waiters[event_type] = []
+        self._waiters[event_type].append((predicate, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            future.cancel()
@@ -0,0 +1,48 @@
+import numpy as np
+
+
+class LineBuffer:
+    """
+    Keeps x and y values of a chart line in arrays with spare capacity,
+    so that new points can be added at the end without copying the whole line.
+    Data given to the chart are views of the arrays.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._data_x = np.empty(capacity, dtype=np.float64)
+        self._data_y = np.empty(capacity, dtype=np.float32)
+        self._length = 0
+        self._owns_arrays = True
+
+    def __len__(self) -> int:
+        return self._length
+
+    def set(self, data_x: np.ndarray, data_y: np.ndarray):
+        # Given arrays are taken without copying,
+        # and spare capacity is made when points are added later
+        self._data_x = np.asarray(data_x, dtype=np.float64)
+        self._data_y = np.asarray(data_y, dtype=np.float32)
+        self._length = len(self._data_x)
+        self._owns_arrays = False
+
+    def append(self, data_x: np.ndarray, data_y: np.ndarray):
+        new_length = self._length + len(data_x)
+        if new_length > len(self._data_x) or not self._owns_arrays:
+            new_capacity = max(len(self._data_x) * 2, new_length)
+            data_x_buffer = np.empty(new_capacity, dtype=np.float64)
+            data_y_buffer = np.empty(new_capacity, dtype=np.float32)
+            data_x_buffer[: self._length] = self._data_x[: self._length]
+            data_y_buffer[: self._length] = self._data_y[: self._length]
+            self._data_x = data_x_buffer
+            self._data_y = data_y_buffer
+            self._owns_arrays = True
+        self._data_x[self._length : new_length] = data_x
+        self._data_y[self._length : new_length] = data_y
+        self._length = new_length
+
+    def truncate_from(self, x: float):
+        # Removes points at and after `x`, assuming that x values are sorted
+        self._length = int(np.searchsorted(self._data_x[: self._length], x))
+
+    def get_data(self) -> tuple[np.ndarray, np.ndarray]:
+        return self._data_x[: self._length], self._data_y[: self._length]
@@ -2,11 +2,11 @@ import asyncio
 import logging
 import os
 import time
-from datetime import datetime, timezone
 
 import aiofiles
 
 import solie
+from solie.utility import clock
 
 
 class LogHandler(logging.Handler):
@@ -22,7 +22,7 @@ class LogHandler(logging.Handler):
         log_formatter.converter = time.gmtime
         self.setFormatter(log_formatter)
 
-        now = datetime.now(timezone.utc).replace(microsecond=0)
+        now = clock.now().replace(microsecond=0)
         self.filename = (
             f"{now.year:04}-{now.month:02}-{now.day:02}"
             + f".{now.hour:02}-{now.minute:02}-{now.second:02}"
@@ -0,0 +1,130 @@
+import asyncio
+import math
+import selectors
+import time
+
+from PySide6 import QtCore
+
+# Longest wait handed to a Qt timer, which takes milliseconds as a 32-bit integer
+MAX_WAIT_MILLISECONDS = 24 * 60 * 60 * 1000
+
+# While `asyncio` keeps having callbacks to run,
+# pending Qt events are handled at most this often
+BUSY_PROCESS_INTERVAL = 0.001
+
+
+class _QtSelector(selectors.DefaultSelector):
+    # Instead of blocking on the sockets itself,
+    # the selector runs Qt's event loop until there's something for `asyncio` to do.
+    # Socket notifiers, the timeout timer and new callbacks are what stop it.
+    def __init__(self):
+        super().__init__()
+        app_instance = QtCore.QCoreApplication.instance()
+        if app_instance is None:
+            raise ValueError("App instance is none, cannot integrate event loops")
+        self._app_instance = app_instance
+        self._qt_loop = QtCore.QEventLoop()
+        self._timer = QtCore.QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._qt_loop.quit)
+        self._notifiers: dict[int, list[QtCore.QSocketNotifier]] = {}
+        self._is_waiting = False
+        self._processed_at = 0.0
+
+    def _make_notifiers(self, key: selectors.SelectorKey):
+        notifier_types = []
+        if key.events & selectors.EVENT_READ:
+            notifier_types.append(QtCore.QSocketNotifier.Type.Read)
+        if key.events & selectors.EVENT_WRITE:
+            notifier_types.append(QtCore.QSocketNotifier.Type.Write)
+        notifiers = []
+        for notifier_type in notifier_types:
+            notifier = QtCore.QSocketNotifier(key.fd, notifier_type)
+            notifier.activated.connect(self.wake)
+            notifiers.append(notifier)
+        self._notifiers[key.fd] = notifiers
+
+    def _remove_notifiers(self, fd: int):
+        for notifier in self._notifiers.pop(fd, []):
+            notifier.setEnabled(False)
+            notifier.deleteLater()
+
+    def register(self, fileobj, events, data=None):
+        key = super().register(fileobj, events, data)
+        self._make_notifiers(key)
+        return key
+
+    def unregister(self, fileobj):
+        key = super().unregister(fileobj)
+        self._remove_notifiers(key.fd)
+        return key
+
+    def modify(self, fileobj, events, data=None):
+        key = super().modify(fileobj, events, data)
+        self._remove_notifiers(key.fd)
+        self._make_notifiers(key)
+        return key
+
+    def close(self):
+        for fd in list(self._notifiers):
+            self._remove_notifiers(fd)
+        self._timer.stop()
+        super().close()
+
+    def wake(self, *args, **kwargs):
+        if self._is_waiting:
+            self._qt_loop.quit()
+
+    def select(self, timeout=None):
+        ready = super().select(0)
+        if len(ready) > 0 or (timeout is not None and timeout <= 0):
+            # `asyncio` is busy, so only pending Qt events are handled in between
+            now = time.monotonic()
+            if now - self._processed_at >= BUSY_PROCESS_INTERVAL:
+                self._app_instance.processEvents()
+                self._processed_at = now
+            return ready
+
+        if timeout is not None:
+            wait_milliseconds = min(math.ceil(timeout * 1000), MAX_WAIT_MILLISECONDS)
+            self._timer.start(wait_milliseconds)
+        self._is_waiting = True
+        try:
+            self._qt_loop.exec()
+        finally:
+            self._is_waiting = False
+            self._timer.stop()
+            self._processed_at = time.monotonic()
+        return super().select(0)
+
+
+class QtEventLoop(asyncio.SelectorEventLoop):
+    """
+    An `asyncio` event loop that waits inside Qt's event loop.
+    The thread sleeps until a Qt event, a socket, a timer
+    or a callback from another thread needs attention,
+    so nothing is polled while the app is idle.
+    Callbacks scheduled from Qt's signal handlers run right away
+    instead of waiting for the next polling interval.
+    """
+
+    def __init__(self):
+        self._qt_selector = _QtSelector()
+        super().__init__(self._qt_selector)
+
+    def call_soon(self, callback, *args, context=None):
+        handle = super().call_soon(callback, *args, context=context)
+        self._qt_selector.wake()
+        return handle
+
+    def call_at(self, when, callback, *args, context=None):
+        handle = super().call_at(when, callback, *args, context=context)
+        self._qt_selector.wake()
+        return handle
+
+
+class QtEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    # Makes `asyncio.run` use `QtEventLoop`
+    def new_event_loop(self) -> QtEventLoop:
+        return QtEventLoop()
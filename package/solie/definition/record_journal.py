@@ -0,0 +1,94 @@
+import asyncio
+import os
+import pickle
+
+
+class RecordJournal:
+    """
+    Appends records to a file as they happen so that they survive a crash.
+    Records are written in batches with a single fsync, and each record
+    should hold absolute values so that replaying it more than once is harmless.
+    """
+
+    def __init__(self, filepath: str, batch_seconds: float = 1):
+        self._filepath = filepath
+        self._rotated_filepath = filepath + ".old"
+        self._batch_seconds = batch_seconds
+        self._pending_records: list[tuple] = []
+        self._flush_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    def append(self, record: tuple):
+        self._pending_records.append(record)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self._batch_seconds)
+        await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            records = self._pending_records
+            self._pending_records = []
+            if len(records) == 0:
+                return
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._write_records, records)
+
+    def _write_records(self, records: list[tuple]):
+        with open(self._filepath, "ab") as file:
+            for record in records:
+                pickle.dump(record, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+
+    async def rotate(self):
+        # Records from now on go to a new file,
+        # while the rotated one is kept until a snapshot includes its records.
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._rotate_file)
+
+    def _rotate_file(self):
+        if not os.path.isfile(self._filepath):
+            return
+        if os.path.isfile(self._rotated_filepath):
+            # Previous snapshot didn't finish, so keep both
+            with open(self._filepath, "rb") as source_file:
+                content = source_file.read()
+            with open(self._rotated_filepath, "ab") as target_file:
+                target_file.write(content)
+                target_file.flush()
+                os.fsync(target_file.fileno())
+            os.remove(self._filepath)
+        else:
+            os.replace(self._filepath, self._rotated_filepath)
+
+    def remove_rotated(self):
+        if os.path.isfile(self._rotated_filepath):
+            os.remove(self._rotated_filepath)
+
+    async def replay(self) -> list[tuple]:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._read_records)
+
+    def _read_records(self) -> list[tuple]:
+        records = []
+        for filepath in (self._rotated_filepath, self._filepath):
+            if not os.path.isfile(filepath):
+                continue
+            with open(filepath, "rb") as file:
+                intact_size = 0
+                while True:
+                    try:
+                        records.append(pickle.load(file))
+                    except Exception:
+                        break
+                    intact_size = file.tell()
+            # The last record can be torn by a crash,
+            # and it should not hide the records appended after it
+            if intact_size < os.path.getsize(filepath):
+                os.truncate(filepath, intact_size)
+        return records
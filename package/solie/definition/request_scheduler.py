@@ -0,0 +1,173 @@
+import asyncio
+import math
+import time
+
+# Request weights of futures endpoints, from Binance API documentation.
+# Endpoints not listed here are treated as having a weight of 1.
+ENDPOINT_WEIGHTS = {
+    ("GET", "/fapi/v1/aggTrades"): 20,
+    ("GET", "/fapi/v1/exchangeInfo"): 1,
+    ("GET", "/fapi/v1/leverageBracket"): 1,
+    ("GET", "/fapi/v1/openOrders"): 1,
+    ("GET", "/fapi/v1/time"): 1,
+    ("GET", "/fapi/v2/account"): 5,
+    ("POST", "/fapi/v1/order"): 0,
+    ("POST", "/fapi/v1/batchOrders"): 5,
+}
+
+# Order counts of futures endpoints that place orders.
+ORDER_ENDPOINTS = {
+    ("POST", "/fapi/v1/order"): 1,
+    ("POST", "/fapi/v1/batchOrders"): 5,
+}
+
+# Paths that are requested by order placement and cancellation.
+ORDER_PATHS = ("/fapi/v1/order", "/fapi/v1/batchOrders", "/fapi/v1/allOpenOrders")
+
+# Portion of each limit that a priority class may fill.
+# Orders can always use the whole limit and are never delayed.
+PRIORITY_SHARES = {
+    "order": 1.0,
+    "account": 0.9,
+    "backfill": 0.75,
+}
+
+INTERVAL_SECONDS = {
+    "SECOND": 1,
+    "MINUTE": 60,
+    "HOUR": 60 * 60,
+    "DAY": 24 * 60 * 60,
+}
+
+
+class _Bucket:
+    # Binance counts usage in fixed windows,
+    # so the tokens are refilled all at once at the start of each window.
+    def __init__(self, limit: int, interval_seconds: int):
+        self.limit = limit
+        self.interval_seconds = interval_seconds
+        self.used = 0
+        self.window_start = 0
+
+    def _refresh(self, now: float):
+        window_start = math.floor(now / self.interval_seconds) * self.interval_seconds
+        if window_start != self.window_start:
+            self.window_start = window_start
+            self.used = 0
+
+    def has_room(self, now: float, amount: int, share: float) -> bool:
+        self._refresh(now)
+        return self.used + amount <= self.limit * share
+
+    def consume(self, now: float, amount: int):
+        self._refresh(now)
+        self.used += amount
+
+    def observe(self, now: float, used: int):
+        self._refresh(now)
+        self.used = max(self.used, used)
+
+    def seconds_until_refill(self, now: float) -> float:
+        return self.window_start + self.interval_seconds - now
+
+
+class RequestScheduler:
+    def __init__(self):
+        # Default limits of futures API until the real ones are known
+        self.weight_buckets = {"1M": _Bucket(2400, 60)}
+        self.order_buckets = {"1M": _Bucket(1200, 60), "10S": _Bucket(300, 10)}
+
+    def update_limits(self, rate_limits: list[dict]):
+        weight_buckets = {}
+        order_buckets = {}
+        for about_rate_limit in rate_limits:
+            limit_type = about_rate_limit["rateLimitType"]
+            interval_value = about_rate_limit["intervalNum"]
+            interval_unit = about_rate_limit["interval"]
+            interval_name = f"{interval_value}{interval_unit[0]}"
+            interval_seconds = interval_value * INTERVAL_SECONDS[interval_unit]
+            bucket = _Bucket(about_rate_limit["limit"], interval_seconds)
+            if limit_type == "REQUEST_WEIGHT":
+                weight_buckets[interval_name] = bucket
+            elif limit_type == "ORDERS":
+                order_buckets[interval_name] = bucket
+        for buckets, new_buckets in (
+            (self.weight_buckets, weight_buckets),
+            (self.order_buckets, order_buckets),
+        ):
+            for interval_name, bucket in new_buckets.items():
+                if interval_name in buckets:
+                    bucket.used = buckets[interval_name].used
+                    bucket.window_start = buckets[interval_name].window_start
+            buckets.clear()
+            buckets.update(new_buckets)
+
+    def guess_priority(self, http_method: str, path: str) -> str:
+        if path in ORDER_PATHS:
+            return "order"
+        elif path == "/fapi/v1/aggTrades":
+            return "backfill"
+        else:
+            return "account"
+
+    async def acquire(self, http_method: str, path: str, priority: str):
+        weight = ENDPOINT_WEIGHTS.get((http_method, path), 1)
+        order_count = ORDER_ENDPOINTS.get((http_method, path), 0)
+        share = PRIORITY_SHARES[priority]
+
+        while True:
+            now = time.time()
+            waiting_seconds = 0.0
+            for bucket in self.weight_buckets.values():
+                if not bucket.has_room(now, weight, share):
+                    waiting_seconds = max(
+                        waiting_seconds, bucket.seconds_until_refill(now)
+                    )
+            # Requests that place no orders don't wait for order buckets
+            if order_count > 0:
+                for bucket in self.order_buckets.values():
+                    if not bucket.has_room(now, order_count, share):
+                        waiting_seconds = max(
+                            waiting_seconds, bucket.seconds_until_refill(now)
+                        )
+            if priority == "order" or waiting_seconds == 0:
+                break
+            await asyncio.sleep(waiting_seconds)
+
+        for bucket in self.weight_buckets.values():
+            bucket.consume(now, weight)
+        for bucket in self.order_buckets.values():
+            bucket.consume(now, order_count)
+
+    def observe(self, headers):
+        # Usage reported by the server is the most accurate
+        now = time.time()
+        for header_key, header_value in headers.items():
+            header_key = header_key.upper()
+            if header_key.startswith("X-MBX-USED-WEIGHT-"):
+                buckets = self.weight_buckets
+            elif header_key.startswith("X-MBX-ORDER-COUNT-"):
+                buckets = self.order_buckets
+            else:
+                continue
+            interval_name = header_key.rsplit("-", 1)[1]
+            if interval_name in buckets:
+                buckets[interval_name].observe(now, int(header_value))
+
+    def observe_rate_limits(self, rate_limits: list[dict]):
+        # WebSocket API responses report usage in their bodies instead,
+        # which counts toward the same limits as REST requests
+        now = time.time()
+        for about_rate_limit in rate_limits:
+            limit_type = about_rate_limit["rateLimitType"]
+            if limit_type == "REQUEST_WEIGHT":
+                buckets = self.weight_buckets
+            elif limit_type == "ORDERS":
+                buckets = self.order_buckets
+            else:
+                continue
+            interval_value = about_rate_limit["intervalNum"]
+            interval_unit = about_rate_limit["interval"]
+            interval_name = f"{interval_value}{interval_unit[0]}"
+            if interval_name in buckets:
+                buckets[interval_name].observe(now, about_rate_limit["count"])
@@ -0,0 +1,256 @@
+import argparse
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import pickle
+from collections import OrderedDict
+
+import pandas as pd
+
+from solie import parallel
+from solie.definition.errors import SimulationError
+from solie.utility import simulate_chunk
+
+# Messages are pickled, and unpickling can run arbitrary code.
+# That's why each frame is signed with a secret shared by the app and the node,
+# and a frame is unpickled only after its signature is checked.
+# Nodes listen only on this machine unless another host is given explicitly.
+_HEADER_SIZE = 8
+_SIGNATURE_SIZE = hashlib.sha256().digest_size
+SECRET_ENVIRONMENT_VARIABLE = "SOLIE_NODE_SECRET"
+
+
+def _sign(secret: bytes, payload: bytes) -> bytes:
+    return hmac.new(secret, payload, hashlib.sha256).digest()
+
+
+async def _send(writer: asyncio.StreamWriter, secret: bytes, message: dict):
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    header = len(payload).to_bytes(_HEADER_SIZE, "big")
+    writer.write(header + _sign(secret, payload) + payload)
+    await writer.drain()
+
+
+async def _receive(reader: asyncio.StreamReader, secret: bytes) -> dict:
+    header = await reader.readexactly(_HEADER_SIZE)
+    signature = await reader.readexactly(_SIGNATURE_SIZE)
+    payload = await reader.readexactly(int.from_bytes(header, "big"))
+    if not hmac.compare_digest(signature, _sign(secret, payload)):
+        raise ConnectionError("Frame signature doesn't match the shared secret")
+    return pickle.loads(payload)
+
+
+def fingerprint(candle_data: pd.DataFrame) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(str(candle_data.columns.to_list()).encode())
+    hasher.update(pd.util.hash_pandas_object(candle_data).to_numpy().tobytes())
+    return hasher.hexdigest()
+
+
+class SimulationNode:
+    """
+    Serves `simulate_chunk` jobs over TCP so that a simulation can be spread
+    across multiple machines. Candle segments are cached on the node
+    by their fingerprints so that they are sent over the network only once.
+    Segments that weren't used for the longest time are dropped
+    from memory and from disk when the caches are full.
+    """
+
+    def __init__(
+        self,
+        cachepath: str,
+        secret: bytes,
+        memory_slots: int = 8,
+        disk_bytes: int = 10 * 1024**3,
+    ):
+        self._cachepath = cachepath
+        self._secret = secret
+        self._memory_slots = memory_slots
+        self._disk_bytes = disk_bytes
+        self._segments: OrderedDict[str, pd.DataFrame] = OrderedDict()
+        os.makedirs(cachepath, exist_ok=True)
+
+        # Sizes of segment files, from the least recently used one
+        self._segment_sizes: OrderedDict[str, int] = OrderedDict()
+        entries = [e for e in os.scandir(cachepath) if e.name.endswith(".pickle")]
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+            segment_fingerprint = entry.name.removesuffix(".pickle")
+            self._segment_sizes[segment_fingerprint] = entry.stat().st_size
+        self._evict_segment_files()
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        logging.getLogger("solie").info(f"Simulation node listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ):
+        try:
+            while True:
+                request = await _receive(reader, self._secret)
+                response = await self._respond(request)
+                await _send(writer, self._secret, response)
+        except asyncio.IncompleteReadError:
+            pass
+        except ConnectionError as error:
+            peer = writer.get_extra_info("peername")
+            logging.getLogger("solie").warning(f"Dropped {peer}: {error}")
+        finally:
+            writer.close()
+
+    async def _respond(self, request: dict) -> dict:
+        command = request["command"]
+        if command == "describe":
+            return {"process_count": parallel.process_count}
+        elif command == "simulate_chunk":
+            segment_fingerprint = request["fingerprint"]
+            chunk_candle_data = request.get("chunk_candle_data")
+            if chunk_candle_data is None:
+                chunk_candle_data = await self._load_segment(segment_fingerprint)
+                if chunk_candle_data is None:
+                    return {"missing_segment": True}
+            else:
+                await self._save_segment(segment_fingerprint, chunk_candle_data)
+            dataset = request["dataset"]
+            dataset["progress_list"] = [0]
+            dataset["target_progress"] = 0
+            dataset["chunk_candle_data"] = chunk_candle_data
+            try:
+                output_data = await parallel.go(simulate_chunk.do, dataset)
+            except Exception as error:
+                return {"error": repr(error)}
+            return {"output_data": output_data}
+        else:
+            return {"error": f"Unknown command {command}"}
+
+    async def _load_segment(self, segment_fingerprint: str) -> pd.DataFrame | None:
+        if segment_fingerprint not in self._segment_sizes:
+            return None
+        # Modification times keep the order of use after the node restarts
+        filepath = f"{self._cachepath}/{segment_fingerprint}.pickle"
+        self._segment_sizes.move_to_end(segment_fingerprint)
+        os.utime(filepath)
+        if segment_fingerprint in self._segments:
+            self._segments.move_to_end(segment_fingerprint)
+            return self._segments[segment_fingerprint]
+        candle_data = await parallel.go(pd.read_pickle, filepath)
+        self._remember_segment(segment_fingerprint, candle_data)
+        return candle_data
+
+    async def _save_segment(self, segment_fingerprint: str, candle_data: pd.DataFrame):
+        self._remember_segment(segment_fingerprint, candle_data)
+        filepath = f"{self._cachepath}/{segment_fingerprint}.pickle"
+        if segment_fingerprint not in self._segment_sizes:
+            await parallel.go(candle_data.to_pickle, filepath + ".new")
+            os.replace(filepath + ".new", filepath)
+            self._segment_sizes[segment_fingerprint] = os.path.getsize(filepath)
+        self._segment_sizes.move_to_end(segment_fingerprint)
+        self._evict_segment_files()
+
+    def _evict_segment_files(self):
+        # The most recently used segment is kept even if it's bigger than the limit
+        while (
+            len(self._segment_sizes) > 1
+            and sum(self._segment_sizes.values()) > self._disk_bytes
+        ):
+            segment_fingerprint, _ = self._segment_sizes.popitem(last=False)
+            filepath = f"{self._cachepath}/{segment_fingerprint}.pickle"
+            if os.path.isfile(filepath):
+                os.remove(filepath)
+
+    def _remember_segment(self, segment_fingerprint: str, candle_data: pd.DataFrame):
+        self._segments[segment_fingerprint] = candle_data
+        self._segments.move_to_end(segment_fingerprint)
+        while len(self._segments) > self._memory_slots:
+            self._segments.popitem(last=False)
+
+
+class SimulationNodeClient:
+    def __init__(self, address: str, secret: bytes):
+        host, port = address.rsplit(":", 1)
+        self.address = address
+        self._secret = secret
+        self._host = host
+        self._port = int(port)
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def _request(self, request: dict) -> dict:
+        if self._reader is None or self._writer is None:
+            connection = await asyncio.open_connection(self._host, self._port)
+            self._reader, self._writer = connection
+        await _send(self._writer, self._secret, request)
+        return await _receive(self._reader, self._secret)
+
+    async def describe(self) -> dict:
+        return await self._request({"command": "describe"})
+
+    async def simulate(self, dataset: dict, segment_fingerprint: str) -> dict:
+        # Send the candle data only when the node doesn't have it yet.
+        request_dataset = dataset.copy()
+        request_dataset.pop("progress_list")
+        chunk_candle_data = request_dataset.pop("chunk_candle_data")
+        request = {
+            "command": "simulate_chunk",
+            "fingerprint": segment_fingerprint,
+            "dataset": request_dataset,
+        }
+        response = await self._request(request)
+        if response.get("missing_segment", False):
+            request["chunk_candle_data"] = chunk_candle_data
+            response = await self._request(request)
+        if "error" in response:
+            raise SimulationError(
+                f"Simulation node {self.address}: {response['error']}"
+            )
+        return response["output_data"]
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = None
+            self._writer = None
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Serve Solie simulation chunks")
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Give an address like 0.0.0.0 to accept other machines on purpose",
+    )
+    parser.add_argument("--port", type=int, default=8470)
+    parser.add_argument("--cachepath", default="./simulation_node_cache")
+    parser.add_argument(
+        "--cache-gigabytes",
+        type=float,
+        default=10,
+        help="Segments that weren't used for the longest time are removed beyond this",
+    )
+    parser.add_argument(
+        "--secret",
+        default=os.environ.get(SECRET_ENVIRONMENT_VARIABLE, ""),
+        help=f"Shared secret, also read from {SECRET_ENVIRONMENT_VARIABLE}",
+    )
+    arguments = parser.parse_args()
+    if arguments.secret == "":
+        parser.error("A shared secret is required")
+
+    logging.basicConfig(level="INFO")
+    parallel.prepare()
+    node = SimulationNode(
+        arguments.cachepath,
+        arguments.secret.encode(),
+        disk_bytes=int(arguments.cache_gigabytes * 1024**3),
+    )
+    asyncio.run(node.serve(arguments.host, arguments.port))
+
+
+if __name__ == "__main__":
+    run()
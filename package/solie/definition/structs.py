@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 
 
 @dataclass
@@ -8,3 +9,32 @@ class DownloadPreset:
     year: int
     month: int
     day: int = 0  # Valid only when `unit_size` is "daily"
+
+
+@dataclass
+class SymbolInformation:
+    price_precision: int
+    quantity_precision: int
+    tick_size: float
+    step_size: float
+    minimum_notional: float
+    maximum_quantity: float  # Smaller one of limit and market order's
+
+
+@dataclass
+class BarClosed:
+    moment: datetime  # Start of the 10-second bar that was just finalized
+
+
+@dataclass
+class TradesPassed:
+    moment: datetime  # Start of the 10-second bar that the latest trade belongs to
+
+
+@dataclass
+class LatestState:
+    last_price: float = 0.0  # Zero until the first trade arrives
+    last_trade_timestamp: int = 0  # In milliseconds
+    best_bid_price: float = 0.0
+    best_ask_price: float = 0.0
+    mark_price: float = 0.0
@@ -4,7 +4,7 @@ from PySide6 import QtCore, QtGui, QtWidgets
 
 import solie
 from solie.definition.api_requester import ApiRequester
-from solie.utility import outsource, user_settings
+from solie.utility import exchange_information, outsource, user_settings
 from solie.widget.horizontal_divider import HorizontalDivider
 
 
@@ -29,14 +29,8 @@ class CoinSelection(QtWidgets.QWidget):
 
         available_symbols = []
 
-        response = await api_requester.binance(
-            http_method="GET",
-            path="/fapi/v1/exchangeInfo",
-            payload={},
-        )
-        about_symbols = response["symbols"]
-        for about_symbol in about_symbols:
-            symbol = about_symbol["symbol"]
+        await exchange_information.refresh()
+        for symbol in exchange_information.get_symbols().keys():
             if symbol.endswith(asset_token):
                 available_symbols.append(symbol)
 
@@ -1,16 +1,24 @@
 import asyncio
 import functools
 import multiprocessing
-from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Callable, TypeVar
 
 T = TypeVar("T")
 
+# Becomes true once every process in the pool has been warmed up.
+# It stays false if the warm-up fails, such as when the barrier times out.
+is_ready = False
+warm_up_durations: dict[int, float] = {}
+
 
 def prepare():
     global process_count
     global process_pool
     global communicator
+    global thread_pool
 
     # Use only half of the cores
     # as stuffing all the cores with tasks leads to a system slowdown.
@@ -18,6 +26,74 @@ def prepare():
     process_pool = ProcessPoolExecutor(process_count)
     communicator = multiprocessing.Manager()
 
+    # Threads are for preparing data that's already in this process,
+    # such as arrays of chart lines.
+    thread_pool = ThreadPoolExecutor(4, thread_name_prefix="solie")
+
+
+def _warm_up_process(barrier) -> tuple[int, float]:
+    start_time = time.perf_counter()
+
+    # Heavy modules are imported lazily in each process,
+    # so the first real task would pay for them otherwise.
+    import numpy as np
+    import pandas as pd
+    import pandas_ta  # noqa: F401
+    import scipy.signal  # noqa: F401
+
+    from solie.utility import decide, make_indicators, simulate_chunk  # noqa: F401
+
+    # Run the same pandas paths as real tasks do
+    # to fill the internal caches of the libraries.
+    target_symbols = ["WARMUPUSDT"]
+    candle_data = pd.DataFrame(
+        np.ones((360, 5), dtype=np.float32),
+        index=pd.date_range("2020-01-01", periods=360, freq="10S", tz="UTC"),
+        columns=pd.MultiIndex.from_product(
+            [target_symbols, ["Open", "High", "Low", "Close", "Volume"]]
+        ),
+    )
+    indicators_script = (
+        "for symbol in target_symbols:\n"
+        "    close_sr = candle_data[(symbol, 'Close')]\n"
+        "    new_indicators[(symbol, 'Price', 'SMA')] = ta.sma(close_sr, 30)\n"
+        "    new_indicators[(symbol, 'Price', 'EMA')] = ta.ema(close_sr, 30)\n"
+    )
+    indicators = make_indicators.do(
+        target_symbols=target_symbols,
+        candle_data=candle_data,
+        indicators_script=indicators_script,
+    )
+    decide.choose(
+        target_symbols=target_symbols,
+        current_moment=candle_data.index[-1],
+        current_candle_data=candle_data.iloc[-1].to_dict(),
+        current_indicators=indicators.iloc[-1].to_dict(),
+        account_state={},
+        scribbles={},
+        decision_script="pass",
+    )
+
+    duration = time.perf_counter() - start_time
+
+    # Hold this process until every other process has taken its own task,
+    # so that each process in the pool gets warmed up exactly once.
+    barrier.wait(timeout=60)
+
+    return os.getpid(), duration
+
+
+async def warm_up():
+    global is_ready
+
+    barrier = communicator.Barrier(process_count)
+    results = await asyncio.gather(
+        *(go(_warm_up_process, barrier) for _ in range(process_count))
+    )
+    for process_id, duration in results:
+        warm_up_durations[process_id] = duration
+    is_ready = True
+
 
 async def go(callable: Callable[..., T], *args, **kwargs) -> T:
     """
@@ -49,3 +125,25 @@ async def go(callable: Callable[..., T], *args, **kwargs) -> T:
         ),
     )
     return result
+
+
+async def go_thread(callable: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Executes the given callable in a thread pool of this process.
+    Unlike `go`, arguments and the result are not copied between processes,
+    so this suits preparing large arrays from data that's already in memory.
+    NumPy and pandas release the GIL during most of their work,
+    and the interpreter switches threads every few milliseconds otherwise,
+    so `asyncio`'s event loop keeps running meanwhile.
+    Given objects should not be modified by the event loop until it's done.
+    """
+    event_loop = asyncio.get_event_loop()
+    result = await event_loop.run_in_executor(
+        thread_pool,
+        functools.partial(
+            callable,
+            *args,
+            **kwargs,
+        ),
+    )
+    return result
@@ -0,0 +1,81 @@
+import math
+import time
+from datetime import datetime, timezone
+
+# Wall time is advanced by the monotonic clock,
+# so that small adjustments of the system clock don't make the time jump.
+# The monotonic clock stops while the system is suspended
+# and doesn't follow clock steps, so wall time is read again
+# whenever the two drift apart by more than `MAX_DRIFT_SECONDS`.
+MAX_DRIFT_SECONDS = 1.0
+_base_timestamp = time.time()
+_base_monotonic = time.monotonic()
+
+# Offset towards the server time is changed gradually
+_offset_from = 0.0
+_offset_to = 0.0
+_offset_changed = _base_monotonic
+_slew_seconds = 1.0
+
+
+def _get_offset(monotonic: float) -> float:
+    progress = (monotonic - _offset_changed) / _slew_seconds
+    if progress >= 1:
+        return _offset_to
+    return _offset_from + (_offset_to - _offset_from) * progress
+
+
+def _get_local_timestamp(monotonic: float) -> float:
+    global _base_timestamp
+    global _base_monotonic
+
+    estimated_timestamp = _base_timestamp + monotonic - _base_monotonic
+    wall_timestamp = time.time()
+    if abs(wall_timestamp - estimated_timestamp) > MAX_DRIFT_SECONDS:
+        _base_timestamp = wall_timestamp
+        _base_monotonic = monotonic
+        return wall_timestamp
+    return estimated_timestamp
+
+
+def local_timestamp() -> float:
+    return _get_local_timestamp(time.monotonic())
+
+
+def timestamp() -> float:
+    monotonic = time.monotonic()
+    return _get_local_timestamp(monotonic) + _get_offset(monotonic)
+
+
+def now() -> datetime:
+    return datetime.fromtimestamp(timestamp(), tz=timezone.utc)
+
+
+def scheduled_moment(interval_seconds: int = 10) -> datetime:
+    # Scheduled jobs are fired by the system clock without the server offset,
+    # so the interval that the job was meant for is the one it's fired in,
+    # even when it's fired late.
+    floored = math.floor(time.time() / interval_seconds) * interval_seconds
+    return datetime.fromtimestamp(floored, tz=timezone.utc)
+
+
+def get_offset() -> float:
+    return _get_offset(time.monotonic())
+
+
+def set_offset(offset: float):
+    global _offset_from
+    global _offset_to
+    global _offset_changed
+    global _slew_seconds
+
+    # Slewing at most half as fast as time itself keeps the clock monotonic.
+    # Gaps that are too large to be slewed in time are corrected at once.
+    monotonic = time.monotonic()
+    _offset_from = _get_offset(monotonic)
+    _offset_to = offset
+    _offset_changed = monotonic
+    gap = abs(_offset_to - _offset_from)
+    if gap > MAX_DRIFT_SECONDS:
+        _offset_from = _offset_to
+    _slew_seconds = max(1.0, gap * 2)
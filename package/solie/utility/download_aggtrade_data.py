@@ -1,13 +1,43 @@
-import io
-from urllib.request import urlopen
+import os
+import zipfile
 
 import numpy as np
 import pandas as pd
 
 from solie.definition.structs import DownloadPreset
 
-
-def do(download_target: DownloadPreset) -> pd.DataFrame | None:
+CHUNK_SIZE = 10**6
+
+# Runs of 10-second blocks without trades up to this length
+# are filled with the last price, while longer ones are regarded as missing.
+MAX_EMPTY_BLOCKS = 60
+
+
+def _reduce_blocks(
+    blocks: np.ndarray,
+    open_prices: np.ndarray,
+    high_prices: np.ndarray,
+    low_prices: np.ndarray,
+    close_prices: np.ndarray,
+    volumes: np.ndarray,
+) -> tuple[np.ndarray, ...]:
+    # Values of the same block are reduced in their original order,
+    # so that the first and the last ones stay as open and close
+    order = np.argsort(blocks, kind="stable")
+    blocks = blocks[order]
+    unique_blocks, first_positions = np.unique(blocks, return_index=True)
+    last_positions = np.append(first_positions[1:], len(blocks)) - 1
+    return (
+        unique_blocks,
+        open_prices[order][first_positions],
+        np.maximum.reduceat(high_prices[order], first_positions),
+        np.minimum.reduceat(low_prices[order], first_positions),
+        close_prices[order][last_positions],
+        np.add.reduceat(volumes[order], first_positions),
+    )
+
+
+def get_url(download_target: DownloadPreset) -> str:
     symbol = download_target.symbol
     unit_size = download_target.unit_size
 
@@ -31,97 +61,108 @@ def do(download_target: DownloadPreset) -> pd.DataFrame | None:
     else:
         raise ValueError("This download type is not supported")
 
-    zipped_csv_data = None
-    for _ in range(5):
-        try:
-            zipped_csv_data = io.BytesIO(urlopen(url).read())
-            break
-        except Exception:
-            pass
-
-    if zipped_csv_data is None:
-        return
-
-    try:
-        df = pd.concat(
-            pd.read_csv(
-                zipped_csv_data,
-                compression="zip",
-                header=None,
-                usecols=[1, 2, 5],
-                dtype={1: np.float32, 2: np.float32, 5: np.int64},
-                chunksize=10**6,
-            )
-        )
-    except ValueError:
-        # when there is a header line in start of the file
+    return url
+
+
+def _read_candles(archive_path: str, symbol: str) -> tuple[pd.DataFrame | None, int]:
+    with zipfile.ZipFile(archive_path) as zipped_archive:
+        csv_name = zipped_archive.namelist()[0]
+
         # from august 2022, header is included from binance
-        df = pd.concat(
-            pd.read_csv(
-                zipped_csv_data,
-                compression="zip",
-                header=0,
-                usecols=[1, 2, 5],
-                dtype={1: np.float32, 2: np.float32, 5: np.int64},
-                chunksize=10**6,
-            )
-        )
-        df = df.rename(columns={"price": 1, "quantity": 2, "transact_time": 5})
-
-    df = df.set_index(5)
-    df.index.name = None
-    df.index = pd.to_datetime(df.index, unit="ms", utc=True)
-
-    # fill index holes that's smaller than 10 minutes
-    temp_sr = pd.Series(0, index=df.index, dtype=np.float32)
-    temp_sr = temp_sr.groupby(temp_sr.index).first()
-    temp_sr = temp_sr.resample("10s").agg("mean")
-    temp_sr = temp_sr.interpolate(limit=60, limit_direction="forward")
-    temp_sr = temp_sr.replace(np.nan, 1)
-    temp_sr = temp_sr.replace(0, np.nan)
-    temp_sr = temp_sr.interpolate(limit=60, limit_direction="backward")
-    temp_sr = temp_sr.replace(np.nan, 0)
-    temp_sr = temp_sr.replace(1, np.nan)
-    temp_sr = temp_sr.dropna()
-    valid_index = temp_sr.index
-
-    del temp_sr
-
-    # process data
-
-    close_sr = df[1].resample("10s").agg("last")
-    close_sr = close_sr.reindex(valid_index)
-    close_sr = close_sr.fillna(method="ffill")
-    close_sr = close_sr.astype(np.float32)
-    close_sr.name = (symbol, "Close")
-
-    open_sr = df[1].resample("10s").agg("first")
-    open_sr = open_sr.reindex(valid_index)
-    open_sr = open_sr.fillna(value=close_sr)
-    open_sr = open_sr.astype(np.float32)
-    open_sr.name = (symbol, "Open")
-
-    high_sr = df[1].resample("10s").agg("max")
-    high_sr = high_sr.reindex(valid_index)
-    high_sr = high_sr.fillna(value=close_sr)
-    high_sr = high_sr.astype(np.float32)
-    high_sr.name = (symbol, "High")
-
-    low_sr = df[1].resample("10s").agg("min")
-    low_sr = low_sr.reindex(valid_index)
-    low_sr = low_sr.fillna(value=close_sr)
-    low_sr = low_sr.astype(np.float32)
-    low_sr.name = (symbol, "Low")
-
-    volume_sr = df[2].resample("10s").agg("sum")
-    volume_sr = volume_sr.reindex(valid_index)
-    volume_sr = volume_sr.fillna(value=0)
-    volume_sr = volume_sr.astype(np.float32)
-    volume_sr.name = (symbol, "Volume")
-
-    del df
-
-    series_list = [open_sr, high_sr, low_sr, close_sr, volume_sr]
-    new_df = pd.concat(series_list, axis="columns")
-
-    return new_df
+        with zipped_archive.open(csv_name) as csv_file:
+            first_line = csv_file.readline().decode()
+        has_header = not first_line[:1].isdigit()
+
+        chunk_results = []
+        trade_count = 0
+        with zipped_archive.open(csv_name) as csv_file:
+            try:
+                chunks = pd.read_csv(
+                    csv_file,
+                    header=None,
+                    skiprows=1 if has_header else 0,
+                    usecols=[1, 2, 5],
+                    dtype={1: np.float32, 2: np.float32, 5: np.int64},
+                    chunksize=CHUNK_SIZE,
+                )
+            except pd.errors.EmptyDataError:
+                # There were no trades at all
+                chunks = []
+            for chunk in chunks:
+                trade_count += len(chunk)
+                prices = chunk[1].to_numpy()
+                volumes = chunk[2].to_numpy(dtype=np.float64)
+                blocks = chunk[5].to_numpy() // 10000
+                chunk_result = _reduce_blocks(
+                    blocks, prices, prices, prices, prices, volumes
+                )
+                chunk_results.append(chunk_result)
+
+    if len(chunk_results) == 0:
+        return None, trade_count
+
+    # Blocks can span across chunks
+    (
+        traded_blocks,
+        traded_open_prices,
+        traded_high_prices,
+        traded_low_prices,
+        traded_close_prices,
+        traded_volumes,
+    ) = _reduce_blocks(*(np.concatenate(arrays) for arrays in zip(*chunk_results)))
+
+    # Find blocks without trades that are close enough to trades
+    blocks = np.arange(traded_blocks[0], traded_blocks[-1] + 1, dtype=np.int64)
+    positions = traded_blocks - traded_blocks[0]
+    is_traded = np.zeros(len(blocks), dtype=np.bool_)
+    is_traded[positions] = True
+    run_numbers = np.cumsum(is_traded)
+    run_lengths = np.bincount(run_numbers, weights=(~is_traded).astype(np.int64))
+    is_valid = is_traded | (run_lengths[run_numbers] <= MAX_EMPTY_BLOCKS)
+
+    close_prices = np.full(len(blocks), np.nan, dtype=np.float32)
+    close_prices[positions] = traded_close_prices
+    close_prices = pd.Series(close_prices).ffill().to_numpy()
+    open_prices = close_prices.copy()
+    open_prices[positions] = traded_open_prices
+    high_prices = close_prices.copy()
+    high_prices[positions] = traded_high_prices
+    low_prices = close_prices.copy()
+    low_prices[positions] = traded_low_prices
+    volumes = np.zeros(len(blocks), dtype=np.float64)
+    volumes[positions] = traded_volumes
+
+    new_df = pd.DataFrame(
+        {
+            (symbol, "Open"): open_prices[is_valid],
+            (symbol, "High"): high_prices[is_valid],
+            (symbol, "Low"): low_prices[is_valid],
+            (symbol, "Close"): close_prices[is_valid],
+            (symbol, "Volume"): volumes[is_valid],
+        },
+        index=pd.to_datetime(blocks[is_valid] * 10000, unit="ms", utc=True),
+        dtype=np.float32,
+    )
+
+    return new_df, trade_count
+
+
+def do(
+    download_target: DownloadPreset, cachepath: str, checksum: str
+) -> tuple[pd.DataFrame | None, int]:
+    # The archive should be already downloaded and verified.
+    # Candles are cached by the archive checksum as well,
+    # and the number of parsed trades is returned with them.
+    candles_path = f"{cachepath}/{checksum}.pickle"
+    if os.path.isfile(candles_path):
+        return pd.read_pickle(candles_path), 0
+
+    archive_path = f"{cachepath}/{checksum}.zip"
+    new_df, trade_count = _read_candles(archive_path, download_target.symbol)
+    if new_df is None:
+        return None, trade_count
+
+    new_df.to_pickle(candles_path + ".new")
+    os.replace(candles_path + ".new", candles_path)
+
+    return new_df, trade_count
@@ -0,0 +1,90 @@
+import asyncio
+import math
+import time
+
+from solie.definition.api_requester import ApiRequester
+from solie.definition.structs import SymbolInformation
+
+TIME_TO_LIVE = 10 * 60  # Seconds
+
+_api_requester = ApiRequester()
+_refresh_lock = asyncio.Lock()
+_fetched_time: float | None = None  # Monotonic time, `None` until the first fetch
+_server_time = 0
+_symbols: dict[str, SymbolInformation] = {}
+_rate_limits: list[dict] = []
+
+
+def _parse_symbol(about_symbol: dict) -> SymbolInformation | None:
+    # Symbols without price or lot filters can't be traded, so they are skipped.
+    # Other filters are only limits, which don't apply when they are missing.
+    filters = {f["filterType"]: f for f in about_symbol["filters"]}
+    if "PRICE_FILTER" not in filters or "LOT_SIZE" not in filters:
+        return None
+    tick_size = float(filters["PRICE_FILTER"]["tickSize"])
+    step_size = float(filters["LOT_SIZE"]["stepSize"])
+    maximum_quantity = float(filters["LOT_SIZE"]["maxQty"])
+    if "MARKET_LOT_SIZE" in filters:
+        market_maximum_quantity = float(filters["MARKET_LOT_SIZE"]["maxQty"])
+        maximum_quantity = min(maximum_quantity, market_maximum_quantity)
+    if "MIN_NOTIONAL" in filters:
+        minimum_notional = float(filters["MIN_NOTIONAL"]["notional"])
+    else:
+        minimum_notional = 0.0
+    return SymbolInformation(
+        price_precision=int(math.log10(1 / tick_size)),
+        quantity_precision=int(math.log10(1 / step_size)),
+        tick_size=tick_size,
+        step_size=step_size,
+        minimum_notional=minimum_notional,
+        maximum_quantity=maximum_quantity,
+    )
+
+
+async def refresh(force: bool = False):
+    global _fetched_time
+    global _server_time
+    global _symbols
+    global _rate_limits
+
+    # Concurrent callers wait for a single request instead of making their own
+    async with _refresh_lock:
+        if not force and _fetched_time is not None:
+            if time.monotonic() - _fetched_time < TIME_TO_LIVE:
+                return
+
+        response = await _api_requester.binance(
+            http_method="GET",
+            path="/fapi/v1/exchangeInfo",
+            payload={},
+        )
+        _fetched_time = time.monotonic()
+
+        # Responses arriving out of order should not overwrite newer ones
+        if response["serverTime"] < _server_time:
+            return
+        _server_time = response["serverTime"]
+
+        symbols = {}
+        for about_symbol in response["symbols"]:
+            symbol_information = _parse_symbol(about_symbol)
+            if symbol_information is not None:
+                symbols[about_symbol["symbol"]] = symbol_information
+        _symbols = symbols
+        _rate_limits = response["rateLimits"]
+
+
+def is_loaded() -> bool:
+    return len(_symbols) > 0
+
+
+def get_symbol(symbol: str) -> SymbolInformation:
+    return _symbols[symbol]
+
+
+def get_symbols() -> dict[str, SymbolInformation]:
+    return _symbols
+
+
+def get_rate_limits() -> list[dict]:
+    return _rate_limits
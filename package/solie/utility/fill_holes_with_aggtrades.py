@@ -1,73 +1,79 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 
 def do(
     symbol: str,
-    recent_candle_data: pd.DataFrame,
-    aggtrades: pd.DataFrame,
+    aggtrades: dict[int, dict],
     moment_to_fill_from: datetime,
-    last_fetched_time: datetime,
+    moment_to_fill_until: datetime,
+    last_price: float,
 ) -> pd.DataFrame:
-    fill_moment = moment_to_fill_from
+    # Returns candles of the blocks from `moment_to_fill_from`
+    # to `moment_to_fill_until`, both inclusive.
+    # `last_price` is the close price before the first block, which can be NaN.
+    fill_from = round(moment_to_fill_from.timestamp() * 1000)
+    fill_until = round(moment_to_fill_until.timestamp() * 1000)
+    block_starts = np.arange(fill_from, fill_until + 1, 10000, dtype=np.int64)
+    block_count = len(block_starts)
 
-    while fill_moment < last_fetched_time - timedelta(seconds=10):
-        block_start = fill_moment
-        block_end = fill_moment + timedelta(seconds=10)
+    # sorted by aggregate trade ID, which is also the order of time
+    sorted_ids = sorted(aggtrades.keys())
+    trade_times = np.array([aggtrades[i]["T"] for i in sorted_ids], np.int64)
+    prices = np.array([aggtrades[i]["p"] for i in sorted_ids], np.float64)
+    volumes = np.array([aggtrades[i]["q"] for i in sorted_ids], np.float64)
 
-        aggtrade_prices = []
-        aggtrade_volumes = []
-        for _, aggtrade in sorted(aggtrades.items()):
-            # sorted by time
-            aggtrade_time = datetime.fromtimestamp(
-                aggtrade["T"] / 1000, tz=timezone.utc
-            )
-            if block_start <= aggtrade_time < block_end:
-                aggtrade_prices.append(float(aggtrade["p"]))
-                aggtrade_volumes.append(float(aggtrade["q"]))
+    block_numbers = (trade_times - fill_from) // 10000
+    is_inside = (block_numbers >= 0) & (block_numbers < block_count)
+    block_numbers = block_numbers[is_inside]
+    prices = prices[is_inside]
+    volumes = volumes[is_inside]
 
-        can_write = True
+    open_prices = np.full(block_count, np.nan)
+    high_prices = np.full(block_count, np.nan)
+    low_prices = np.full(block_count, np.nan)
+    close_prices = np.full(block_count, np.nan)
+    sum_volumes = np.zeros(block_count)
 
-        if len(aggtrade_prices) == 0:
-            # when there are no trades
-            inspect_sr = recent_candle_data[(symbol, "Close")]
-            inspect_sr = inspect_sr.sort_index()
-            last_prices = inspect_sr[:fill_moment].dropna()
-            if len(last_prices) == 0:
-                # when there are no previous data
-                # because new data folder was created
-                can_write = False
-                last_price = 0
-            else:
-                last_price = last_prices.iloc[-1]
-            open_price = last_price
-            high_price = last_price
-            low_price = last_price
-            close_price = last_price
-            sum_volume = 0
-        else:
-            open_price = aggtrade_prices[0]
-            high_price = max(aggtrade_prices)
-            low_price = min(aggtrade_prices)
-            close_price = aggtrade_prices[-1]
-            sum_volume = sum(aggtrade_volumes)
+    if len(block_numbers) > 0:
+        traded_blocks, first_positions = np.unique(block_numbers, return_index=True)
+        last_positions = np.append(first_positions[1:], len(block_numbers)) - 1
+        open_prices[traded_blocks] = prices[first_positions]
+        high_prices[traded_blocks] = np.maximum.reduceat(prices, first_positions)
+        low_prices[traded_blocks] = np.minimum.reduceat(prices, first_positions)
+        close_prices[traded_blocks] = prices[last_positions]
+        sum_volumes[traded_blocks] = np.add.reduceat(volumes, first_positions)
 
-        if can_write:
-            column = (symbol, "Open")
-            recent_candle_data.loc[fill_moment, column] = open_price
-            column = (symbol, "High")
-            recent_candle_data.loc[fill_moment, column] = high_price
-            column = (symbol, "Low")
-            recent_candle_data.loc[fill_moment, column] = low_price
-            column = (symbol, "Close")
-            recent_candle_data.loc[fill_moment, column] = close_price
-            column = (symbol, "Volume")
-            recent_candle_data.loc[fill_moment, column] = sum_volume
+    # When there are no trades in a block, the last price stays
+    filled_close_prices = pd.Series(np.append(last_price, close_prices)).ffill()
+    filled_close_prices = filled_close_prices.to_numpy()[1:]
+    is_empty = np.isnan(close_prices)
+    open_prices[is_empty] = filled_close_prices[is_empty]
+    high_prices[is_empty] = filled_close_prices[is_empty]
+    low_prices[is_empty] = filled_close_prices[is_empty]
+    close_prices[is_empty] = filled_close_prices[is_empty]
 
-        fill_moment += timedelta(seconds=10)
+    # Blocks without any previous price, as in a new data folder, are skipped
+    can_write = ~np.isnan(close_prices)
+    block_index = pd.to_datetime(block_starts[can_write], unit="ms", utc=True)
+    columns = pd.MultiIndex.from_product(
+        [[symbol], ("Open", "High", "Low", "Close", "Volume")]
+    )
+    new_values = np.column_stack(
+        (
+            open_prices[can_write],
+            high_prices[can_write],
+            low_prices[can_write],
+            close_prices[can_write],
+            sum_volumes[can_write],
+        )
+    )
 
-    recent_candle_data = recent_candle_data.sort_index(axis="index")
-    recent_candle_data = recent_candle_data.sort_index(axis="columns")
-
-    return recent_candle_data
+    return pd.DataFrame(
+        new_values,
+        index=block_index,
+        columns=columns,
+        dtype=np.float32,
+    )
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+
+def do(records: list[tuple]) -> dict:
+    # Records hold absolute values, so the last one of each key wins.
+    # Fills are kept only until a record marks them as written
+    # into the asset record, which carries the rows they changed.
+    unrealized_changes: dict[datetime, float] = {}
+    asset_rows: dict[datetime, dict] = {}
+    auto_order_rows: dict[tuple[str, int], datetime] = {}
+    scribbles: dict | None = None
+    unflushed_fills: list[tuple] = []
+
+    for record in records:
+        record_type = record[0]
+        if record_type == "unrealized_change":
+            unrealized_changes[record[1]] = record[2]
+        elif record_type == "asset_record":
+            asset_rows[record[1]] = record[2]
+        elif record_type == "auto_order":
+            auto_order_rows[(record[2], record[3])] = record[1]
+        elif record_type == "scribbles":
+            scribbles = record[1]
+        elif record_type == "fill":
+            unflushed_fills.append(record[1:])
+        elif record_type == "fills_flushed":
+            for changed_time, asset_row in record[1]:
+                asset_rows[changed_time] = asset_row
+            unflushed_fills = []
+
+    return {
+        "unrealized_changes": unrealized_changes,
+        "asset_rows": asset_rows,
+        "auto_order_rows": auto_order_rows,
+        "scribbles": scribbles,
+        "unflushed_fills": unflushed_fills,
+    }
@@ -0,0 +1,200 @@
+import re
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Each function here prepares arrays of chart lines.
+# They are meant to run outside the event loop,
+# so that only `setData` calls are left on it.
+# Returned dictionaries have names of chart lines as keys,
+# and each list is in the same order as the lines of that name.
+
+
+def pick_candle_data(
+    candle_data: pd.DataFrame,
+    symbol: str,
+    slice_from: datetime,
+    slice_until: datetime | None,
+) -> pd.DataFrame:
+    # An empty row is added at the right end.
+    # Rows and columns are picked by position with numpy,
+    # because label-based selection and reindexing of a frame
+    # spanning years hold the GIL long enough to stall the event loop.
+    index = candle_data.index
+    row_start = index.searchsorted(slice_from)
+    if slice_until is None:
+        row_stop = len(index)
+    else:
+        row_stop = index.searchsorted(slice_until, side="right")
+    symbol_columns = candle_data.columns.get_level_values(0) == symbol
+    column_positions = np.flatnonzero(symbol_columns)
+    if row_stop <= row_start:
+        return candle_data.iloc[0:0, column_positions].copy()
+
+    values = candle_data.to_numpy()
+    picked = np.empty((row_stop - row_start + 1, len(column_positions)), values.dtype)
+    for turn, column_position in enumerate(column_positions):
+        picked[:-1, turn] = values[row_start:row_stop, column_position]
+    picked[-1] = np.nan
+
+    new_moment = index[row_stop - 1] + timedelta(seconds=10)
+    new_index = index[row_start:row_stop].append(pd.DatetimeIndex([new_moment]))
+    return pd.DataFrame(
+        picked,
+        index=new_index,
+        columns=candle_data.columns[column_positions],
+        copy=False,
+    )
+
+
+def light_lines(
+    realtime_data: np.recarray, aggregate_trades: np.recarray, symbol: str
+) -> dict[str, list[tuple[np.ndarray, np.ndarray]]]:
+    lines = {}
+
+    # mark price
+    data_x = realtime_data["index"].astype(np.int64) / 10**9
+    data_y = realtime_data[str((symbol, "Mark Price"))]
+    mask = data_y != 0
+    lines["mark_price"] = [(data_x[mask], data_y[mask])]
+
+    # last price
+    data_x = aggregate_trades["index"].astype(np.int64) / 10**9
+    data_y = aggregate_trades[str((symbol, "Price"))]
+    mask = data_y != 0
+    lines["last_price"] = [(data_x[mask], data_y[mask])]
+
+    # last trade volume
+    index_ar = aggregate_trades["index"].astype(np.int64) / 10**9
+    value_ar = aggregate_trades[str((symbol, "Volume"))]
+    mask = value_ar != 0
+    index_ar = index_ar[mask]
+    value_ar = value_ar[mask]
+    length = len(index_ar)
+    zero_ar = np.zeros(length)
+    nan_ar = np.full(length, np.nan)
+    data_x = np.repeat(index_ar, 3)
+    data_y = np.stack([nan_ar, zero_ar, value_ar], axis=1).reshape(-1)
+    lines["last_volume"] = [(data_x, data_y)]
+
+    # book tickers
+    lines["book_tickers"] = []
+    for field_name in ("Best Bid Price", "Best Ask Price"):
+        data_x = realtime_data["index"].astype(np.int64) / 10**9
+        data_y = realtime_data[str((symbol, field_name))]
+        mask = data_y != 0
+        lines["book_tickers"].append((data_x[mask], data_y[mask]))
+
+    return lines
+
+
+def complete_asset_record(
+    asset_record: pd.DataFrame,
+    slice_from: datetime,
+    last_asset: float | None,
+    before_asset: float | None,
+    observed_until: datetime,
+) -> pd.DataFrame:
+    # add the right end
+    if last_asset is not None:
+        if len(asset_record) == 0 or asset_record.index[-1] < observed_until:
+            if slice_from < observed_until:
+                asset_record.loc[observed_until, "Cause"] = "other"
+                asset_record.loc[observed_until, "Result Asset"] = last_asset
+                if not asset_record.index.is_monotonic_increasing:
+                    asset_record = asset_record.sort_index()
+
+    # add the left end
+    if before_asset is not None:
+        asset_record.loc[slice_from, "Cause"] = "other"
+        asset_record.loc[slice_from, "Result Asset"] = before_asset
+        if not asset_record.index.is_monotonic_increasing:
+            asset_record = asset_record.sort_index()
+
+    return asset_record
+
+
+def asset_lines(
+    asset_record: pd.DataFrame,
+    unrealized_changes: pd.Series,
+    symbol: str,
+    redraw_from: datetime | None = None,
+) -> dict[str, list[tuple[np.ndarray, np.ndarray]]]:
+    # When `redraw_from` is given,
+    # the line of asset with unrealized profit starts from there
+    lines = {}
+
+    # asset
+    sr = asset_record["Result Asset"]
+    data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
+    data_y = sr.to_numpy(dtype=np.float32)
+    lines["asset"] = [(data_x, data_y)]
+
+    # asset with unrealized profit,
+    # forward-filled onto 10-second moments with numpy
+    # so that years of moments don't hold the GIL in pandas
+    record_moments = sr.index.to_numpy(dtype=np.int64)
+    record_assets = sr.to_numpy(dtype=np.float64)
+    if len(sr) >= 2:
+        interval = 10 * 10**9
+        moment_from = record_moments[0] - record_moments[0] % interval
+        moment_until = record_moments[-1] - record_moments[-1] % interval
+        if redraw_from is not None:
+            # same as resampling, but only for the part to be redrawn
+            redraw_moment = pd.Timestamp(redraw_from).value
+            moment_from = max(moment_from, redraw_moment)
+        moments = np.arange(moment_from, moment_until + 1, interval)
+        positions = np.searchsorted(record_moments, moments, side="right") - 1
+        assets = record_assets[np.maximum(positions, 0)]
+        assets[positions < 0] = np.nan
+    else:
+        moments = record_moments
+        assets = record_assets
+    unrealized_moments = unrealized_changes.index.to_numpy(dtype=np.int64)
+    unrealized_values = unrealized_changes.to_numpy(dtype=np.float64)
+    positions = np.searchsorted(unrealized_moments, moments)
+    positions = np.minimum(positions, len(unrealized_moments) - 1)
+    if len(unrealized_moments) > 0:
+        is_matched = unrealized_moments[positions] == moments
+        changes = np.where(is_matched, unrealized_values[positions], np.nan)
+    else:
+        changes = np.full(len(moments), np.nan)
+    data_x = moments / 10**9 + 5
+    data_y = (assets * (1 + changes)).astype(np.float32)
+    lines["asset_with_unrealized_profit"] = [(data_x, data_y)]
+
+    # buy and sell
+    df = asset_record.loc[asset_record["Symbol"] == symbol]
+    for side in ("sell", "buy"):
+        sr = df[df["Side"] == side]["Fill Price"]
+        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
+        data_y = sr.to_numpy(dtype=np.float32)
+        lines[side] = [(data_x, data_y)]
+
+    return lines
+
+
+def indicator_lines(
+    indicators: pd.DataFrame, symbol: str
+) -> dict[str, list[tuple[str, np.ndarray, np.ndarray]]]:
+    # Each line comes with its color, which is written in the column name
+    lines = {}
+    for category, line_name in (
+        ("Price", "price_indicators"),
+        ("Volume", "volume_indicators"),
+        ("Abstract", "abstract_indicators"),
+    ):
+        df = indicators[symbol][category]
+        data_x = df.index.to_numpy(dtype=np.int64) / 10**9
+        data_x += 5
+        lines[line_name] = []
+        for column_name in df.columns:
+            data_y = df[column_name].to_numpy(dtype=np.float32)
+            inside_strings = re.findall(r"\(([^)]+)", column_name)
+            if len(inside_strings) == 0:
+                color = "#AAAAAA"
+            else:
+                color = inside_strings[0]
+            lines[line_name].append((color, data_x, data_y))
+    return lines
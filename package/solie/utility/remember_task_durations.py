@@ -10,6 +10,7 @@ task_durations = {
     "display_light_transaction_lines": deque(maxlen=60),
     "display_all_transaction_lines": deque(maxlen=20),
     "place_orders": deque(maxlen=60),
+    "order_round_trip": deque(maxlen=360),
 }
 
 
@@ -0,0 +1,84 @@
+import logging
+import os
+from collections import OrderedDict, deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+import numpy as np
+
+# Stages that each 10-second cycle goes through, in order
+STAGES = (
+    "last_trade",
+    "candle_added",
+    "indicators_made",
+    "decision_made",
+    "orders_acknowledged",
+)
+
+_open_traces: OrderedDict[str, dict[str, datetime]] = OrderedDict()
+_stage_latencies = {stage: deque(maxlen=360) for stage in (*STAGES[1:], "total")}
+
+_file_logger = logging.getLogger("solie.trace")
+_file_logger.propagate = False
+
+
+def prepare(trace_path: str):
+    os.makedirs(trace_path, exist_ok=True)
+    file_handler = RotatingFileHandler(
+        f"{trace_path}/cycle_traces.csv",
+        maxBytes=10 * 1024 * 1024,
+        backupCount=5,
+        encoding="utf8",
+    )
+    _file_logger.addHandler(file_handler)
+    _file_logger.setLevel("INFO")
+
+
+def make_id(moment: datetime) -> str:
+    # The cycle is identified by the moment of the bar it handles
+    return moment.strftime("%Y%m%dT%H%M%S")
+
+
+def mark(moment: datetime, stage: str, time: datetime):
+    trace_id = make_id(moment)
+    if trace_id not in _open_traces:
+        _open_traces[trace_id] = {}
+    _open_traces[trace_id][stage] = time
+
+    if stage == STAGES[-1]:
+        _finish(trace_id)
+    while len(_open_traces) > 6:
+        oldest_trace_id = next(iter(_open_traces))
+        _finish(oldest_trace_id)
+
+
+def _finish(trace_id: str):
+    stage_times = _open_traces.pop(trace_id)
+
+    # Each stage is measured from the stage right before it
+    latencies = {}
+    for before_stage, stage in zip(STAGES[:-1], STAGES[1:]):
+        if before_stage in stage_times and stage in stage_times:
+            latency = (stage_times[stage] - stage_times[before_stage]).total_seconds()
+            latencies[stage] = latency
+    if STAGES[0] in stage_times and STAGES[-1] in stage_times:
+        total = (stage_times[STAGES[-1]] - stage_times[STAGES[0]]).total_seconds()
+        latencies["total"] = total
+
+    for stage, latency in latencies.items():
+        _stage_latencies[stage].append(latency)
+
+    cells = [trace_id]
+    for stage in STAGES:
+        stage_time = stage_times.get(stage)
+        cells.append("" if stage_time is None else stage_time.isoformat())
+    _file_logger.info(",".join(cells))
+
+
+def get_percentiles() -> dict[str, tuple[float, float, float]]:
+    percentiles = {}
+    for stage, deque_data in _stage_latencies.items():
+        if len(deque_data) > 0:
+            p50, p95, p99 = np.percentile(deque_data, (50, 95, 99))
+            percentiles[stage] = (float(p50), float(p95), float(p99))
+    return percentiles
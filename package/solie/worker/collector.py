@@ -3,6 +3,7 @@ import itertools
 import math
 import os
 import random
+import time
 import webbrowser
 from collections import deque
 from datetime import datetime, timedelta, timezone
@@ -14,20 +15,31 @@ import pandas as pd
 import solie
 from solie.definition.api_requester import ApiRequester
 from solie.definition.api_streamer import ApiStreamer
+from solie.definition.archive_downloader import ArchiveDownloader
+from solie.definition.candle_assembler import CandleAssembler
+from solie.definition.coverage_tracker import CoverageTracker
 from solie.definition.rw_lock import RWLock
-from solie.definition.structs import DownloadPreset
+from solie.definition.structs import (
+    BarClosed,
+    DownloadPreset,
+    LatestState,
+    TradesPassed,
+)
 from solie.overlay.donation_guide import DonationGuide
 from solie.overlay.download_fill_option import DownloadFillOption
 from solie.parallel import go
 from solie.utility import (
     check_internet,
+    clock,
     combine_candle_datas,
     download_aggtrade_data,
+    exchange_information,
     fill_holes_with_aggtrades,
     remember_task_durations,
     sort_pandas,
     standardize,
     stop_flag,
+    trace_cycles,
     user_settings,
 )
 
@@ -42,7 +54,6 @@ class Collector:
         # ■■■■■ worker secret memory ■■■■■
 
         self.secret_memory = {
-            "price_precisions": {},
             "markets_gone": [],
         }
 
@@ -53,11 +64,22 @@ class Collector:
         self.aggtrade_candle_sizes = {}
         for symbol in user_settings.get_data_settings()["target_symbols"]:
             self.aggtrade_candle_sizes[symbol] = 0
+        self.last_trade_bar_timestamp = 0
+        self.is_filling_holes = False
+        self.download_fill_status = ""
+
+        # Latest state of each symbol, updated by stream handlers.
+        # Readers can access it without locks to avoid copying large arrays.
+        self.latest_states: dict[str, LatestState] = {}
+        for symbol in user_settings.get_data_settings()["target_symbols"]:
+            self.latest_states[symbol] = LatestState()
 
         # Candle data.
         # It's expected to have only the data of current year,
         # while data of previous years are stored in the disk.
         self.candle_data = RWLock(standardize.candle_data())
+        target_symbols = user_settings.get_data_settings()["target_symbols"]
+        self.candle_coverage = CoverageTracker(target_symbols)
 
         # Realtime data chunks
         field_names = itertools.product(
@@ -140,7 +162,7 @@ class Collector:
 
     async def load(self, *args, **kwargs):
         # candle data
-        current_year = datetime.now(timezone.utc).year
+        current_year = clock.now().year
         async with self.candle_data.write_lock as cell:
             filepath = f"{self.workerpath}/candle_data_{current_year}.pickle"
             if os.path.isfile(filepath):
@@ -148,10 +170,12 @@ class Collector:
                 if not df.index.is_monotonic_increasing:
                     df = await go(sort_pandas.data_frame, df)
                 cell.data = df
+                recent_moment = clock.now() - timedelta(days=2)
+                self.candle_coverage.update(df[recent_moment:])
         await asyncio.sleep(0)
 
     async def organize_data(self, *args, **kwargs):
-        start_time = datetime.now(timezone.utc)
+        start_time = clock.now()
 
         async with self.candle_data.write_lock as cell:
             original_index = cell.data.index
@@ -175,13 +199,13 @@ class Collector:
             mask = cell.data["index"] > slice_from
             cell.data = cell.data[mask].copy()
 
-        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+        duration = (clock.now() - start_time).total_seconds()
         remember_task_durations.add("collector_organize_data", duration)
 
     async def save_candle_data(self, *args, **kwargs):
         # ■■■■■ default values ■■■■■
 
-        current_year = datetime.now(timezone.utc).year
+        current_year = clock.now().year
         filepath = f"{self.workerpath}/candle_data_{current_year}.pickle"
 
         async with self.candle_data.read_lock as cell:
@@ -216,26 +240,7 @@ class Collector:
         if not check_internet.connected():
             return
 
-        payload = {}
-        response = await self.api_requester.binance(
-            http_method="GET",
-            path="/fapi/v1/exchangeInfo",
-            payload=payload,
-        )
-        about_exchange = response
-
-        for about_symbol in about_exchange["symbols"]:
-            symbol = about_symbol["symbol"]
-
-            about_filter = {}
-            for filter in about_symbol["filters"]:
-                if filter["filterType"] == "PRICE_FILTER":
-                    about_filter = filter
-                    break
-
-            ticksize = float(about_filter["tickSize"])
-            price_precision = int(math.log10(1 / ticksize))
-            self.secret_memory["price_precisions"][symbol] = price_precision
+        await exchange_information.refresh()
 
     async def fill_candle_data_holes(self, *args, **kwargs):
         # ■■■■■ check internet connection ■■■■■
@@ -243,111 +248,168 @@ class Collector:
         if not check_internet.connected():
             return
 
+        # ■■■■■ prevent overlapping ■■■■■
+
+        # A long outage can take more than a scheduled interval to recover
+        if self.is_filling_holes:
+            return
+        self.is_filling_holes = True
+
+        try:
+            await self.fill_candle_data_holes_once()
+        finally:
+            self.is_filling_holes = False
+
+    async def fill_candle_data_holes_once(self, *args, **kwargs):
         # ■■■■■ moments ■■■■■
 
-        current_moment = datetime.now(timezone.utc).replace(microsecond=0)
+        current_moment = clock.now().replace(microsecond=0)
         current_moment = current_moment - timedelta(seconds=current_moment.second % 10)
-        split_moment = current_moment - timedelta(days=2)
+        from_moment = current_moment - timedelta(hours=24)
+        until_moment = current_moment - timedelta(minutes=1)
+
+        # ■■■■■ plan ■■■■■
+
+        # All holes are found up front and filled symbol by symbol concurrently,
+        # within the request budget given to backfill by the request scheduler.
+        target_symbols = user_settings.get_data_settings()["target_symbols"]
+        missing_ranges = {}
+        for symbol in target_symbols:
+            symbol_missing_ranges = self.candle_coverage.find_missing_ranges(
+                symbol, from_moment, until_moment
+            )
+            if len(symbol_missing_ranges) > 0:
+                missing_ranges[symbol] = symbol_missing_ranges
+
+        if len(missing_ranges) == 0:
+            self.secret_memory["markets_gone"] = []
+            return
+
+        # Holes that are close to each other are filled with one paging of trades,
+        # because each paging starts with a request of heavy weight
+        # while paging through a short gap takes only a request or two.
+        merging_gap = timedelta(minutes=1)
+        range_groups: dict[str, list[list[tuple[datetime, datetime]]]] = {}
+        for symbol, symbol_missing_ranges in missing_ranges.items():
+            groups = [[symbol_missing_ranges[0]]]
+            for missing_range in symbol_missing_ranges[1:]:
+                if missing_range[0] - groups[-1][-1][1] <= merging_gap:
+                    groups[-1].append(missing_range)
+                else:
+                    groups.append([missing_range])
+            range_groups[symbol] = groups
 
         # ■■■■■ fill holes ■■■■■
 
         markets_gone = []
-        full_symbols = []
-        request_count = 0
 
-        # only the recent part
-        async with self.candle_data.read_lock as cell:
-            recent_candle_data = cell.data[cell.data.index >= split_moment].copy()
-
-        did_fill = False
+        async def merge(filled_candle_data: pd.DataFrame):
+            if len(filled_candle_data) == 0:
+                return
+            async with self.candle_data.write_lock as cell:
+                filled_index = filled_candle_data.index
+                combined_index = cell.data.index.union(filled_index)
+                if len(combined_index) != len(cell.data.index):
+                    cell.data = cell.data.reindex(combined_index)
+                filled_columns = filled_candle_data.columns
+                cell.data.loc[filled_index, filled_columns] = filled_candle_data
+                self.candle_coverage.update(cell.data.loc[filled_index])
+
+        def pick_missing_rows(
+            filled_candle_data: pd.DataFrame, group: list[tuple[datetime, datetime]]
+        ) -> pd.DataFrame:
+            # Rows in the gaps between holes are already complete
+            filled_index = filled_candle_data.index
+            is_missing = np.zeros(len(filled_index), dtype=np.bool_)
+            for range_start, range_end in group:
+                is_inside = (filled_index >= range_start) & (filled_index <= range_end)
+                is_missing |= is_inside
+            return filled_candle_data[is_missing]
+
+        async def job(symbol: str):
+            for group in range_groups[symbol]:
+                range_start = group[0][0]
+                range_end = group[-1][1]
+
+                # Only the rows just before the hole are looked at
+                # to find the last price
+                async with self.candle_data.read_lock as cell:
+                    position = cell.data.index.searchsorted(range_start)
+                    lookup_from = max(0, position - 24 * 60 * 6)
+                    close_sr = cell.data[(symbol, "Close")].iloc[lookup_from:position]
+                    close_sr = close_sr.dropna()
+                    last_price = close_sr.iloc[-1] if len(close_sr) > 0 else np.nan
 
-        target_symbols = user_settings.get_data_settings()["target_symbols"]
-        while len(full_symbols) < len(target_symbols) and request_count < 10:
-            for symbol in target_symbols:
-                if symbol in full_symbols:
-                    continue
-
-                from_moment = current_moment - timedelta(hours=24)
-                until_moment = current_moment - timedelta(minutes=1)
-
-                inspect_df: pd.DataFrame = recent_candle_data[symbol][
-                    from_moment:until_moment
-                ]
-                base_index = inspect_df.dropna().index
-                temp_sr = pd.Series(0, index=base_index)
-                written_moments = len(temp_sr)
-
-                if written_moments == (86400 - 60) / 10 + 1:
-                    # case when there are no holes
-                    full_symbols.append(symbol)
-                    continue
-
-                if from_moment not in temp_sr.index:
-                    temp_sr[from_moment] = np.nan
-                if until_moment not in temp_sr.index:
-                    temp_sr[until_moment] = np.nan
-                temp_sr = await go(temp_sr.asfreq, "10S")
-                isnan_sr = await go(temp_sr.isna)
-                nan_index = isnan_sr[isnan_sr == 1].index
-                moment_to_fill_from: datetime = nan_index[0]  # type:ignore
-
-                # request historical aggtrade data
                 aggtrades = {}
-                last_fetched_time = moment_to_fill_from
-                while last_fetched_time < moment_to_fill_from + timedelta(seconds=10):
-                    # intend to fill at least one 10 second candle bar
+                moment_to_fill_from = range_start
+                # A block is complete only when a trade after it was fetched
+                range_complete_moment = range_end + timedelta(seconds=10)
+                from_id = None
+                is_range_fetched = False
+                while not is_range_fetched:
                     payload = {
                         "symbol": symbol,
-                        "startTime": int(last_fetched_time.timestamp() * 1000),
                         "limit": 1000,
                     }
+                    if from_id is None:
+                        payload["startTime"] = int(range_start.timestamp() * 1000)
+                    else:
+                        # Paging by ID doesn't return the same trades again
+                        payload["fromId"] = from_id
                     response = await self.api_requester.binance(
                         http_method="GET",
                         path="/fapi/v1/aggTrades",
                         payload=payload,
                     )
-                    request_count += 1
-                    if len(response) == 0:
-                        if symbol not in markets_gone:
-                            markets_gone.append(symbol)
-                        break
-                    for aggtrade in response:
-                        aggtrade_id = aggtrade["a"]
-                        aggtrades[aggtrade_id] = aggtrade
-                    last_fetched_id = max(aggtrades.keys())
-                    last_fetched_time = datetime.fromtimestamp(
-                        aggtrades[last_fetched_id]["T"] / 1000, tz=timezone.utc
-                    )
 
-                recent_candle_data = await go(
-                    fill_holes_with_aggtrades.do,
-                    symbol,
-                    recent_candle_data,
-                    aggtrades,
-                    moment_to_fill_from,
-                    last_fetched_time,
-                )
-                did_fill = True
+                    if len(response) == 0 and from_id is None:
+                        markets_gone.append(symbol)
+                        return
+                    elif len(response) == 0:
+                        # Every trade until now was fetched
+                        is_range_fetched = True
+                        moment_to_fill_until = range_end
+                    else:
+                        for aggtrade in response:
+                            aggtrades[aggtrade["a"]] = aggtrade
+                        from_id = response[-1]["a"] + 1
+                        last_fetched_time = datetime.fromtimestamp(
+                            response[-1]["T"] / 1000, tz=timezone.utc
+                        )
+                        is_range_fetched = last_fetched_time >= range_complete_moment
+                        if not is_range_fetched and len(aggtrades) < 50000:
+                            continue
+                        moment_to_fill_until = min(
+                            range_end,
+                            last_fetched_time - timedelta(seconds=10),
+                        )
 
-        self.secret_memory["markets_gone"] = markets_gone
+                    if moment_to_fill_until < moment_to_fill_from:
+                        continue
+                    filled_candle_data = await go(
+                        fill_holes_with_aggtrades.do,
+                        symbol,
+                        aggtrades,
+                        moment_to_fill_from,
+                        moment_to_fill_until,
+                        last_price,
+                    )
+                    await merge(pick_missing_rows(filled_candle_data, group))
+                    if len(filled_candle_data) > 0:
+                        last_price = filled_candle_data[(symbol, "Close")].iloc[-1]
+                    moment_to_fill_from = moment_to_fill_until + timedelta(seconds=10)
+
+                    # Keep only the trades of blocks that are not filled yet
+                    fill_from_timestamp = moment_to_fill_from.timestamp() * 1000
+                    aggtrades = {
+                        aggtrade_id: aggtrade
+                        for aggtrade_id, aggtrade in aggtrades.items()
+                        if aggtrade["T"] >= fill_from_timestamp
+                    }
 
-        if not did_fill:
-            return
+        await asyncio.gather(*(job(symbol) for symbol in missing_ranges.keys()))
 
-        # combine
-        async with self.candle_data.write_lock as cell:
-            original_candle_data = cell.data[cell.data.index < split_moment]
-            # in case the other data is added during the task
-            # read the data again
-            temp_df = cell.data[cell.data.index >= split_moment]
-            recent_candle_data = recent_candle_data.combine_first(temp_df)
-            if not recent_candle_data.index.is_monotonic_increasing:
-                recent_candle_data = await go(
-                    sort_pandas.data_frame,
-                    recent_candle_data,
-                )
-            candle_data = pd.concat([original_candle_data, recent_candle_data])
-            cell.data = candle_data
+        self.secret_memory["markets_gone"] = markets_gone
 
     async def display_status_information(self, *args, **kwargs):
         async with self.candle_data.read_lock as cell:
@@ -355,21 +417,16 @@ class Collector:
                 # when the app is executed for the first time
                 return
 
-        if len(self.secret_memory["price_precisions"]) == 0:
+        if not exchange_information.is_loaded():
             # right after the app execution
             return
 
         # price
-        async with self.aggregate_trades.read_lock as cell:
-            ar = cell.data.copy()
-        price_precisions = self.secret_memory["price_precisions"]
-
         for symbol in user_settings.get_data_settings()["target_symbols"]:
-            temp_ar = ar[str((symbol, "Price"))]
-            temp_ar = temp_ar[temp_ar != 0]
-            if len(temp_ar) > 0:
-                price_precision = price_precisions[symbol]
-                latest_price = temp_ar[-1]
+            latest_price = self.latest_states[symbol].last_price
+            if latest_price != 0:
+                symbol_information = exchange_information.get_symbol(symbol)
+                price_precision = symbol_information.price_precision
                 text = f"＄{latest_price:.{price_precision}f}"
             else:
                 text = "Unavailable"
@@ -407,6 +464,9 @@ class Collector:
             text += f"24h candle data accumulation rate {cumulation_rate * 100:.2f}%"
             text += "  ⦁  "
             text += f"Realtime data length {written_length_text}"
+            if self.download_fill_status != "":
+                text += "  ⦁  "
+                text += self.download_fill_status
         else:
             markets_gone = self.secret_memory["markets_gone"]
             if len(markets_gone) == 1:
@@ -417,11 +477,10 @@ class Collector:
         solie.window.label_6.setText(text)
 
     async def get_candle_data_cumulation_rate(self, *args, **kwargs):
-        current_moment = datetime.now(timezone.utc).replace(microsecond=0)
+        current_moment = clock.now().replace(microsecond=0)
         current_moment = current_moment - timedelta(seconds=current_moment.second % 10)
         count_start_moment = current_moment - timedelta(hours=24)
-        async with self.candle_data.read_lock as cell:
-            cumulated_moments = len(cell.data[count_start_moment:].dropna())
+        cumulated_moments = self.candle_coverage.count_complete(count_start_moment)
         needed_moments = 24 * 60 * 60 / 10
         cumulation_rate = min(float(1), (cumulated_moments + 1) / needed_moments)
         return cumulation_rate
@@ -454,7 +513,7 @@ class Collector:
         download_presets: List[DownloadPreset] = []
         target_symbols = user_settings.get_data_settings()["target_symbols"]
         if filling_type == 0:
-            current_year = datetime.now(timezone.utc).year
+            current_year = clock.now().year
             for year in range(2020, current_year):
                 for month in range(1, 12 + 1):
                     for symbol in target_symbols:
@@ -467,8 +526,8 @@ class Collector:
                             )
                         )
         elif filling_type == 1:
-            current_year = datetime.now(timezone.utc).year
-            current_month = datetime.now(timezone.utc).month
+            current_year = clock.now().year
+            current_month = clock.now().month
             for month in range(1, current_month):
                 for symbol in target_symbols:
                     download_presets.append(
@@ -480,9 +539,9 @@ class Collector:
                         )
                     )
         elif filling_type == 2:
-            current_year = datetime.now(timezone.utc).year
-            current_month = datetime.now(timezone.utc).month
-            current_day = datetime.now(timezone.utc).day
+            current_year = clock.now().year
+            current_month = clock.now().month
+            current_day = clock.now().day
             for target_day in range(1, current_day):
                 for symbol in target_symbols:
                     download_presets.append(
@@ -495,7 +554,7 @@ class Collector:
                         )
                     )
         elif filling_type == 3:
-            now = datetime.now(timezone.utc)
+            now = clock.now()
             yesterday = now - timedelta(hours=24)
             day_before_yesterday = yesterday - timedelta(hours=24)
             for symbol in target_symbols:
@@ -551,7 +610,7 @@ class Collector:
         # ■■■■■ calculate in parellel ■■■■■
 
         # Gather information about years.
-        current_year = datetime.now(timezone.utc).year
+        current_year = clock.now().year
         all_years: Set[int] = {t.year for t in download_presets}
 
         # Download and save historical data by year for lower memory usage.
@@ -562,53 +621,188 @@ class Collector:
         for download_preset in download_presets:
             classified_download_presets[download_preset.year].append(download_preset)
 
-        for preset_year, download_presets in classified_download_presets.items():
-            # Make an empty dataframe, but of same types with that of candle data.
-            async with self.candle_data.read_lock as cell:
-                combined_df = RWLock(cell.data.iloc[0:0].copy())
+        def get_period(download_preset: DownloadPreset) -> tuple[datetime, datetime]:
+            if download_preset.unit_size == "daily":
+                moment_from = datetime(
+                    download_preset.year,
+                    download_preset.month,
+                    download_preset.day,
+                    tzinfo=timezone.utc,
+                )
+                moment_until = moment_from + timedelta(days=1)
+            else:
+                moment_from = datetime(
+                    download_preset.year,
+                    download_preset.month,
+                    1,
+                    tzinfo=timezone.utc,
+                )
+                moment_until = (moment_from + timedelta(days=32)).replace(day=1)
+            return moment_from, moment_until
 
-            async def download_fill(download_preset):
-                nonlocal done_steps
-                nonlocal combined_df
+        async with self.candle_data.read_lock as cell:
+            candle_data_columns = cell.data.columns
+
+        # Archives are downloaded over a few connections,
+        # while the parsing stage has as many workers as processes.
+        # The queue between them is bounded
+        # so that downloads don't run too far ahead of parsing.
+        cachepath = f"{self.workerpath}/archives"
+        archive_downloader = ArchiveDownloader(cachepath)
+        downloader_count = 8
+        parser_count = solie.parallel.process_count
+        remaining_presets: deque[DownloadPreset] = deque()
+        downloaded_archives: asyncio.Queue[tuple[DownloadPreset, str] | None]
+        downloaded_archives = asyncio.Queue(parser_count)
+        parsed_trades = 0
+        is_pipeline_done = False
+
+        # ■■■■■ report the throughput ■■■■■
+
+        async def report_throughput():
+            before_bytes = archive_downloader.downloaded_bytes
+            before_trades = parsed_trades
+            before_time = time.perf_counter()
+            while not is_pipeline_done:
+                await asyncio.sleep(1)
+                current_time = time.perf_counter()
+                duration = current_time - before_time
+                current_bytes = archive_downloader.downloaded_bytes
+                megabytes_per_second = (current_bytes - before_bytes) / duration / 10**6
+                trades_per_second = (parsed_trades - before_trades) / duration
+                before_bytes = current_bytes
+                before_trades = parsed_trades
+                before_time = current_time
+                text = ""
+                text += f"Downloading {megabytes_per_second:.1f}MB/s"
+                text += f" with {len(remaining_presets)} waiting"
+                text += "  ⦁  "
+                text += f"Parsing {trades_per_second:,.0f} trades/s"
+                text += f" with {downloaded_archives.qsize()}/{parser_count} queued"
+                self.download_fill_status = text
+            self.download_fill_status = ""
+
+        asyncio.create_task(report_throughput())
+
+        # ■■■■■ download and parse by year ■■■■■
 
-                if stop_flag.find("download_fill_candle_data", task_id):
-                    return
+        try:
+            for preset_year, download_presets in classified_download_presets.items():
+                # Results are written into an array that spans all presets of the year.
+                periods = [get_period(p) for p in download_presets]
+                candle_assembler = CandleAssembler(
+                    candle_data_columns,
+                    min(p[0] for p in periods),
+                    max(p[1] for p in periods),
+                )
+                remaining_presets.extend(download_presets)
 
-                returned = await go(download_aggtrade_data.do, download_preset)
-                if returned is not None:
-                    new_df = returned
-                    async with combined_df.write_lock as cell:
-                        new = await go(combine_candle_datas.do, new_df, cell.data)
-                        cell.data = new
+                async def download_archives():
+                    nonlocal done_steps
 
-                done_steps += 1
+                    while len(remaining_presets) > 0:
+                        download_preset = remaining_presets.popleft()
+                        if stop_flag.find("download_fill_candle_data", task_id):
+                            remaining_presets.clear()
+                            return
 
-            await asyncio.gather(download_fill(p) for p in download_presets)
+                        url = download_aggtrade_data.get_url(download_preset)
+                        try:
+                            checksum = await archive_downloader.download(url)
+                        except Exception as error:
+                            archive_downloader.failed_urls.append(url)
+                            text = f"Could not download {url}\n{repr(error)}"
+                            solie.logger.warning(text)
+                            checksum = None
+                        if checksum is None:
+                            done_steps += 1
+                            continue
+
+                        await downloaded_archives.put((download_preset, checksum))
+
+                async def parse_archives():
+                    nonlocal done_steps
+                    nonlocal parsed_trades
+
+                    while True:
+                        downloaded_archive = await downloaded_archives.get()
+                        if downloaded_archive is None:
+                            return
+
+                        # An archive that can't be parsed is reported
+                        # without stopping the others
+                        download_preset, checksum = downloaded_archive
+                        try:
+                            new_df, trade_count = await go(
+                                download_aggtrade_data.do,
+                                download_preset,
+                                cachepath,
+                                checksum,
+                            )
+                            parsed_trades += trade_count
+                            if new_df is not None:
+                                candle_assembler.write(new_df)
+                        except Exception as error:
+                            url = download_aggtrade_data.get_url(download_preset)
+                            archive_downloader.failed_urls.append(url)
+                            text = f"Could not parse {url}\n{repr(error)}"
+                            solie.logger.warning(text)
+
+                        done_steps += 1
+
+                async def download_all_archives():
+                    # Parsers always get their signals to stop,
+                    # so that none of them is left waiting for archives
+                    try:
+                        await asyncio.gather(
+                            *(download_archives() for _ in range(downloader_count))
+                        )
+                    finally:
+                        for _ in range(parser_count):
+                            await downloaded_archives.put(None)
 
-            if preset_year < current_year:
-                # For data of previous years,
-                # save them in the disk.
-                async with combined_df.read_lock as cell:
+                await asyncio.gather(
+                    download_all_archives(),
+                    *(parse_archives() for _ in range(parser_count)),
+                )
+
+                combined_df = candle_assembler.to_frame()
+
+                if preset_year < current_year:
+                    # For data of previous years,
+                    # save them in the disk.
                     await go(
-                        cell.data.to_pickle,
+                        combined_df.to_pickle,
                         f"{self.workerpath}/candle_data_{preset_year}.pickle",
                     )
-            else:
-                # For data of current year, pass it to this collector worker
-                # and store them in the memory.
-                async with combined_df.read_lock as cell:
+                else:
+                    # For data of current year, pass it to this collector worker
+                    # and store them in the memory.
                     async with self.candle_data.write_lock as cell_worker:
                         cell_worker.data = await go(
                             combine_candle_datas.do,
-                            cell.data,
+                            combined_df,
                             cell_worker.data,
                         )
+                        recent_moment = clock.now() - timedelta(days=2)
+                        recent_candle_data = cell_worker.data[recent_moment:]
+                        self.candle_coverage.update(recent_candle_data)
+        finally:
+            is_pipeline_done = True
+            await archive_downloader.close()
 
         # ■■■■■ add to log ■■■■■
 
         text = "Filled the candle data with the history data downloaded from Binance"
         solie.logger.info(text)
 
+        if len(archive_downloader.failed_urls) > 0:
+            text = f"{len(archive_downloader.failed_urls)} archives couldn't be filled,"
+            text += " so try filling the range again later"
+            for failed_url in archive_downloader.failed_urls:
+                text += f"\n{failed_url}"
+            solie.logger.warning(text)
+
         # ■■■■■ display to graphs ■■■■■
 
         asyncio.create_task(solie.window.transactor.display_lines())
@@ -617,11 +811,15 @@ class Collector:
 
     async def add_book_tickers(self, *args, **kwargs):
         received: dict = kwargs.get("received")  # type:ignore
-        start_time = datetime.now(timezone.utc)
+        start_time = clock.now()
         symbol = received["s"]
         best_bid = received["b"]
         best_ask = received["a"]
         event_time = np.datetime64(received["E"] * 10**6, "ns")
+        latest_state = self.latest_states.get(symbol)
+        if latest_state is not None:
+            latest_state.best_bid_price = float(best_bid)
+            latest_state.best_ask_price = float(best_ask)
         async with self.realtime_data_chunks.write_lock as cell:
             original_size = cell.data[-1].shape[0]
             cell.data[-1].resize(original_size + 1, refcheck=False)
@@ -630,12 +828,12 @@ class Collector:
             cell.data[-1][-1][find_key] = best_bid
             find_key = str((symbol, "Best Ask Price"))
             cell.data[-1][-1][find_key] = best_ask
-        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+        duration = (clock.now() - start_time).total_seconds()
         remember_task_durations.add("add_book_tickers", duration)
 
     async def add_mark_price(self, *args, **kwargs):
         received: dict = kwargs.get("received")  # type:ignore
-        start_time = datetime.now(timezone.utc)
+        start_time = clock.now()
         target_symbols = user_settings.get_data_settings()["target_symbols"]
         event_time = np.datetime64(received[0]["E"] * 10**6, "ns")
         filtered_data = {}
@@ -644,6 +842,7 @@ class Collector:
             if symbol in target_symbols:
                 mark_price = float(about_mark_price["p"])
                 filtered_data[symbol] = mark_price
+                self.latest_states[symbol].mark_price = mark_price
         async with self.realtime_data_chunks.write_lock as cell:
             original_size = cell.data[-1].shape[0]
             cell.data[-1].resize(original_size + 1, refcheck=False)
@@ -651,23 +850,32 @@ class Collector:
             for symbol, mark_price in filtered_data.items():
                 find_key = str((symbol, "Mark Price"))
                 cell.data[-1][-1][find_key] = mark_price
-        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+        duration = (clock.now() - start_time).total_seconds()
         remember_task_durations.add("add_mark_price", duration)
 
     async def add_aggregate_trades(self, *args, **kwargs):
         received: dict = kwargs.get("received")  # type:ignore
-        start_time = datetime.now(timezone.utc)
+        start_time = clock.now()
         symbol = received["s"]
         price = float(received["p"])
         volume = float(received["q"])
         trade_time = np.datetime64(received["T"] * 10**6, "ns")
+        latest_state = self.latest_states.get(symbol)
+        if latest_state is not None:
+            latest_state.last_price = price
+            latest_state.last_trade_timestamp = received["T"]
         async with self.aggregate_trades.write_lock as cell:
             original_size = cell.data.shape[0]
             cell.data.resize(original_size + 1, refcheck=False)
             cell.data[-1]["index"] = trade_time
             cell.data[-1][str((symbol, "Price"))] = price
             cell.data[-1][str((symbol, "Volume"))] = volume
-        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+        bar_timestamp = received["T"] - received["T"] % 10000
+        if bar_timestamp > self.last_trade_bar_timestamp:
+            self.last_trade_bar_timestamp = bar_timestamp
+            bar_moment = datetime.fromtimestamp(bar_timestamp / 1000, tz=timezone.utc)
+            solie.window.event_bus.publish(TradesPassed(bar_moment))
+        duration = (clock.now() - start_time).total_seconds()
         remember_task_durations.add("add_aggregate_trades", duration)
 
     async def clear_aggregate_trades(self, *args, **kwargs):
@@ -675,8 +883,7 @@ class Collector:
             cell.data = cell.data[0:0].copy()
 
     async def add_candle_data(self, *args, **kwargs):
-        current_moment = datetime.now(timezone.utc).replace(microsecond=0)
-        current_moment = current_moment - timedelta(seconds=current_moment.second % 10)
+        current_moment = clock.scheduled_moment()
         before_moment = current_moment - timedelta(seconds=10)
 
         async with self.aggregate_trades.read_lock as cell:
@@ -684,12 +891,16 @@ class Collector:
         if data_length == 0:
             return
 
-        for _ in range(20):
-            async with self.aggregate_trades.read_lock as cell:
-                last_received_index = cell.data[-1]["index"]
-            if np.datetime64(current_moment) < last_received_index:
-                break
-            await asyncio.sleep(0.1)
+        # Trades of the finished bar are complete
+        # once a trade from the next bar has arrived.
+        try:
+            await solie.window.event_bus.wait_for(
+                TradesPassed,
+                lambda event: event.moment >= current_moment,
+                timeout=2,
+            )
+        except asyncio.TimeoutError:
+            pass
 
         async with self.aggregate_trades.read_lock as cell:
             aggregate_trades = cell.data.copy()
@@ -699,6 +910,7 @@ class Collector:
             return
 
         new_datas = {}
+        last_trade_index = None
 
         for symbol in user_settings.get_data_settings()["target_symbols"]:
             block_start_timestamp = before_moment.timestamp()
@@ -712,6 +924,9 @@ class Collector:
             self.aggtrade_candle_sizes[symbol] = block_ar.size
 
             if len(block_ar) > 0:
+                block_last_index = block_ar["index"].max()
+                if last_trade_index is None or last_trade_index < block_last_index:
+                    last_trade_index = block_last_index
                 open_price = block_ar[0][str((symbol, "Price"))]
                 high_price = block_ar[str((symbol, "Price"))].max()
                 low_price = block_ar[str((symbol, "Price"))].min()
@@ -739,10 +954,20 @@ class Collector:
         async with self.candle_data.write_lock as cell:
             for column_name, new_data_value in new_datas.items():
                 cell.data.loc[before_moment, column_name] = new_data_value
+            self.candle_coverage.update(cell.data.loc[[before_moment]])
             if not cell.data.index.is_monotonic_increasing:
                 cell.data = await go(sort_pandas.data_frame, cell.data)
 
-        duration = (datetime.now(timezone.utc) - current_moment).total_seconds()
+        if last_trade_index is not None:
+            last_trade_timestamp = last_trade_index.astype(np.int64) / 10**9
+            last_trade_time = datetime.fromtimestamp(
+                last_trade_timestamp, tz=timezone.utc
+            )
+            trace_cycles.mark(before_moment, "last_trade", last_trade_time)
+        trace_cycles.mark(before_moment, "candle_added", clock.now())
+        solie.window.event_bus.publish(BarClosed(before_moment))
+
+        duration = (clock.now() - current_moment).total_seconds()
         remember_task_durations.add("add_candle_data", duration)
 
     async def stop_filling_candle_data(self, *args, **kwargs):
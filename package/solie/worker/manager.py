@@ -4,18 +4,20 @@ import os
 import statistics
 import webbrowser
 from collections import deque
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 
 import aiofiles
-import time_machine
 
 import solie
 from solie.definition.api_requester import ApiRequester
 from solie.parallel import go
 from solie.utility import (
     check_internet,
+    clock,
+    exchange_information,
     remember_task_durations,
     simply_format,
+    trace_cycles,
     user_settings,
     value_to,
 )
@@ -54,10 +56,6 @@ class Manager:
             "lock_board": "NEVER",
         }
 
-        time_traveller = time_machine.travel(datetime.now(timezone.utc))
-        time_traveller.start()
-        self.time_traveller = time_traveller
-
         # ■■■■■ repetitive schedules ■■■■■
 
         solie.window.scheduler.add_job(
@@ -144,9 +142,14 @@ class Manager:
                 list_text = "\n".join(texts[:max_tasks_shown]) + "\n..."
             solie.window.label_12.setText(f"{tasks_not_done} total\n\n{list_text}")
 
-            solie.window.label_32.setText(
-                f"Process count: {solie.parallel.process_count}"
-            )
+            text = f"Process count: {solie.parallel.process_count}"
+            if not solie.parallel.is_ready:
+                text += "\nNot warmed up"
+            warm_up_durations = solie.parallel.warm_up_durations
+            if len(warm_up_durations) > 0:
+                data_value = max(warm_up_durations.values())
+                text += f"\nWarm-up {simply_format.fixed_float(data_value,6)}s"
+            solie.window.label_32.setText(text)
 
             texts = []
             texts.append("Limits")
@@ -180,6 +183,14 @@ class Manager:
                     data_value = max(deque_data)
                     text += f"Maximum {simply_format.fixed_float(data_value,6)}s "
                     texts.append(text)
+            for stage, percentiles in trace_cycles.get_percentiles().items():
+                text = f"cycle_{stage}"
+                text += "\n"
+                text += f"P50 {simply_format.fixed_float(percentiles[0],6)}s "
+                text += f"P95 {simply_format.fixed_float(percentiles[1],6)}s "
+                text += "\n"
+                text += f"P99 {simply_format.fixed_float(percentiles[2],6)}s "
+                texts.append(text)
             text = "\n\n".join(texts)
             solie.window.label_33.setText(text)
 
@@ -203,27 +214,26 @@ class Manager:
             return
 
         async def job():
-            request_time = datetime.now(timezone.utc)
+            request_time = clock.now()
             payload = {}
             response = await self.api_requester.binance(
                 http_method="GET",
                 path="/fapi/v1/time",
                 payload=payload,
             )
-            response_time = datetime.now(timezone.utc)
+            response_time = clock.now()
             ping = (response_time - request_time).total_seconds()
             self.online_status["ping"] = ping
 
             server_timestamp = response["serverTime"] / 1000
-            server_time = datetime.fromtimestamp(server_timestamp, tz=timezone.utc)
-            local_time = datetime.now(timezone.utc)
-            time_difference = (server_time - local_time).total_seconds() - ping / 2
+            local_timestamp = clock.local_timestamp()
+            time_difference = server_timestamp - local_timestamp - ping / 2
             self.online_status["server_time_differences"].append(time_difference)
 
         asyncio.create_task(job())
 
     async def display_system_status(self, *args, **kwargs):
-        time = datetime.now(timezone.utc)
+        time = clock.now()
         time_text = time.strftime("%Y-%m-%d %H:%M:%S")
         internet_connected = check_internet.connected()
         ping = self.online_status["ping"]
@@ -234,6 +244,8 @@ class Manager:
             mean_difference = sum(deque_data) / len(deque_data)
         else:
             mean_difference = 0.0
+        # Show what is left to be corrected
+        mean_difference -= clock.get_offset()
 
         text = ""
         text += f"Current time UTC {time_text}"
@@ -255,30 +267,22 @@ class Manager:
         if len(server_time_differences) < 30:
             return
         mean_difference = sum(server_time_differences) / len(server_time_differences)
-        new_time = datetime.now(timezone.utc) + timedelta(seconds=mean_difference)
-
-        self.time_traveller.stop()
-        time_traveller = time_machine.travel(new_time)
-        time_traveller.start()
-        self.time_traveller = time_traveller
+        clock.set_offset(mean_difference)
 
     async def check_binance_limits(self, *args, **kwargs):
         if not check_internet.connected():
             return
 
-        payload = {}
-        response = await self.api_requester.binance(
-            http_method="GET",
-            path="/fapi/v1/exchangeInfo",
-            payload=payload,
-        )
-        for about_rate_limit in response["rateLimits"]:
+        await exchange_information.refresh()
+        rate_limits = exchange_information.get_rate_limits()
+        for about_rate_limit in rate_limits:
             limit_type = about_rate_limit["rateLimitType"]
             limit_value = about_rate_limit["limit"]
             interval_unit = about_rate_limit["interval"]
             interval_value = about_rate_limit["intervalNum"]
             limit_name = f"{limit_type}({interval_value}{interval_unit})"
             self.binance_limits[limit_name] = limit_value
+        self.api_requester.scheduler.update_limits(rate_limits)
 
     async def reset_datapath(self, *args, **kwargs):
         question = [
@@ -317,7 +321,7 @@ class Manager:
             raise ValueError("Invalid duration value for locking the window")
 
         last_interaction_time = solie.window.last_interaction
-        if datetime.now(timezone.utc) < last_interaction_time + wait_time:
+        if clock.now() < last_interaction_time + wait_time:
             return
 
         is_enabled = solie.window.board.isEnabled()
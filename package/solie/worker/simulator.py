@@ -2,7 +2,7 @@ import asyncio
 import math
 import os
 import pickle
-import re
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from typing import List
 
@@ -12,10 +12,16 @@ import pandas as pd
 from scipy.signal import find_peaks
 
 import solie
+from solie.definition.candle_pyramid import CandlePyramid
+from solie.definition.errors import SimulationError
 from solie.definition.rw_lock import RWLock
-from solie.parallel import go
+from solie.definition.simulation_node import SimulationNodeClient, fingerprint
+from solie.definition.structs import BarClosed
+from solie.parallel import go, go_thread
 from solie.utility import (
+    clock,
     make_indicators,
+    prepare_lines,
     simply_format,
     simulate_chunk,
     sort_pandas,
@@ -41,10 +47,15 @@ class Simulator:
         self.viewing_symbol = user_settings.get_data_settings()["target_symbols"][0]
         self.should_draw_all_years = False
 
+        # Candles of the viewing symbol in multiple resolutions,
+        # and the level and the range that are currently drawn
+        self.candle_pyramid: CandlePyramid | None = None
+        self.drawn_candle_range: tuple[int, float, float] | None = None
+
         self.about_viewing = None
 
         self.calculation_settings = {
-            "year": datetime.now(timezone.utc).year,
+            "year": clock.now().year,
             "strategy_index": 0,
         }
         self.presentation_settings = {
@@ -118,6 +129,39 @@ class Simulator:
         self.presentation_settings["maker_fee"] = input_value
         await self.present()
 
+    async def display_candles(self, *args, **kwargs):
+        # Candles are sliced again only when the view goes out of the drawn range
+        # or needs another level of detail
+        candle_pyramid = self.candle_pyramid
+        if candle_pyramid is None:
+            return
+
+        view_box = solie.window.plot_widget_2.plotItem.vb  # type:ignore
+        if view_box.autoRangeEnabled()[0]:
+            view_from, view_until = candle_pyramid.get_range()
+        else:
+            view_from, view_until = view_box.viewRange()[0]
+        view_seconds = max(view_until - view_from, 10.0)
+        pixel_count = max(int(view_box.width()), 1)
+        level_number = candle_pyramid.choose_level(view_seconds, pixel_count)
+
+        if self.drawn_candle_range is not None:
+            drawn_level_number, drawn_from, drawn_until = self.drawn_candle_range
+            if drawn_level_number == level_number:
+                if drawn_from <= view_from and view_until <= drawn_until:
+                    return
+
+        # Margins as wide as the view are included on both sides
+        # so that panning doesn't need slicing every time
+        slice_from = view_from - view_seconds
+        slice_until = view_until + view_seconds
+        lines = candle_pyramid.make_lines(level_number, slice_from, slice_until)
+        for line_name, line_datas in lines.items():
+            widgets = solie.window.simulation_lines[line_name]
+            for widget, (data_x, data_y) in zip(widgets, line_datas):
+                widget.setData(data_x, data_y)
+        self.drawn_candle_range = (level_number, slice_from, slice_until)
+
     async def display_lines(self, *args, **kwargs):
         # ■■■■■ start the task ■■■■■
 
@@ -147,19 +191,21 @@ class Simulator:
 
         # ■■■■■ wait for the latest data to be added ■■■■■
 
-        current_moment = datetime.now(timezone.utc).replace(microsecond=0)
+        current_moment = clock.now().replace(microsecond=0)
         current_moment = current_moment - timedelta(seconds=current_moment.second % 10)
         before_moment = current_moment - timedelta(seconds=10)
 
         if periodic:
-            for _ in range(50):
-                if stop_flag.find(task_name, task_id):
-                    return
-                async with solie.window.collector.candle_data.read_lock as cell:
-                    last_index = cell.data.index[-1]
-                    if last_index == before_moment:
-                        break
-                await asyncio.sleep(0.1)
+            try:
+                await solie.window.event_bus.wait_for(
+                    BarClosed,
+                    lambda event: event.moment >= before_moment,
+                    timeout=5,
+                )
+            except asyncio.TimeoutError:
+                pass
+            if stop_flag.find(task_name, task_id):
+                return
 
         # ■■■■■ get ready for task duration measurement ■■■■■
 
@@ -171,81 +217,17 @@ class Simulator:
         strategy_index = self.calculation_settings["strategy_index"]
         strategy = solie.window.strategist.strategies[strategy_index]
 
-        # ■■■■■ get light data ■■■■■
-
-        async with solie.window.collector.realtime_data_chunks.read_lock as cell:
-            before_chunk = cell.data[-2].copy()
-            current_chunk = cell.data[-1].copy()
-        realtime_data = np.concatenate((before_chunk, current_chunk))
-        async with solie.window.collector.aggregate_trades.read_lock as cell:
-            aggregate_trades = cell.data.copy()
-
         # ■■■■■ draw light lines ■■■■■
 
-        # mark price
-        data_x = realtime_data["index"].astype(np.int64) / 10**9
-        data_y = realtime_data[str((symbol, "Mark Price"))]
-        mask = data_y != 0
-        data_y = data_y[mask]
-        data_x = data_x[mask]
-        widget = solie.window.simulation_lines["mark_price"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # last price
-        data_x = aggregate_trades["index"].astype(np.int64) / 10**9
-        data_y = aggregate_trades[str((symbol, "Price"))]
-        mask = data_y != 0
-        data_y = data_y[mask]
-        data_x = data_x[mask]
-        widget = solie.window.simulation_lines["last_price"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # last trade volume
-        index_ar = aggregate_trades["index"].astype(np.int64) / 10**9
-        value_ar = aggregate_trades[str((symbol, "Volume"))]
-        mask = value_ar != 0
-        index_ar = index_ar[mask]
-        value_ar = value_ar[mask]
-        length = len(index_ar)
-        zero_ar = np.zeros(length)
-        nan_ar = np.empty(length)
-        nan_ar[:] = np.nan
-        data_x = np.repeat(index_ar, 3)
-        data_y = np.stack([nan_ar, zero_ar, value_ar], axis=1).reshape(-1)
-        widget = solie.window.simulation_lines["last_volume"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # book tickers
-        data_x = realtime_data["index"].astype(np.int64) / 10**9
-        data_y = realtime_data[str((symbol, "Best Bid Price"))]
-        mask = data_y != 0
-        data_y = data_y[mask]
-        data_x = data_x[mask]
-        widget = solie.window.simulation_lines["book_tickers"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        data_x = realtime_data["index"].astype(np.int64) / 10**9
-        data_y = realtime_data[str((symbol, "Best Ask Price"))]
-        mask = data_y != 0
-        data_y = data_y[mask]
-        data_x = data_x[mask]
-        widget = solie.window.simulation_lines["book_tickers"][1]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
+        # mark price, last price, last trade volume and book tickers
+        lines = await solie.window.chart_cache.get_light_lines(symbol)
+        for line_name, line_datas in lines.items():
+            widgets = solie.window.simulation_lines[line_name]
+            for widget, (data_x, data_y) in zip(widgets, line_datas):
+                widget.setData(data_x, data_y)
+            if stop_flag.find(task_name, task_id):
+                return
+            await asyncio.sleep(0)
 
         # entry price
         entry_price = self.account_state["positions"][symbol]["entry_price"]
@@ -283,14 +265,14 @@ class Simulator:
                 if filename.startswith("candle_data_") and filename.endswith(".pickle")
             ]
             slice_from = datetime.fromtimestamp(0, tz=timezone.utc)
-            slice_until = datetime.now(timezone.utc)
+            slice_until = clock.now()
             slice_until = slice_until.replace(minute=0, second=0, microsecond=0)
         else:
             year = self.calculation_settings["year"]
             years = [year]
             slice_from = datetime(year, 1, 1, tzinfo=timezone.utc)
-            if year == datetime.now(timezone.utc).year:
-                slice_until = datetime.now(timezone.utc)
+            if year == clock.now().year:
+                slice_until = clock.now()
                 slice_until = slice_until.replace(minute=0, second=0, microsecond=0)
             else:
                 slice_until = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
@@ -320,227 +302,50 @@ class Simulator:
                 before_asset = None
             asset_record = cell.data[slice_from:].copy()
 
-        candle_data = candle_data[slice_from:]
-
         # ■■■■■ maniuplate heavy data ■■■■■
 
-        # add the right end
-
-        if len(candle_data) > 0:
-            last_written_moment = candle_data.index[-1]
-            new_moment = last_written_moment + timedelta(seconds=10)
-            new_index = candle_data.index.union([new_moment])
-            candle_data = candle_data.reindex(new_index)
+        # add the left and right ends
 
-        if last_asset is not None:
-            observed_until = self.account_state["observed_until"]
-            if len(asset_record) == 0 or asset_record.index[-1] < observed_until:
-                if slice_from < observed_until:
-                    asset_record.loc[observed_until, "Cause"] = "other"
-                    asset_record.loc[observed_until, "Result Asset"] = last_asset
-                    if not asset_record.index.is_monotonic_increasing:
-                        asset_record = await go(sort_pandas.data_frame, asset_record)
-
-        # add the left end
-
-        if before_asset is not None:
-            asset_record.loc[slice_from, "Cause"] = "other"
-            asset_record.loc[slice_from, "Result Asset"] = before_asset
-            if not asset_record.index.is_monotonic_increasing:
-                asset_record = await go(sort_pandas.data_frame, asset_record)
+        asset_record = await go_thread(
+            prepare_lines.complete_asset_record,
+            asset_record,
+            slice_from,
+            last_asset,
+            before_asset,
+            self.account_state["observed_until"],
+        )
 
         # ■■■■■ draw heavy lines ■■■■■
 
-        # price movement
-        index_ar = candle_data.index.to_numpy(dtype=np.int64) / 10**9
-        open_ar = candle_data[(symbol, "Open")].to_numpy()
-        close_ar = candle_data[(symbol, "Close")].to_numpy()
-        high_ar = candle_data[(symbol, "High")].to_numpy()
-        low_ar = candle_data[(symbol, "Low")].to_numpy()
-        rise_ar = close_ar > open_ar
-        fall_ar = close_ar < open_ar
-        stay_ar = close_ar == open_ar
-        length = len(index_ar)
-        nan_ar = np.empty(length)
-        nan_ar[:] = np.nan
-
-        data_x = np.stack(
-            [
-                index_ar[rise_ar] + 2,
-                index_ar[rise_ar] + 5,
-                index_ar[rise_ar],
-                index_ar[rise_ar] + 5,
-                index_ar[rise_ar] + 8,
-                index_ar[rise_ar],
-                index_ar[rise_ar] + 5,
-                index_ar[rise_ar] + 5,
-                index_ar[rise_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        data_y = np.stack(
-            [
-                open_ar[rise_ar],
-                open_ar[rise_ar],
-                nan_ar[rise_ar],
-                close_ar[rise_ar],
-                close_ar[rise_ar],
-                nan_ar[rise_ar],
-                high_ar[rise_ar],
-                low_ar[rise_ar],
-                nan_ar[rise_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        widget = solie.window.simulation_lines["price_rise"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        data_x = np.stack(
-            [
-                index_ar[fall_ar] + 2,
-                index_ar[fall_ar] + 5,
-                index_ar[fall_ar],
-                index_ar[fall_ar] + 5,
-                index_ar[fall_ar] + 8,
-                index_ar[fall_ar],
-                index_ar[fall_ar] + 5,
-                index_ar[fall_ar] + 5,
-                index_ar[fall_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        data_y = np.stack(
-            [
-                open_ar[fall_ar],
-                open_ar[fall_ar],
-                nan_ar[fall_ar],
-                close_ar[fall_ar],
-                close_ar[fall_ar],
-                nan_ar[fall_ar],
-                high_ar[fall_ar],
-                low_ar[fall_ar],
-                nan_ar[fall_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        widget = solie.window.simulation_lines["price_fall"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        data_x = np.stack(
-            [
-                index_ar[stay_ar] + 2,
-                index_ar[stay_ar] + 5,
-                index_ar[stay_ar],
-                index_ar[stay_ar] + 5,
-                index_ar[stay_ar] + 8,
-                index_ar[stay_ar],
-                index_ar[stay_ar] + 5,
-                index_ar[stay_ar] + 5,
-                index_ar[stay_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        data_y = np.stack(
-            [
-                open_ar[stay_ar],
-                open_ar[stay_ar],
-                nan_ar[stay_ar],
-                close_ar[stay_ar],
-                close_ar[stay_ar],
-                nan_ar[stay_ar],
-                high_ar[stay_ar],
-                low_ar[stay_ar],
-                nan_ar[stay_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        widget = solie.window.simulation_lines["price_stay"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # wobbles
-        sr = candle_data[(symbol, "High")]
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.simulation_lines["wobbles"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        sr = candle_data[(symbol, "Low")]
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.simulation_lines["wobbles"][1]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # trade volume
-        sr = candle_data[(symbol, "Volume")]
-        sr = sr.fillna(value=0)
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.simulation_lines["volume"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # asset
-        data_x = asset_record["Result Asset"].index.to_numpy(dtype=np.int64) / 10**9
-        data_y = asset_record["Result Asset"].to_numpy(dtype=np.float32)
-        widget = solie.window.simulation_lines["asset"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # asset with unrealized profit
-        sr = asset_record["Result Asset"]
-        if len(sr) >= 2:
-            sr = sr.resample("10S").ffill()
-        unrealized_changes_sr = unrealized_changes.reindex(sr.index)
-        sr = sr * (1 + unrealized_changes_sr)
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9 + 5
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.simulation_lines["asset_with_unrealized_profit"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # buy and sell
-        df = asset_record.loc[asset_record["Symbol"] == symbol]
-        df = df[df["Side"] == "sell"]
-        sr = df["Fill Price"]
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.simulation_lines["sell"][0]
-        widget.setData(data_x, data_y)
+        # price movement, wobbles and trade volume
+        if not should_draw_all_years and years[0] == clock.now().year:
+            # Candles of this year are shared with the transaction chart
+            self.candle_pyramid = await solie.window.chart_cache.get_candle_pyramid(
+                symbol, slice_from, should_rebuild=not periodic
+            )
+            # The loaded year starts at `slice_from`, so indicators can use it as is
+        else:
+            candle_data = await go_thread(
+                prepare_lines.pick_candle_data, candle_data, symbol, slice_from, None
+            )
+            self.candle_pyramid = await go(CandlePyramid, candle_data, symbol)
+        self.drawn_candle_range = None
+        await self.display_candles()
         if stop_flag.find(task_name, task_id):
             return
         await asyncio.sleep(0)
 
-        df = asset_record.loc[asset_record["Symbol"] == symbol]
-        df = df[df["Side"] == "buy"]
-        sr = df["Fill Price"]
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.simulation_lines["buy"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
+        # asset, asset with unrealized profit, buy and sell
+        lines = await go_thread(
+            prepare_lines.asset_lines, asset_record, unrealized_changes, symbol
+        )
+        for line_name, line_datas in lines.items():
+            widgets = solie.window.simulation_lines[line_name]
+            for widget, (data_x, data_y) in zip(widgets, line_datas):
+                widget.setData(data_x, data_y)
+            if stop_flag.find(task_name, task_id):
+                return
+            await asyncio.sleep(0)
 
         # ■■■■■ record task duration ■■■■■
 
@@ -561,80 +366,21 @@ class Simulator:
 
         # ■■■■■ draw strategy lines ■■■■■
 
-        # price indicators
-        df = indicators[symbol]["Price"]
-        data_x = df.index.to_numpy(dtype=np.int64) / 10**9
-        data_x += 5
-        line_list = solie.window.simulation_lines["price_indicators"]
-        for turn, widget in enumerate(line_list):
-            if turn < len(df.columns):
-                column_name = df.columns[turn]
-                sr = df[column_name]
-                data_y = sr.to_numpy(dtype=np.float32)
-                inside_strings = re.findall(r"\(([^)]+)", column_name)
-                if len(inside_strings) == 0:
-                    color = "#AAAAAA"
-                else:
-                    color = inside_strings[0]
-                widget.setPen(color)
-                widget.setData(data_x, data_y)
-                if stop_flag.find(task_name, task_id):
-                    return
-                await asyncio.sleep(0)
-            else:
-                if stop_flag.find(task_name, task_id):
-                    return
-                widget.clear()
-
-        # trade volume indicators
-        df = indicators[symbol]["Volume"]
-        data_x = df.index.to_numpy(dtype=np.int64) / 10**9
-        data_x += 5
-        line_list = solie.window.simulation_lines["volume_indicators"]
-        for turn, widget in enumerate(line_list):
-            if turn < len(df.columns):
-                column_name = df.columns[turn]
-                sr = df[column_name]
-                data_y = sr.to_numpy(dtype=np.float32)
-                inside_strings = re.findall(r"\(([^)]+)", column_name)
-                if len(inside_strings) == 0:
-                    color = "#AAAAAA"
-                else:
-                    color = inside_strings[0]
-                widget.setPen(color)
-                widget.setData(data_x, data_y)
-                if stop_flag.find(task_name, task_id):
-                    return
-                await asyncio.sleep(0)
-            else:
-                if stop_flag.find(task_name, task_id):
-                    return
-                widget.clear()
-
-        # abstract indicators
-        df = indicators[symbol]["Abstract"]
-        data_x = df.index.to_numpy(dtype=np.int64) / 10**9
-        data_x += 5
-        line_list = solie.window.simulation_lines["abstract_indicators"]
-        for turn, widget in enumerate(line_list):
-            if turn < len(df.columns):
-                column_name = df.columns[turn]
-                sr = df[column_name]
-                data_y = sr.to_numpy(dtype=np.float32)
-                inside_strings = re.findall(r"\(([^)]+)", column_name)
-                if len(inside_strings) == 0:
-                    color = "#AAAAAA"
+        lines = await go_thread(prepare_lines.indicator_lines, indicators, symbol)
+        for line_name, line_datas in lines.items():
+            line_list = solie.window.simulation_lines[line_name]
+            for turn, widget in enumerate(line_list):
+                if turn < len(line_datas):
+                    color, data_x, data_y = line_datas[turn]
+                    widget.setPen(color)
+                    widget.setData(data_x, data_y)
+                    if stop_flag.find(task_name, task_id):
+                        return
+                    await asyncio.sleep(0)
                 else:
-                    color = inside_strings[0]
-                widget.setPen(color)
-                widget.setData(data_x, data_y)
-                if stop_flag.find(task_name, task_id):
-                    return
-                await asyncio.sleep(0)
-            else:
-                if stop_flag.find(task_name, task_id):
-                    return
-                widget.clear()
+                    if stop_flag.find(task_name, task_id):
+                        return
+                    widget.clear()
 
         # ■■■■■ set minimum view range ■■■■■
 
@@ -847,8 +593,8 @@ class Simulator:
         # Set ranges
         slice_from = datetime(year, 1, 1, tzinfo=timezone.utc)
 
-        if year == datetime.now(timezone.utc).year:
-            slice_until = datetime.now(timezone.utc)
+        if year == clock.now().year:
+            slice_until = clock.now()
             slice_until = slice_until.replace(minute=0, second=0, microsecond=0)
         else:
             slice_until = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
@@ -1032,9 +778,8 @@ class Simulator:
         calculation_output_data = []
 
         if should_calculate:
-            gathered = asyncio.gather(
-                go(simulate_chunk.do, input_data)
-                for input_data in calculation_input_data
+            gathered = asyncio.ensure_future(
+                self.simulate_chunks(calculation_input_data)
             )
 
             total_seconds = (calculate_until - calculate_from).total_seconds()
@@ -1118,6 +863,88 @@ class Simulator:
                 content = pickle.dumps(virtual_state)
                 await file.write(content)
 
+    async def simulate_chunks(self, calculation_input_data: list[dict]) -> list[dict]:
+        remaining_chunks = deque(enumerate(calculation_input_data))
+        # Chunks that a node failed to calculate aren't given to other nodes
+        local_chunks = deque()
+        calculation_output_data: list[dict] = [{}] * len(calculation_input_data)
+
+        async def consume_locally():
+            while len(local_chunks) > 0 or len(remaining_chunks) > 0:
+                if len(local_chunks) > 0:
+                    turn, input_data = local_chunks.popleft()
+                else:
+                    turn, input_data = remaining_chunks.popleft()
+                output_data = await go(simulate_chunk.do, input_data)
+                calculation_output_data[turn] = output_data
+
+        async def consume_remotely(client: SimulationNodeClient):
+            try:
+                while len(remaining_chunks) > 0:
+                    turn, input_data = remaining_chunks.popleft()
+                    segment_fingerprint = await go_thread(
+                        fingerprint, input_data["chunk_candle_data"]
+                    )
+                    try:
+                        output_data = await client.simulate(
+                            input_data, segment_fingerprint
+                        )
+                    except (OSError, asyncio.IncompleteReadError):
+                        remaining_chunks.appendleft((turn, input_data))
+                        text = f"Lost connection to simulation node {client.address}"
+                        solie.logger.warning(text)
+                        return
+                    except SimulationError as error:
+                        local_chunks.append((turn, input_data))
+                        text = "A chunk will be calculated locally instead"
+                        text += f"\n{error}"
+                        solie.logger.warning(text)
+                        continue
+                    calculation_output_data[turn] = output_data
+                    calculation_index = input_data["calculation_index"]
+                    if len(calculation_index) > 0:
+                        chunk_duration = calculation_index[-1] - calculation_index[0]
+                        progress_list = input_data["progress_list"]
+                        progress_list[turn] = chunk_duration.total_seconds()
+            finally:
+                await client.close()
+
+        app_settings = user_settings.get_app_settings()
+        simulation_nodes = app_settings.get("simulation_nodes", [])
+        node_secret = app_settings.get("simulation_node_secret", "").encode()
+        if len(simulation_nodes) > 0 and len(node_secret) == 0:
+            text = "Simulation nodes are not used without a shared secret"
+            solie.logger.warning(text)
+            simulation_nodes = []
+
+        async def use_node(address: str):
+            client = SimulationNodeClient(address, node_secret)
+            try:
+                description = await client.describe()
+            except (OSError, asyncio.IncompleteReadError):
+                solie.logger.warning(f"Cannot reach simulation node {address}")
+                return
+            finally:
+                await client.close()
+            await asyncio.gather(
+                *(
+                    consume_remotely(SimulationNodeClient(address, node_secret))
+                    for _ in range(description["process_count"])
+                )
+            )
+
+        await asyncio.gather(
+            *(consume_locally() for _ in range(solie.parallel.process_count)),
+            *(use_node(address) for address in simulation_nodes),
+        )
+
+        # Chunks given back by disconnected nodes are calculated here.
+        await asyncio.gather(
+            *(consume_locally() for _ in range(solie.parallel.process_count)),
+        )
+
+        return calculation_output_data
+
     async def present(self, *args, **kwargs):
         maker_fee = self.presentation_settings["maker_fee"]
         taker_fee = self.presentation_settings["taker_fee"]
@@ -4,7 +4,6 @@ import json
 import math
 import os
 import pickle
-import re
 import webbrowser
 from datetime import datetime, timedelta, timezone
 
@@ -13,21 +12,32 @@ import numpy as np
 import pandas as pd
 
 import solie
+from solie.definition.account_ledger import AccountLedger
 from solie.definition.api_requester import ApiRequester
 from solie.definition.api_streamer import ApiStreamer
+from solie.definition.api_trader import ApiTrader
+from solie.definition.candle_pyramid import CandlePyramid
 from solie.definition.errors import ApiRequestError
+from solie.definition.line_buffer import LineBuffer
+from solie.definition.record_journal import RecordJournal
 from solie.definition.rw_lock import RWLock
+from solie.definition.structs import BarClosed
 from solie.overlay.long_text_view import LongTextView
-from solie.parallel import go
+from solie.parallel import go, go_thread
 from solie.utility import (
     ball,
     check_internet,
+    clock,
     decide,
+    exchange_information,
+    fold_journal,
     make_indicators,
+    prepare_lines,
     remember_task_durations,
     sort_pandas,
     standardize,
     stop_flag,
+    trace_cycles,
     user_settings,
 )
 
@@ -38,14 +48,11 @@ class Transactor:
 
         self.workerpath = user_settings.get_app_settings()["datapath"] + "/transactor"
         os.makedirs(self.workerpath, exist_ok=True)
+        self.record_journal = RecordJournal(self.workerpath + "/journal.pickle")
 
         # ■■■■■ worker secret memory ■■■■■
 
         self.secret_memory = {
-            "maximum_quantities": {},
-            "minimum_notionals": {},
-            "price_precisions": {},
-            "quantity_precisions": {},
             "maximum_leverages": {},
             "leverages": {},
             "is_key_restrictions_satisfied": True,
@@ -54,13 +61,35 @@ class Transactor:
         # ■■■■■ remember and display ■■■■■
 
         self.api_requester = ApiRequester()
+        self.api_trader = ApiTrader()
 
         self.viewing_symbol = user_settings.get_data_settings()["target_symbols"][0]
         self.should_draw_frequently = True
 
+        # Candles of the viewing symbol in multiple resolutions,
+        # and the level and the range that are currently drawn
+        self.candle_pyramid: CandlePyramid | None = None
+        self.drawn_candle_range: tuple[int, float, float] | None = None
+
+        # Chart lines are kept with spare capacity to add new points in place.
+        # The key tells which symbol, strategy and range they were drawn with.
+        self.line_buffers = {
+            line_name: [LineBuffer() for _ in solie.window.transaction_lines[line_name]]
+            for line_name in (
+                "asset_with_unrealized_profit",
+                "price_indicators",
+                "volume_indicators",
+                "abstract_indicators",
+            )
+        }
+        self.chart_key: tuple | None = None
+        self.chart_updated_until: datetime | None = None
+        self.chart_asset_until: datetime | None = None
+
         self.account_state = standardize.account_state()
 
         self.scribbles = {}
+        self.journaled_scribbles = pickle.dumps(self.scribbles)
         self.automation_settings = {
             "strategy_index": 0,
             "should_transact": False,
@@ -83,6 +112,7 @@ class Transactor:
                 index=pd.DatetimeIndex([], tz="UTC"),
             )
         )
+        self.account_ledger = AccountLedger()
 
         # ■■■■■ repetitive schedules ■■■■■
 
@@ -123,11 +153,6 @@ class Transactor:
             trigger="cron",
             second="*/10",
         )
-        solie.window.scheduler.add_job(
-            self.save_scribbles,
-            trigger="cron",
-            second="*/10",
-        )
         solie.window.scheduler.add_job(
             self.watch_binance,
             trigger="cron",
@@ -208,6 +233,7 @@ class Transactor:
             solie.window.lineEdit_6.setText(text)
             self.keys = keys
             self.api_requester.update_keys(keys)
+            self.api_trader.update_keys(keys)
         except FileNotFoundError:
             pass
         await asyncio.sleep(0)
@@ -236,7 +262,80 @@ class Transactor:
             pass
         await asyncio.sleep(0)
 
+        # journal written after the snapshots
+        records = await self.record_journal.replay()
+        folded = fold_journal.do(records)
+        unrealized_changes = folded["unrealized_changes"]
+        asset_rows = folded["asset_rows"]
+        auto_order_rows = folded["auto_order_rows"]
+        if folded["scribbles"] is not None:
+            self.scribbles = folded["scribbles"]
+        # Fills that weren't written into the asset record before the journal ended
+        unflushed_fills = folded["unflushed_fills"]
+        self.journaled_scribbles = pickle.dumps(self.scribbles)
+        if len(unrealized_changes) > 0:
+            async with self.unrealized_changes.write_lock as cell:
+                new_sr = pd.Series(unrealized_changes, dtype=np.float32)
+                kept_data = cell.data.drop(new_sr.index, errors="ignore")
+                cell.data = pd.concat([kept_data, new_sr])
+                cell.data = await go(sort_pandas.series, cell.data)
+        if len(asset_rows) > 0:
+            async with self.asset_record.write_lock as cell:
+                new_df = pd.DataFrame.from_dict(asset_rows, orient="index")
+                new_df = new_df.reindex(columns=cell.data.columns)
+                new_df.index = pd.DatetimeIndex(new_df.index)
+                kept_data = cell.data.drop(new_df.index, errors="ignore")
+                cell.data = pd.concat([kept_data, new_df])
+                cell.data = await go(sort_pandas.data_frame, cell.data)
+        if len(auto_order_rows) > 0:
+            async with self.auto_order_record.write_lock as cell:
+                recorded_keys = set(zip(cell.data["Symbol"], cell.data["Order ID"]))
+                for (order_symbol, order_id), update_time in auto_order_rows.items():
+                    if (order_symbol, order_id) in recorded_keys:
+                        continue
+                    while update_time in cell.data.index:
+                        update_time += timedelta(milliseconds=1)
+                    cell.data.loc[update_time, "Symbol"] = order_symbol
+                    cell.data.loc[update_time, "Order ID"] = order_id
+                if not cell.data.index.is_monotonic_increasing:
+                    cell.data = await go(sort_pandas.data_frame, cell.data)
+        await asyncio.sleep(0)
+
+        # account ledger
+        async with self.auto_order_record.read_lock as cell:
+            auto_order_record = cell.data
+        async with self.asset_record.read_lock as cell:
+            asset_record = cell.data
+        self.account_ledger.rebuild(auto_order_record, asset_record)
+        for unflushed_fill in unflushed_fills:
+            self.account_ledger.add_fill(*unflushed_fill)
+        await self.flush_account_ledger()
+
+    async def flush_account_ledger(self, *args, **kwargs):
+        if not self.account_ledger.has_pending():
+            return
+
+        async with self.auto_order_record.write_lock as cell:
+            cell.data = self.account_ledger.flush_auto_orders(cell.data)
+            if not cell.data.index.is_monotonic_increasing:
+                cell.data = await go(sort_pandas.data_frame, cell.data)
+
+        async with self.asset_record.write_lock as cell:
+            cell.data, changed_times = self.account_ledger.flush_fills(cell.data)
+            # Changed rows are journaled in the same record
+            # that marks the fills before it as written into the asset record,
+            # so that a crash can't keep the rows without the mark
+            asset_rows = []
+            for changed_time in changed_times:
+                asset_row = cell.data.loc[changed_time].to_dict()
+                asset_rows.append((changed_time, asset_row))
+            self.record_journal.append(("fills_flushed", asset_rows))
+            if not cell.data.index.is_monotonic_increasing:
+                cell.data = await go(sort_pandas.data_frame, cell.data)
+
     async def organize_data(self, *args, **kwargs):
+        await self.flush_account_ledger()
+
         async with self.unrealized_changes.write_lock as cell:
             if not cell.data.index.is_unique:
                 unique_index = cell.data.index.drop_duplicates()
@@ -262,32 +361,42 @@ class Transactor:
                 cell.data = await go(sort_pandas.data_frame, cell.data)
 
     async def save_large_data(self, *args, **kwargs):
+        # Records from now on are kept in the journal
+        # until they are included in the next snapshots
+        await self.record_journal.flush()
+        await self.record_journal.rotate()
+
+        # Fills in the rotated journal are included in the snapshots
+        await self.flush_account_ledger()
+
         async with self.unrealized_changes.read_lock as cell:
             unrealized_changes = cell.data.copy()
-        await go(
-            unrealized_changes.to_pickle,
-            self.workerpath + "/unrealized_changes.pickle",
-        )
+        filepath = self.workerpath + "/unrealized_changes.pickle"
+        await go(unrealized_changes.to_pickle, filepath + ".new")
+        os.replace(filepath + ".new", filepath)
 
         async with self.auto_order_record.read_lock as cell:
             auto_order_record = cell.data.copy()
-        await go(
-            auto_order_record.to_pickle,
-            self.workerpath + "/auto_order_record.pickle",
-        )
+        filepath = self.workerpath + "/auto_order_record.pickle"
+        await go(auto_order_record.to_pickle, filepath + ".new")
+        os.replace(filepath + ".new", filepath)
 
         async with self.asset_record.read_lock as cell:
             asset_record = cell.data.copy()
-        await go(
-            asset_record.to_pickle,
-            self.workerpath + "/asset_record.pickle",
-        )
+        filepath = self.workerpath + "/asset_record.pickle"
+        await go(asset_record.to_pickle, filepath + ".new")
+        os.replace(filepath + ".new", filepath)
+
+        await self.save_scribbles()
+
+        self.record_journal.remove_rotated()
 
     async def save_scribbles(self, *args, **kwargs):
         filepath = self.workerpath + "/scribbles.pickle"
-        async with aiofiles.open(filepath, "wb") as file:
+        async with aiofiles.open(filepath + ".new", "wb") as file:
             content = pickle.dumps(self.scribbles)
             await file.write(content)
+        os.replace(filepath + ".new", filepath)
 
     async def update_user_data_stream(self, *args, **kwargs):
         if not check_internet.connected():
@@ -491,52 +600,30 @@ class Transactor:
                 added_notional = last_filled_price * last_filled_quantity
                 added_margin = added_notional / leverage
                 added_margin_ratio = added_margin / wallet_balance
-
-                async with self.auto_order_record.read_lock as cell:
-                    symbol_df = cell.data[cell.data["Symbol"] == symbol]
-                    unique_order_ids = symbol_df["Order ID"].unique()
-                    if order_id in unique_order_ids:
-                        mask_sr = symbol_df["Order ID"] == order_id
-
-                async with self.asset_record.write_lock as cell:
-                    symbol_df = cell.data[cell.data["Symbol"] == symbol]
-                    recorded_id_list = symbol_df["Order ID"].tolist()
-                    does_record_exist = order_id in recorded_id_list
-                    last_index = cell.data.index[-1]
-                    if does_record_exist:
-                        mask_sr = symbol_df["Order ID"] == order_id
-                        recorded_time = symbol_df.index[mask_sr][0]
-                        recorded_value = symbol_df.loc[recorded_time, "Margin Ratio"]
-                        new_value = recorded_value + added_margin_ratio
-                        cell.data.loc[recorded_time, "Margin Ratio"] = new_value
-                        last_asset: float = cell.data.loc[last_index, "Result Asset"]  # type:ignore
-                        new_value = last_asset + added_revenue
-                        cell.data.loc[last_index, "Result Asset"] = new_value
-                    else:
-                        record_time = event_time
-                        while record_time in cell.data.index:
-                            record_time += timedelta(milliseconds=1)
-                        new_value = symbol
-                        cell.data.loc[record_time, "Symbol"] = new_value
-                        new_value = "sell" if side == "SELL" else "buy"
-                        cell.data.loc[record_time, "Side"] = new_value
-                        new_value = last_filled_price
-                        cell.data.loc[record_time, "Fill Price"] = new_value
-                        new_value = "maker" if is_maker else "taker"
-                        cell.data.loc[record_time, "Role"] = new_value
-                        new_value = added_margin_ratio
-                        cell.data.loc[record_time, "Margin Ratio"] = new_value
-                        new_value = order_id
-                        cell.data.loc[record_time, "Order ID"] = new_value
-                        last_asset: float = cell.data.loc[last_index, "Result Asset"]  # type:ignore
-                        new_value = last_asset + added_revenue
-                        cell.data.loc[record_time, "Result Asset"] = new_value
-                        if order_id in unique_order_ids:
-                            cell.data.loc[record_time, "Cause"] = "auto_trade"
-                        else:
-                            cell.data.loc[record_time, "Cause"] = "manual_trade"
-                    if not cell.data.index.is_monotonic_increasing:
-                        cell.data = await go(sort_pandas.data_frame, cell.data)
+                self.account_ledger.add_fill(
+                    event_time=event_time,
+                    symbol=symbol,
+                    order_id=order_id,
+                    side=side,
+                    fill_price=last_filled_price,
+                    is_maker=is_maker,
+                    margin_ratio=added_margin_ratio,
+                    revenue=added_revenue,
+                )
+                # The asset record gets the fill only when the ledger is flushed,
+                # so the fill itself is journaled right away
+                record = (
+                    "fill",
+                    event_time,
+                    symbol,
+                    order_id,
+                    side,
+                    last_filled_price,
+                    is_maker,
+                    added_margin_ratio,
+                    added_revenue,
+                )
+                self.record_journal.append(record)
 
         # ■■■■■ cancel conflicting orders ■■■■■
 
@@ -584,6 +671,7 @@ class Transactor:
         new_keys["binance_secret"] = binance_secret
 
         self.api_requester.update_keys(new_keys)
+        self.api_trader.update_keys(new_keys)
         await self.update_user_data_stream()
 
     async def update_automation_settings(self, *args, **kwargs):
@@ -642,6 +730,7 @@ class Transactor:
         if stop_flag.find("display_transaction_range_information", task_id):
             return
 
+        await self.flush_account_ledger()
         async with self.unrealized_changes.read_lock as cell:
             unrealized_changes = cell.data[range_start:range_end].copy()
         async with self.asset_record.read_lock as cell:
@@ -719,6 +808,39 @@ class Transactor:
         strategy_index = self.automation_settings["strategy_index"]
         solie.window.comboBox_2.setCurrentIndex(strategy_index)
 
+    async def display_candles(self, *args, **kwargs):
+        # Candles are sliced again only when the view goes out of the drawn range
+        # or needs another level of detail
+        candle_pyramid = self.candle_pyramid
+        if candle_pyramid is None:
+            return
+
+        view_box = solie.window.plot_widget.plotItem.vb  # type:ignore
+        if view_box.autoRangeEnabled()[0]:
+            view_from, view_until = candle_pyramid.get_range()
+        else:
+            view_from, view_until = view_box.viewRange()[0]
+        view_seconds = max(view_until - view_from, 10.0)
+        pixel_count = max(int(view_box.width()), 1)
+        level_number = candle_pyramid.choose_level(view_seconds, pixel_count)
+
+        if self.drawn_candle_range is not None:
+            drawn_level_number, drawn_from, drawn_until = self.drawn_candle_range
+            if drawn_level_number == level_number:
+                if drawn_from <= view_from and view_until <= drawn_until:
+                    return
+
+        # Margins as wide as the view are included on both sides
+        # so that panning doesn't need slicing every time
+        slice_from = view_from - view_seconds
+        slice_until = view_until + view_seconds
+        lines = candle_pyramid.make_lines(level_number, slice_from, slice_until)
+        for line_name, line_datas in lines.items():
+            widgets = solie.window.transaction_lines[line_name]
+            for widget, (data_x, data_y) in zip(widgets, line_datas):
+                widget.setData(data_x, data_y)
+        self.drawn_candle_range = (level_number, slice_from, slice_until)
+
     async def display_lines(self, *args, **kwargs):
         # ■■■■■ start the task ■■■■■
 
@@ -749,23 +871,25 @@ class Transactor:
 
         # ■■■■■ wait for the latest data to be added ■■■■■
 
-        current_moment = datetime.now(timezone.utc).replace(microsecond=0)
+        current_moment = clock.now().replace(microsecond=0)
         current_moment = current_moment - timedelta(seconds=current_moment.second % 10)
         before_moment = current_moment - timedelta(seconds=10)
 
         if periodic:
-            for _ in range(50):
-                if stop_flag.find(task_name, task_id):
-                    return
-                async with solie.window.collector.candle_data.read_lock as cell:
-                    last_index = cell.data.index[-1]
-                    if last_index == before_moment:
-                        break
-                await asyncio.sleep(0.1)
+            try:
+                await solie.window.event_bus.wait_for(
+                    BarClosed,
+                    lambda event: event.moment >= before_moment,
+                    timeout=5,
+                )
+            except asyncio.TimeoutError:
+                pass
+            if stop_flag.find(task_name, task_id):
+                return
 
         # ■■■■■ get ready for task duration measurement ■■■■■
 
-        task_start_time = datetime.now(timezone.utc)
+        task_start_time = clock.now()
 
         # ■■■■■ check things ■■■■■
 
@@ -773,81 +897,17 @@ class Transactor:
         strategy_index = self.automation_settings["strategy_index"]
         strategy = solie.window.strategist.strategies[strategy_index]
 
-        # ■■■■■ get light data ■■■■■
-
-        async with solie.window.collector.realtime_data_chunks.read_lock as cell:
-            before_chunk = cell.data[-2].copy()
-            current_chunk = cell.data[-1].copy()
-        realtime_data = np.concatenate((before_chunk, current_chunk))
-        async with solie.window.collector.aggregate_trades.read_lock as cell:
-            aggregate_trades = cell.data.copy()
-
         # ■■■■■ draw light lines ■■■■■
 
-        # mark price
-        data_x = realtime_data["index"].astype(np.int64) / 10**9
-        data_y = realtime_data[str((symbol, "Mark Price"))]
-        mask = data_y != 0
-        data_y = data_y[mask]
-        data_x = data_x[mask]
-        widget = solie.window.transaction_lines["mark_price"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # last price
-        data_x = aggregate_trades["index"].astype(np.int64) / 10**9
-        data_y = aggregate_trades[str((symbol, "Price"))]
-        mask = data_y != 0
-        data_y = data_y[mask]
-        data_x = data_x[mask]
-        widget = solie.window.transaction_lines["last_price"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # last trade volume
-        index_ar = aggregate_trades["index"].astype(np.int64) / 10**9
-        value_ar = aggregate_trades[str((symbol, "Volume"))]
-        mask = value_ar != 0
-        index_ar = index_ar[mask]
-        value_ar = value_ar[mask]
-        length = len(index_ar)
-        zero_ar = np.zeros(length)
-        nan_ar = np.empty(length)
-        nan_ar[:] = np.nan
-        data_x = np.repeat(index_ar, 3)
-        data_y = np.stack([nan_ar, zero_ar, value_ar], axis=1).reshape(-1)
-        widget = solie.window.transaction_lines["last_volume"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # book tickers
-        data_x = realtime_data["index"].astype(np.int64) / 10**9
-        data_y = realtime_data[str((symbol, "Best Bid Price"))]
-        mask = data_y != 0
-        data_y = data_y[mask]
-        data_x = data_x[mask]
-        widget = solie.window.transaction_lines["book_tickers"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        data_x = realtime_data["index"].astype(np.int64) / 10**9
-        data_y = realtime_data[str((symbol, "Best Ask Price"))]
-        mask = data_y != 0
-        data_y = data_y[mask]
-        data_x = data_x[mask]
-        widget = solie.window.transaction_lines["book_tickers"][1]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
+        # mark price, last price, last trade volume and book tickers
+        lines = await solie.window.chart_cache.get_light_lines(symbol)
+        for line_name, line_datas in lines.items():
+            widgets = solie.window.transaction_lines[line_name]
+            for widget, (data_x, data_y) in zip(widgets, line_datas):
+                widget.setData(data_x, data_y)
+            if stop_flag.find(task_name, task_id):
+                return
+            await asyncio.sleep(0)
 
         # entry price
         entry_price = self.account_state["positions"][symbol]["entry_price"]
@@ -870,7 +930,7 @@ class Transactor:
         # ■■■■■ record task duration ■■■■■
 
         if only_light_lines:
-            duration = (datetime.now(timezone.utc) - task_start_time).total_seconds()
+            duration = (clock.now() - task_start_time).total_seconds()
             remember_task_durations.add(task_name, duration)
 
         # ■■■■■ stop if the target is only light lines ■■■■■
@@ -881,19 +941,46 @@ class Transactor:
         # ■■■■■ set range of heavy data ■■■■■
 
         if should_draw_frequently:
-            slice_from = datetime.now(timezone.utc) - timedelta(hours=24)
-            slice_until = datetime.now(timezone.utc)
+            # Starts at an hour so that the same candles are reused for a while
+            slice_from = clock.now() - timedelta(hours=24)
+            slice_from = slice_from.replace(minute=0, second=0, microsecond=0)
+            slice_until = clock.now()
         else:
-            current_year = datetime.now(timezone.utc).year
+            current_year = clock.now().year
             slice_from = datetime(current_year, 1, 1, tzinfo=timezone.utc)
-            slice_until = datetime.now(timezone.utc)
+            slice_until = clock.now()
         slice_until -= timedelta(seconds=1)
-        get_from = slice_from - timedelta(days=7)
+
+        # ■■■■■ check if only the newest part should be drawn ■■■■■
+
+        # Lines are updated only at their ends when nothing but time has passed,
+        # while other changes make them drawn from scratch.
+        chart_key = (symbol, strategy_index, should_draw_frequently, slice_from)
+        is_incremental = (
+            periodic
+            and self.chart_key == chart_key
+            and self.chart_updated_until is not None
+        )
+        self.chart_key = None
+        if is_incremental:
+            update_from = self.chart_updated_until
+            # Indicators are calculated with 7 days of data before the new part
+            get_from = update_from - timedelta(days=7)
+        else:
+            update_from = slice_from
+            get_from = slice_from
 
         # ■■■■■ get heavy data ■■■■■
 
+        await self.flush_account_ledger()
         async with solie.window.collector.candle_data.read_lock as cell:
-            candle_data = cell.data[get_from:slice_until][[symbol]].copy()
+            candle_data = await go_thread(
+                prepare_lines.pick_candle_data,
+                cell.data,
+                symbol,
+                get_from,
+                slice_until,
+            )
         async with self.unrealized_changes.read_lock as cell:
             unrealized_changes = cell.data.copy()
         async with self.asset_record.read_lock as cell:
@@ -908,235 +995,77 @@ class Transactor:
                 before_asset = None
             asset_record = cell.data[slice_from:].copy()
 
-        candle_data = candle_data[slice_from:]
-
         # ■■■■■ maniuplate heavy data ■■■■■
 
-        # add the right end
-
+        # The right end of candle data is an empty row
         if len(candle_data) > 0:
-            last_written_moment = candle_data.index[-1]
-            new_moment = last_written_moment + timedelta(seconds=10)
-            new_index = candle_data.index.union([new_moment])
-            candle_data = candle_data.reindex(new_index)
-
-        if last_asset is not None:
-            observed_until = self.account_state["observed_until"]
-            if len(asset_record) == 0 or asset_record.index[-1] < observed_until:
-                if slice_from < observed_until:
-                    asset_record.loc[observed_until, "Cause"] = "other"
-                    asset_record.loc[observed_until, "Result Asset"] = last_asset
-                    if not asset_record.index.is_monotonic_increasing:
-                        asset_record = await go(sort_pandas.data_frame, asset_record)
-
-        # add the left end
-
-        if before_asset is not None:
-            asset_record.loc[slice_from, "Cause"] = "other"
-            asset_record.loc[slice_from, "Result Asset"] = before_asset
-            if not asset_record.index.is_monotonic_increasing:
-                asset_record = await go(sort_pandas.data_frame, asset_record)
+            last_written_moment = candle_data.index[-1] - timedelta(seconds=10)
+        else:
+            last_written_moment = None
+
+        asset_record = await go_thread(
+            prepare_lines.complete_asset_record,
+            asset_record,
+            slice_from,
+            last_asset,
+            before_asset,
+            self.account_state["observed_until"],
+        )
 
         # ■■■■■ draw heavy lines ■■■■■
 
-        # price movement
-        index_ar = candle_data.index.to_numpy(dtype=np.int64) / 10**9
-        open_ar = candle_data[(symbol, "Open")].to_numpy()
-        close_ar = candle_data[(symbol, "Close")].to_numpy()
-        high_ar = candle_data[(symbol, "High")].to_numpy()
-        low_ar = candle_data[(symbol, "Low")].to_numpy()
-        rise_ar = close_ar > open_ar
-        fall_ar = close_ar < open_ar
-        stay_ar = close_ar == open_ar
-        length = len(index_ar)
-        nan_ar = np.empty(length)
-        nan_ar[:] = np.nan
-
-        data_x = np.stack(
-            [
-                index_ar[rise_ar] + 2,
-                index_ar[rise_ar] + 5,
-                index_ar[rise_ar],
-                index_ar[rise_ar] + 5,
-                index_ar[rise_ar] + 8,
-                index_ar[rise_ar],
-                index_ar[rise_ar] + 5,
-                index_ar[rise_ar] + 5,
-                index_ar[rise_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        data_y = np.stack(
-            [
-                open_ar[rise_ar],
-                open_ar[rise_ar],
-                nan_ar[rise_ar],
-                close_ar[rise_ar],
-                close_ar[rise_ar],
-                nan_ar[rise_ar],
-                high_ar[rise_ar],
-                low_ar[rise_ar],
-                nan_ar[rise_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        widget = solie.window.transaction_lines["price_rise"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        data_x = np.stack(
-            [
-                index_ar[fall_ar] + 2,
-                index_ar[fall_ar] + 5,
-                index_ar[fall_ar],
-                index_ar[fall_ar] + 5,
-                index_ar[fall_ar] + 8,
-                index_ar[fall_ar],
-                index_ar[fall_ar] + 5,
-                index_ar[fall_ar] + 5,
-                index_ar[fall_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        data_y = np.stack(
-            [
-                open_ar[fall_ar],
-                open_ar[fall_ar],
-                nan_ar[fall_ar],
-                close_ar[fall_ar],
-                close_ar[fall_ar],
-                nan_ar[fall_ar],
-                high_ar[fall_ar],
-                low_ar[fall_ar],
-                nan_ar[fall_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        widget = solie.window.transaction_lines["price_fall"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        data_x = np.stack(
-            [
-                index_ar[stay_ar] + 2,
-                index_ar[stay_ar] + 5,
-                index_ar[stay_ar],
-                index_ar[stay_ar] + 5,
-                index_ar[stay_ar] + 8,
-                index_ar[stay_ar],
-                index_ar[stay_ar] + 5,
-                index_ar[stay_ar] + 5,
-                index_ar[stay_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        data_y = np.stack(
-            [
-                open_ar[stay_ar],
-                open_ar[stay_ar],
-                nan_ar[stay_ar],
-                close_ar[stay_ar],
-                close_ar[stay_ar],
-                nan_ar[stay_ar],
-                high_ar[stay_ar],
-                low_ar[stay_ar],
-                nan_ar[stay_ar],
-            ],
-            axis=1,
-        ).reshape(-1)
-        widget = solie.window.transaction_lines["price_stay"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # wobbles
-        sr = candle_data[(symbol, "High")]
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.transaction_lines["wobbles"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        sr = candle_data[(symbol, "Low")]
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.transaction_lines["wobbles"][1]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # trade volume
-        sr = candle_data[(symbol, "Volume")]
-        sr = sr.fillna(value=0)
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.transaction_lines["volume"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # asset
-        data_x = asset_record["Result Asset"].index.to_numpy(dtype=np.int64) / 10**9
-        data_y = asset_record["Result Asset"].to_numpy(dtype=np.float32)
-        widget = solie.window.transaction_lines["asset"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # asset with unrealized profit
-        sr = asset_record["Result Asset"]
-        if len(sr) >= 2:
-            sr = sr.resample("10S").ffill()
-        unrealized_changes_sr = unrealized_changes.reindex(sr.index)
-        sr = sr * (1 + unrealized_changes_sr)
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9 + 5
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.transaction_lines["asset_with_unrealized_profit"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
-
-        # buy and sell
-        df = asset_record.loc[asset_record["Symbol"] == symbol]
-        df = df[df["Side"] == "sell"]
-        sr = df["Fill Price"]
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.transaction_lines["sell"][0]
-        widget.setData(data_x, data_y)
+        # price movement, wobbles and trade volume
+        self.candle_pyramid = await solie.window.chart_cache.get_candle_pyramid(
+            symbol, slice_from, should_rebuild=not periodic
+        )
+        self.drawn_candle_range = None
+        await self.display_candles()
         if stop_flag.find(task_name, task_id):
             return
         await asyncio.sleep(0)
 
-        df = asset_record.loc[asset_record["Symbol"] == symbol]
-        df = df[df["Side"] == "buy"]
-        sr = df["Fill Price"]
-        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
-        data_y = sr.to_numpy(dtype=np.float32)
-        widget = solie.window.transaction_lines["buy"][0]
-        widget.setData(data_x, data_y)
-        if stop_flag.find(task_name, task_id):
-            return
-        await asyncio.sleep(0)
+        # asset, asset with unrealized profit, buy and sell
+        if (
+            is_incremental
+            and self.chart_asset_until is not None
+            and len(asset_record) >= 2
+        ):
+            # Records before the last one drawn don't change
+            redraw_from = min(update_from, self.chart_asset_until).floor("10S")
+        else:
+            redraw_from = None
+        lines = await go_thread(
+            prepare_lines.asset_lines,
+            asset_record,
+            unrealized_changes,
+            symbol,
+            redraw_from,
+        )
+        for line_name, line_datas in lines.items():
+            widgets = solie.window.transaction_lines[line_name]
+            for widget, (data_x, data_y) in zip(widgets, line_datas):
+                if line_name == "asset_with_unrealized_profit":
+                    line_buffer = self.line_buffers[line_name][0]
+                    if redraw_from is None:
+                        line_buffer.set(data_x, data_y)
+                    else:
+                        line_buffer.truncate_from(redraw_from.timestamp() + 5)
+                        line_buffer.append(data_x, data_y)
+                    data_x, data_y = line_buffer.get_data()
+                widget.setData(data_x, data_y)
+            if stop_flag.find(task_name, task_id):
+                return
+            await asyncio.sleep(0)
 
         # ■■■■■ record task duration ■■■■■
 
-        duration = (datetime.now(timezone.utc) - task_start_time).total_seconds()
+        duration = (clock.now() - task_start_time).total_seconds()
         remember_task_durations.add(task_name, duration)
 
         # ■■■■■ make indicators ■■■■■
 
+        # When drawing incrementally,
+        # indicators are calculated with 7 days of data before the new part.
         indicators_script = strategy["indicators_script"]
 
         indicators = await go(
@@ -1146,84 +1075,42 @@ class Transactor:
             indicators_script=indicators_script,
         )
 
-        indicators = indicators[slice_from:]
+        indicators = indicators[update_from:]
 
         # ■■■■■ draw strategy lines ■■■■■
 
-        # price indicators
-        df = indicators[symbol]["Price"]
-        data_x = df.index.to_numpy(dtype=np.int64) / 10**9
-        data_x += 5
-        line_list = solie.window.transaction_lines["price_indicators"]
-        for turn, widget in enumerate(line_list):
-            if turn < len(df.columns):
-                column_name = df.columns[turn]
-                sr = df[column_name]
-                data_y = sr.to_numpy(dtype=np.float32)
-                inside_strings = re.findall(r"\(([^)]+)", column_name)
-                if len(inside_strings) == 0:
-                    color = "#AAAAAA"
-                else:
-                    color = inside_strings[0]
-                widget.setPen(color)
-                widget.setData(data_x, data_y)
-                if stop_flag.find(task_name, task_id):
-                    return
-                await asyncio.sleep(0)
-            else:
-                if stop_flag.find(task_name, task_id):
-                    return
-                widget.clear()
-
-        # trade volume indicators
-        df = indicators[symbol]["Volume"]
-        data_x = df.index.to_numpy(dtype=np.int64) / 10**9
-        data_x += 5
-        line_list = solie.window.transaction_lines["volume_indicators"]
-        for turn, widget in enumerate(line_list):
-            if turn < len(df.columns):
-                column_name = df.columns[turn]
-                sr = df[column_name]
-                data_y = sr.to_numpy(dtype=np.float32)
-                inside_strings = re.findall(r"\(([^)]+)", column_name)
-                if len(inside_strings) == 0:
-                    color = "#AAAAAA"
-                else:
-                    color = inside_strings[0]
-                widget.setPen(color)
-                widget.setData(data_x, data_y)
-                if stop_flag.find(task_name, task_id):
-                    return
-                await asyncio.sleep(0)
-            else:
-                if stop_flag.find(task_name, task_id):
-                    return
-                widget.clear()
-
-        # abstract indicators
-        df = indicators[symbol]["Abstract"]
-        data_x = df.index.to_numpy(dtype=np.int64) / 10**9
-        data_x += 5
-        line_list = solie.window.transaction_lines["abstract_indicators"]
-        for turn, widget in enumerate(line_list):
-            if turn < len(df.columns):
-                column_name = df.columns[turn]
-                sr = df[column_name]
-                data_y = sr.to_numpy(dtype=np.float32)
-                inside_strings = re.findall(r"\(([^)]+)", column_name)
-                if len(inside_strings) == 0:
-                    color = "#AAAAAA"
+        # price indicators, trade volume indicators and abstract indicators
+        lines = await go_thread(prepare_lines.indicator_lines, indicators, symbol)
+        for line_name, line_datas in lines.items():
+            line_list = solie.window.transaction_lines[line_name]
+            line_buffers = self.line_buffers[line_name]
+            for turn, widget in enumerate(line_list):
+                if turn < len(line_datas):
+                    color, data_x, data_y = line_datas[turn]
+                    line_buffer = line_buffers[turn]
+                    if is_incremental:
+                        line_buffer.truncate_from(update_from.timestamp() + 5)
+                        line_buffer.append(data_x, data_y)
+                    else:
+                        widget.setPen(color)
+                        line_buffer.set(data_x, data_y)
+                    widget.setData(*line_buffer.get_data())
+                    if stop_flag.find(task_name, task_id):
+                        return
+                    await asyncio.sleep(0)
                 else:
-                    color = inside_strings[0]
-                widget.setPen(color)
-                widget.setData(data_x, data_y)
-                if stop_flag.find(task_name, task_id):
-                    return
-                await asyncio.sleep(0)
-            else:
-                if stop_flag.find(task_name, task_id):
-                    return
-                widget.clear()
+                    if stop_flag.find(task_name, task_id):
+                        return
+                    widget.clear()
+
+        # ■■■■■ remember what's drawn ■■■■■
+
+        self.chart_key = chart_key
+        self.chart_updated_until = last_written_moment
+        if len(asset_record) > 0:
+            self.chart_asset_until = asset_record.index[-1]
+        else:
+            self.chart_asset_until = None
 
         # ■■■■■ set minimum view range ■■■■■
 
@@ -1249,7 +1136,7 @@ class Transactor:
     async def display_status_information(self, *args, **kwargs):
         # ■■■■■ Display important things first ■■■■■
 
-        time_passed = datetime.now(timezone.utc) - self.account_state["observed_until"]
+        time_passed = clock.now() - self.account_state["observed_until"]
         if time_passed > timedelta(seconds=30):
             text = (
                 "Couldn't get the latest info on your Binance account due to a problem"
@@ -1341,10 +1228,10 @@ class Transactor:
         is_cycle_done = False
 
         async def play_progress_bar():
-            start_time = datetime.now(timezone.utc)
+            start_time = clock.now()
             passed_time = timedelta(seconds=0)
             while passed_time < timedelta(seconds=10):
-                passed_time = datetime.now(timezone.utc) - start_time
+                passed_time = clock.now() - start_time
                 if not is_cycle_done:
                     new_value = int(passed_time / timedelta(seconds=10) * 1000)
                 else:
@@ -1361,8 +1248,7 @@ class Transactor:
 
         # ■■■■■ moment ■■■■■
 
-        current_moment = datetime.now(timezone.utc).replace(microsecond=0)
-        current_moment = current_moment - timedelta(seconds=current_moment.second % 10)
+        current_moment = clock.scheduled_moment()
         before_moment = current_moment - timedelta(seconds=10)
 
         # ■■■■■ check if the data exists ■■■■■
@@ -1374,16 +1260,18 @@ class Transactor:
 
         # ■■■■■ wait for the latest data to be added ■■■■■
 
-        for _ in range(50):
-            async with solie.window.collector.candle_data.read_lock as cell:
-                last_index = cell.data.index[-1]
-                if last_index == before_moment:
-                    break
-            await asyncio.sleep(0.1)
+        try:
+            await solie.window.event_bus.wait_for(
+                BarClosed,
+                lambda event: event.moment >= before_moment,
+                timeout=5,
+            )
+        except asyncio.TimeoutError:
+            pass
 
         # ■■■■■ get the candle data ■■■■■
 
-        slice_from = datetime.now(timezone.utc) - timedelta(days=7)
+        slice_from = clock.now() - timedelta(days=7)
         async with solie.window.collector.candle_data.read_lock as cell:
             partial_candle_data = cell.data[slice_from:].copy()
 
@@ -1402,6 +1290,7 @@ class Transactor:
             candle_data=partial_candle_data,
             indicators_script=indicators_script,
         )
+        trace_cycles.mark(before_moment, "indicators_made", clock.now())
 
         current_candle_data = partial_candle_data.to_records()[-1]
         current_indicators = indicators.to_records()[-1]
@@ -1418,20 +1307,28 @@ class Transactor:
             decision_script=decision_script,
         )
         self.scribbles = scribbles
+        # Scribbles are journaled only when they change,
+        # as they are usually the same from one cycle to another
+        scribbles_content = pickle.dumps(scribbles)
+        if scribbles_content != self.journaled_scribbles:
+            self.record_journal.append(("scribbles", scribbles))
+            self.journaled_scribbles = scribbles_content
+        trace_cycles.mark(before_moment, "decision_made", clock.now())
 
         # ■■■■■ record task duration ■■■■■
 
         is_cycle_done = True
-        duration = (datetime.now(timezone.utc) - current_moment).total_seconds()
+        duration = (clock.now() - current_moment).total_seconds()
         remember_task_durations.add("perform_transaction", duration)
 
         # ■■■■■ place order ■■■■■
 
         await self.place_orders(decision)
+        trace_cycles.mark(before_moment, "orders_acknowledged", clock.now())
 
     async def display_day_range(self, *args, **kwargs):
-        range_start = (datetime.now(timezone.utc) - timedelta(hours=24)).timestamp()
-        range_end = datetime.now(timezone.utc).timestamp()
+        range_start = (clock.now() - timedelta(hours=24)).timestamp()
+        range_end = clock.now().timestamp()
         widget = solie.window.plot_widget
         widget.setXRange(range_start, range_end)
 
@@ -1492,60 +1389,19 @@ class Transactor:
 
         # ■■■■■ moment ■■■■■
 
-        current_moment = datetime.now(timezone.utc).replace(microsecond=0)
+        current_moment = clock.now().replace(microsecond=0)
         current_moment = current_moment - timedelta(seconds=current_moment.second % 10)
         before_moment = current_moment - timedelta(seconds=10)
 
         # ■■■■■ request exchange information ■■■■■
 
-        payload = {}
-        response = await self.api_requester.binance(
-            http_method="GET",
-            path="/fapi/v1/exchangeInfo",
-            payload=payload,
-        )
-        about_exchange = response
-
-        for about_symbol in about_exchange["symbols"]:
-            symbol = about_symbol["symbol"]
-
-            about_filter = {}
-
-            for about_filter in about_symbol["filters"]:
-                if about_filter["filterType"] == "MIN_NOTIONAL":
-                    break
-            minimum_notional = float(about_filter["notional"])
-            self.secret_memory["minimum_notionals"][symbol] = minimum_notional
-
-            for about_filter in about_symbol["filters"]:
-                if about_filter["filterType"] == "LOT_SIZE":
-                    break
-            maximum_quantity = float(about_filter["maxQty"])
-            for about_filter in about_symbol["filters"]:
-                if about_filter["filterType"] == "MARKET_LOT_SIZE":
-                    break
-            maximum_quantity = min(maximum_quantity, float(about_filter["maxQty"]))
-            self.secret_memory["maximum_quantities"][symbol] = maximum_quantity
-
-            for about_filter in about_symbol["filters"]:
-                if about_filter["filterType"] == "PRICE_FILTER":
-                    break
-            ticksize = float(about_filter["tickSize"])
-            price_precision = int(math.log10(1 / ticksize))
-            self.secret_memory["price_precisions"][symbol] = price_precision
-
-            for about_filter in about_symbol["filters"]:
-                if about_filter["filterType"] == "LOT_SIZE":
-                    break
-            stepsize = float(about_filter["stepSize"])
-            quantity_precision = int(math.log10(1 / stepsize))
-            self.secret_memory["quantity_precisions"][symbol] = quantity_precision
+        await exchange_information.refresh()
 
         # ■■■■■ request leverage bracket information ■■■■■
 
         try:
             payload = {
-                "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                "timestamp": int(clock.now().timestamp() * 1000),
             }
             response = await self.api_requester.binance(
                 http_method="GET",
@@ -1566,7 +1422,7 @@ class Transactor:
 
         try:
             payload = {
-                "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                "timestamp": int(clock.now().timestamp() * 1000),
             }
             response = await self.api_requester.binance(
                 http_method="GET",
@@ -1583,7 +1439,7 @@ class Transactor:
         async def job(symbol):
             payload = {
                 "symbol": symbol,
-                "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                "timestamp": int(clock.now().timestamp() * 1000),
             }
             response = await self.api_requester.binance(
                 http_method="GET",
@@ -1765,9 +1621,12 @@ class Transactor:
             cell.data[before_moment] = unrealized_change
             if not cell.data.index.is_monotonic_increasing:
                 cell.data = await go(sort_pandas.series, cell.data)
+        record = ("unrealized_change", before_moment, unrealized_change)
+        self.record_journal.append(record)
 
         # ■■■■■ make an asset trace if it's blank ■■■■■
 
+        await self.flush_account_ledger()
         async with self.asset_record.write_lock as cell:
             if len(cell.data) == 0:
                 for about_asset in about_account["assets"]:
@@ -1777,9 +1636,11 @@ class Transactor:
                     ):
                         break
                 wallet_balance = float(about_asset["walletBalance"])
-                current_time = datetime.now(timezone.utc)
+                current_time = clock.now()
                 cell.data.loc[current_time, "Cause"] = "other"
                 cell.data.loc[current_time, "Result Asset"] = wallet_balance
+                asset_row = cell.data.loc[current_time].to_dict()
+                self.record_journal.append(("asset_record", current_time, asset_row))
 
         # ■■■■■ when the wallet balance changed for no good reason ■■■■■
 
@@ -1798,9 +1659,11 @@ class Transactor:
             # when the difference is bigger than a billionth
             # referal fee, funding fee, wallet transfer, etc..
             async with self.asset_record.write_lock as cell:
-                current_time = datetime.now(timezone.utc)
+                current_time = clock.now()
                 cell.data.loc[current_time, "Cause"] = "other"
                 cell.data.loc[current_time, "Result Asset"] = wallet_balance
+                asset_row = cell.data.loc[current_time].to_dict()
+                self.record_journal.append(("asset_record", current_time, asset_row))
                 if not cell.data.index.is_monotonic_increasing:
                     cell.data = await go(sort_pandas.data_frame, cell.data)
         else:
@@ -1808,6 +1671,8 @@ class Transactor:
             async with self.asset_record.write_lock as cell:
                 last_index = cell.data.index[-1]
                 cell.data.loc[last_index, "Result Asset"] = wallet_balance
+                asset_row = cell.data.loc[last_index].to_dict()
+                self.record_journal.append(("asset_record", last_index, asset_row))
 
         # ■■■■■ correct mode of the account market if automation is turned on ■■■■■
 
@@ -1826,7 +1691,7 @@ class Transactor:
                 goal_leverage = min(desired_leverage, max_leverage)
 
                 if current_leverage != goal_leverage:
-                    timestamp = int(datetime.now(timezone.utc).timestamp() * 1000)
+                    timestamp = int(clock.now().timestamp() * 1000)
                     payload = {
                         "symbol": symbol,
                         "timestamp": timestamp,
@@ -1865,7 +1730,7 @@ class Transactor:
                         await self.place_orders(decision)
 
                     # change to crossed margin mode
-                    timestamp = int(datetime.now(timezone.utc).timestamp() * 1000)
+                    timestamp = int(clock.now().timestamp() * 1000)
                     payload = {
                         "symbol": symbol,
                         "timestamp": timestamp,
@@ -1885,7 +1750,7 @@ class Transactor:
             )
 
             try:
-                timestamp = int(datetime.now(timezone.utc).timestamp() * 1000)
+                timestamp = int(clock.now().timestamp() * 1000)
                 payload = {
                     "timestamp": timestamp,
                     "multiAssetsMargin": "false",
@@ -1899,7 +1764,7 @@ class Transactor:
                 pass
 
             try:
-                timestamp = int(datetime.now(timezone.utc).timestamp() * 1000)
+                timestamp = int(clock.now().timestamp() * 1000)
                 payload = {
                     "timestamp": timestamp,
                     "dualSidePosition": "false",
@@ -1915,7 +1780,7 @@ class Transactor:
         # ■■■■■ check API key restrictions ■■■■■
 
         payload = {
-            "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+            "timestamp": int(clock.now().timestamp() * 1000),
         }
         response = await self.api_requester.binance(
             http_method="GET",
@@ -1936,7 +1801,7 @@ class Transactor:
         self.secret_memory["is_key_restrictions_satisfied"] = is_satisfied
 
     async def place_orders(self, *args, **kwargs):
-        task_start_time = datetime.now(timezone.utc)
+        task_start_time = clock.now()
 
         decision = args[0]
 
@@ -1966,21 +1831,21 @@ class Transactor:
             if symbol not in decision.keys():
                 continue
 
-            async with solie.window.collector.aggregate_trades.read_lock as cell:
-                ar = cell.data[-10000:].copy()
-            temp_ar = ar[str((symbol, "Price"))]
-            temp_ar = temp_ar[temp_ar != 0]
-            current_price = float(temp_ar[-1])
+            current_price = solie.window.collector.latest_states[symbol].last_price
+            if current_price == 0:
+                # No trade was received yet
+                continue
 
             leverage = self.secret_memory["leverages"][symbol]
-            maximum_quantity = self.secret_memory["maximum_quantities"][symbol]
-            minimum_notional = self.secret_memory["minimum_notionals"][symbol]
-            price_precision = self.secret_memory["price_precisions"][symbol]
-            quantity_precision = self.secret_memory["quantity_precisions"][symbol]
+            symbol_information = exchange_information.get_symbol(symbol)
+            maximum_quantity = symbol_information.maximum_quantity
+            minimum_notional = symbol_information.minimum_notional
+            price_precision = symbol_information.price_precision
+            quantity_precision = symbol_information.quantity_precision
 
             if "cancel_all" in decision[symbol]:
                 cancel_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                 }
                 cancel_orders.append(cancel_order)
@@ -1995,7 +1860,7 @@ class Transactor:
                 else:
                     side = "NONE"
                 new_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                     "type": "MARKET",
                     "side": side,
@@ -2009,7 +1874,7 @@ class Transactor:
                 notional = max(minimum_notional, command["margin"] * leverage)
                 quantity = min(maximum_quantity, notional / current_price)
                 new_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                     "type": "MARKET",
                     "side": "BUY",
@@ -2022,7 +1887,7 @@ class Transactor:
                 notional = max(minimum_notional, command["margin"] * leverage)
                 quantity = min(maximum_quantity, notional / current_price)
                 new_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                     "type": "MARKET",
                     "side": "SELL",
@@ -2036,7 +1901,7 @@ class Transactor:
                 boundary = command["boundary"]
                 quantity = min(maximum_quantity, notional / boundary)
                 new_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                     "type": "LIMIT",
                     "side": "BUY",
@@ -2052,7 +1917,7 @@ class Transactor:
                 boundary = command["boundary"]
                 quantity = min(maximum_quantity, notional / boundary)
                 new_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                     "type": "LIMIT",
                     "side": "SELL",
@@ -2074,7 +1939,7 @@ class Transactor:
                     new_order_side = "NONE"
                     new_order_type = "NONE"
                 new_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                     "type": new_order_type,
                     "side": new_order_side,
@@ -2095,7 +1960,7 @@ class Transactor:
                     new_order_side = "NONE"
                     new_order_type = "NONE"
                 new_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                     "type": new_order_type,
                     "side": new_order_side,
@@ -2110,7 +1975,7 @@ class Transactor:
                 boundary = command["boundary"]
                 quantity = min(maximum_quantity, notional / boundary)
                 new_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                     "type": "STOP_MARKET",
                     "side": "BUY",
@@ -2125,7 +1990,7 @@ class Transactor:
                 boundary = command["boundary"]
                 quantity = min(maximum_quantity, notional / boundary)
                 new_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                     "type": "TAKE_PROFIT_MARKET",
                     "side": "BUY",
@@ -2140,7 +2005,7 @@ class Transactor:
                 boundary = command["boundary"]
                 quantity = min(maximum_quantity, notional / boundary)
                 new_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                     "type": "TAKE_PROFIT_MARKET",
                     "side": "SELL",
@@ -2155,7 +2020,7 @@ class Transactor:
                 boundary = command["boundary"]
                 quantity = min(maximum_quantity, notional / boundary)
                 new_order = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": symbol,
                     "type": "STOP_MARKET",
                     "side": "SELL",
@@ -2166,48 +2031,132 @@ class Transactor:
 
         # ■■■■■ actually place orders ■■■■■
 
-        async def job_cancel_order(payload):
-            await self.api_requester.binance(
-                http_method="DELETE",
-                path="/fapi/v1/allOpenOrders",
-                payload=payload,
-            )
+        # A failed request is logged without stopping the other ones,
+        # so that stop and close orders are still placed after a failure.
 
-        await asyncio.wait(
-            [asyncio.create_task(job_cancel_order(order)) for order in cancel_orders]
-        )
+        async def job_cancel_order(payload):
+            try:
+                await self.api_requester.binance(
+                    http_method="DELETE",
+                    path="/fapi/v1/allOpenOrders",
+                    payload=payload,
+                )
+            except Exception as error:
+                text = f"Open orders were not cancelled for {payload['symbol']}"
+                text += f"\n{repr(error)}"
+                solie.logger.warning(text)
+
+        await asyncio.gather(*(job_cancel_order(order) for order in cancel_orders))
+
+        def record_placed_orders(responses):
+            for response in responses:
+                order_symbol = response["symbol"]
+                order_id = response["orderId"]
+                timestamp = response["updateTime"] / 1000
+                update_time = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+                self.account_ledger.add_auto_order(update_time, order_symbol, order_id)
+                record = ("auto_order", update_time, order_symbol, order_id)
+                self.record_journal.append(record)
 
         async def job_new_order(payload):
-            response = await self.api_requester.binance(
-                http_method="POST",
-                path="/fapi/v1/order",
-                payload=payload,
+            request_time = clock.now()
+            try:
+                if self.api_trader.is_connected():
+                    response = await self.api_trader.place_order_with_failover(
+                        payload, self.api_requester
+                    )
+                else:
+                    response = await self.api_requester.binance(
+                        http_method="POST",
+                        path="/fapi/v1/order",
+                        payload=payload,
+                    )
+            except ApiRequestError as error:
+                text = f"Order was rejected for {payload['symbol']}"
+                text += f" ({payload['type']} {payload['side']})"
+                text += f"\n{error}"
+                solie.logger.warning(text)
+                return
+            except Exception as error:
+                text = f"Order could not be placed for {payload['symbol']}"
+                text += f" ({payload['type']} {payload['side']})"
+                text += f"\n{repr(error)}"
+                solie.logger.warning(text)
+                return
+            duration = (clock.now() - request_time).total_seconds()
+            remember_task_durations.add("order_round_trip", duration)
+            record_placed_orders([response])
+
+        async def job_new_batch_order(payloads):
+            batch_orders = []
+            for payload in payloads:
+                batch_order = {}
+                for key, value in payload.items():
+                    if key == "timestamp":
+                        continue
+                    elif isinstance(value, bool):
+                        batch_order[key] = "true" if value else "false"
+                    else:
+                        batch_order[key] = str(value)
+                batch_orders.append(batch_order)
+            request_time = clock.now()
+            try:
+                responses = await self.api_requester.binance(
+                    http_method="POST",
+                    path="/fapi/v1/batchOrders",
+                    payload={
+                        "timestamp": int(clock.now().timestamp() * 1000),
+                        "batchOrders": json.dumps(batch_orders),
+                    },
+                )
+            except ApiRequestError as error:
+                solie.logger.warning(f"Batch orders were rejected\n{error}")
+                return
+            except Exception as error:
+                text = f"Batch orders could not be placed\n{repr(error)}"
+                solie.logger.warning(text)
+                return
+            duration = (clock.now() - request_time).total_seconds()
+            remember_task_durations.add("order_round_trip", duration)
+            # Each order in the batch succeeds or fails on its own,
+            # and the responses come in the same order as the requests.
+            placed_responses = []
+            failed_payloads = []
+            for payload, response in zip(payloads, responses):
+                if "orderId" in response:
+                    placed_responses.append(response)
+                else:
+                    failed_payloads.append(payload)
+            record_placed_orders(placed_responses)
+            # Orders that failed in the batch are tried once more on their own,
+            # which records or reports them the same way as any single order
+            await asyncio.gather(*(job_new_order(p) for p in failed_payloads))
+
+        async def place_order_wave(payloads):
+            if self.api_trader.is_connected():
+                # Websocket requests are already multiplexed on one connection.
+                single_payloads = payloads
+                batch_payloads = []
+            else:
+                # Batch orders do not accept `closePosition`.
+                single_payloads = [p for p in payloads if "closePosition" in p]
+                batch_payloads = [p for p in payloads if "closePosition" not in p]
+            batch_size = 5
+            await asyncio.gather(
+                *(job_new_order(payload) for payload in single_payloads),
+                *(
+                    job_new_batch_order(batch_payloads[turn : turn + batch_size])
+                    for turn in range(0, len(batch_payloads), batch_size)
+                ),
             )
-            order_symbol = response["symbol"]
-            order_id = response["orderId"]
-            timestamp = response["updateTime"] / 1000
-            update_time = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-            async with self.auto_order_record.write_lock as cell:
-                while update_time in cell.data.index:
-                    update_time += timedelta(milliseconds=1)
-                cell.data.loc[update_time, "Symbol"] = order_symbol
-                cell.data.loc[update_time, "Order ID"] = order_id
-                if not cell.data.index.is_monotonic_increasing:
-                    cell.data = await go(sort_pandas.data_frame, cell.data)
 
-        await asyncio.wait(
-            [asyncio.create_task(job_new_order(order)) for order in now_orders]
-        )
-        await asyncio.wait(
-            [asyncio.create_task(job_new_order(order)) for order in book_orders]
-        )
-        await asyncio.wait(
-            [asyncio.create_task(job_new_order(order)) for order in later_orders]
-        )
+        await place_order_wave(now_orders)
+        await place_order_wave(book_orders)
+        await place_order_wave(later_orders)
 
         # ■■■■■ record task duration ■■■■■
 
-        duration = datetime.now(timezone.utc) - task_start_time
+        duration = clock.now() - task_start_time
         duration = duration.total_seconds()
         remember_task_durations.add("place_orders", duration)
 
@@ -2247,19 +2196,23 @@ class Transactor:
         async def job(conflicting_order_tuple):
             try:
                 payload = {
-                    "timestamp": int(datetime.now(timezone.utc).timestamp() * 1000),
+                    "timestamp": int(clock.now().timestamp() * 1000),
                     "symbol": conflicting_order_tuple[0],
                     "orderId": conflicting_order_tuple[1],
                 }
-                await self.api_requester.binance(
-                    http_method="DELETE",
-                    path="/fapi/v1/order",
-                    payload=payload,
-                )
+                try:
+                    await self.api_trader.cancel_order(payload)
+                except (ConnectionError, asyncio.TimeoutError):
+                    payload["timestamp"] = int(clock.now().timestamp() * 1000)
+                    await self.api_requester.binance(
+                        http_method="DELETE",
+                        path="/fapi/v1/order",
+                        payload=payload,
+                    )
             except ApiRequestError:
                 pass
 
-        await asyncio.gather(job(conflict) for conflict in conflicting_order_tuples)
+        await asyncio.gather(*(job(conflict) for conflict in conflicting_order_tuples))
 
     async def pan_view_range(self, *args, **kwargs):
         if not self.should_draw_frequently:
@@ -2278,7 +2231,7 @@ class Transactor:
     async def show_raw_account_state_object(self, *args, **kwargs):
         text = ""
 
-        time = datetime.now(timezone.utc)
+        time = clock.now()
         time_text = time.strftime("%Y-%m-%d %H:%M:%S")
         text += f"At UTC {time_text}"
 
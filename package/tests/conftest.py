@@ -0,0 +1,6 @@
+import logging
+
+import solie
+
+# Modules log through `solie.logger`, which is otherwise made when the app starts
+solie.logger = logging.getLogger("solie")
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import time
+
+import aiohttp
+from aiohttp import web
+
+
+class StandInBinance:
+    """
+    Serves the parts of Binance futures REST and WebSocket APIs
+    that placing orders uses, on a local port.
+    Orders are filled as soon as they are placed.
+    """
+
+    def __init__(self, latency: float = 0):
+        # Seconds that each request takes before it's handled
+        self.latency = latency
+        # What happens to `order.place` over the websocket:
+        # "ack" answers it, "lose_ack" places the order without answering,
+        # "drop_before_fill" and "drop_after_fill" close the socket
+        self.websocket_behavior = "ack"
+        self.orders: dict[str, dict] = {}
+        self.requests: list[tuple[str, str, dict]] = []
+        self._last_order_id = 0
+        self._runner: web.AppRunner | None = None
+        self.port = 0
+
+    @property
+    def rest_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def websocket_url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/ws-fapi/v1"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/ws-fapi/v1", self._handle_websocket)
+        app.router.add_post("/fapi/v1/order", self._handle_new_order)
+        app.router.add_get("/fapi/v1/order", self._handle_query_order)
+        app.router.add_delete("/fapi/v1/order", self._handle_cancel_order)
+        app.router.add_post("/fapi/v1/batchOrders", self._handle_batch_orders)
+        app.router.add_delete("/fapi/v1/allOpenOrders", self._handle_cancel_all)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def placed_orders(self) -> list[dict]:
+        return list(self.orders.values())
+
+    def _place(self, params: dict) -> dict:
+        self._last_order_id += 1
+        client_order_id = params.get("newClientOrderId", f"auto_{self._last_order_id}")
+        order = {
+            "orderId": self._last_order_id,
+            "symbol": params["symbol"],
+            "clientOrderId": client_order_id,
+            "status": "FILLED",
+            "type": params.get("type"),
+            "side": params.get("side"),
+            "updateTime": int(time.time() * 1000),
+        }
+        self.orders[client_order_id] = order
+        return order
+
+    async def _record(self, request: web.Request, path: str) -> dict:
+        await asyncio.sleep(self.latency)
+        params = dict(request.query)
+        self.requests.append((request.method, path, params))
+        return params
+
+    async def _handle_new_order(self, request: web.Request) -> web.Response:
+        params = await self._record(request, "/fapi/v1/order")
+        return web.json_response(self._place(params))
+
+    async def _handle_query_order(self, request: web.Request) -> web.Response:
+        params = await self._record(request, "/fapi/v1/order")
+        order = self.orders.get(params["origClientOrderId"])
+        if order is None:
+            error = {"code": -2013, "msg": "Order does not exist."}
+            return web.json_response(error, status=400)
+        return web.json_response(order)
+
+    async def _handle_cancel_order(self, request: web.Request) -> web.Response:
+        params = await self._record(request, "/fapi/v1/order")
+        return web.json_response({"symbol": params["symbol"], "status": "CANCELED"})
+
+    async def _handle_cancel_all(self, request: web.Request) -> web.Response:
+        await self._record(request, "/fapi/v1/allOpenOrders")
+        return web.json_response({"code": 200, "msg": "success"})
+
+    async def _handle_batch_orders(self, request: web.Request) -> web.Response:
+        params = await self._record(request, "/fapi/v1/batchOrders")
+        batch_orders = json.loads(params["batchOrders"])
+        return web.json_response([self._place(p) for p in batch_orders])
+
+    async def _handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        async for received_raw in websocket:
+            if received_raw.type != aiohttp.WSMsgType.TEXT:
+                break
+            received = json.loads(received_raw.data)
+            await asyncio.sleep(self.latency)
+            method = received["method"]
+            params = received["params"]
+            self.requests.append(("WEBSOCKET", method, params))
+            behavior = self.websocket_behavior
+            if method != "order.place":
+                result = {"symbol": params["symbol"], "status": "CANCELED"}
+            elif behavior == "drop_before_fill":
+                await websocket.close()
+                break
+            else:
+                result = self._place(params)
+                if behavior == "drop_after_fill":
+                    await websocket.close()
+                    break
+                elif behavior == "lose_ack":
+                    continue
+            response = {"id": received["id"], "status": 200, "result": result}
+            await websocket.send_json(response)
+        return websocket
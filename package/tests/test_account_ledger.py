@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from solie.definition.account_ledger import AccountLedger
+from solie.utility import standardize
+
+START_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _make_auto_order_record() -> pd.DataFrame:
+    return pd.DataFrame(
+        columns=["Symbol", "Order ID"],
+        index=pd.DatetimeIndex([], tz="UTC"),
+    )
+
+
+def _make_asset_record() -> pd.DataFrame:
+    asset_record = standardize.asset_record()
+    asset_record.loc[START_TIME, "Cause"] = "other"
+    asset_record.loc[START_TIME, "Result Asset"] = 1000.0
+    return asset_record
+
+
+def _make_ledger(asset_record: pd.DataFrame) -> AccountLedger:
+    account_ledger = AccountLedger()
+    account_ledger.rebuild(_make_auto_order_record(), asset_record)
+    return account_ledger
+
+
+def _fill(account_ledger: AccountLedger, seconds: float, order_id: int, **kwargs):
+    fill = {
+        "event_time": START_TIME + timedelta(seconds=seconds),
+        "symbol": "BTCUSDT",
+        "order_id": order_id,
+        "side": "BUY",
+        "fill_price": 100.0,
+        "is_maker": False,
+        "margin_ratio": 0.1,
+        "revenue": -1.0,
+    }
+    fill.update(kwargs)
+    account_ledger.add_fill(**fill)
+
+
+def test_fills_become_rows_with_running_asset():
+    asset_record = _make_asset_record()
+    account_ledger = _make_ledger(asset_record)
+    _fill(account_ledger, 1, 1, revenue=-1.0)
+    _fill(account_ledger, 2, 2, side="SELL", is_maker=True, revenue=20.0)
+    assert account_ledger.has_pending()
+
+    asset_record, changed_times = account_ledger.flush_fills(asset_record)
+    assert not account_ledger.has_pending()
+    assert changed_times == [
+        START_TIME + timedelta(seconds=1),
+        START_TIME + timedelta(seconds=2),
+    ]
+    assert list(asset_record["Result Asset"]) == [1000.0, 999.0, 1019.0]
+    assert list(asset_record["Side"].iloc[1:]) == ["buy", "sell"]
+    assert list(asset_record["Role"].iloc[1:]) == ["taker", "maker"]
+    assert list(asset_record["Cause"].iloc[1:]) == ["manual_trade", "manual_trade"]
+
+
+def test_partial_fills_are_merged_into_the_first_record():
+    asset_record = _make_asset_record()
+    account_ledger = _make_ledger(asset_record)
+    _fill(account_ledger, 1, 1, margin_ratio=0.1, revenue=-1.0)
+    _fill(account_ledger, 2, 1, margin_ratio=0.2, revenue=-2.0)
+    asset_record, _ = account_ledger.flush_fills(asset_record)
+    assert len(asset_record) == 2
+    assert asset_record["Margin Ratio"].iloc[-1] == pytest.approx(0.3)
+    assert asset_record["Result Asset"].iloc[-1] == pytest.approx(997.0)
+
+    # Parts that arrive after the first one was flushed too
+    _fill(account_ledger, 3, 1, margin_ratio=0.4, revenue=-4.0)
+    asset_record, changed_times = account_ledger.flush_fills(asset_record)
+    assert set(changed_times) == {START_TIME + timedelta(seconds=1)}
+    assert len(asset_record) == 2
+    assert asset_record["Margin Ratio"].iloc[-1] == pytest.approx(0.7)
+    assert asset_record["Result Asset"].iloc[-1] == pytest.approx(993.0)
+
+
+def test_revenue_goes_to_the_latest_record():
+    asset_record = _make_asset_record()
+    account_ledger = _make_ledger(asset_record)
+    _fill(account_ledger, 1, 1, revenue=0.0)
+    _fill(account_ledger, 2, 2, revenue=0.0)
+    asset_record, _ = account_ledger.flush_fills(asset_record)
+
+    _fill(account_ledger, 3, 1, margin_ratio=0.5, revenue=10.0)
+    asset_record, changed_times = account_ledger.flush_fills(asset_record)
+    assert set(changed_times) == {
+        START_TIME + timedelta(seconds=1),
+        START_TIME + timedelta(seconds=2),
+    }
+    assert asset_record["Margin Ratio"].iloc[1] == pytest.approx(0.6)
+    assert list(asset_record["Result Asset"]) == [1000.0, 1000.0, 1010.0]
+
+
+def test_fills_at_the_same_moment_get_distinct_times():
+    asset_record = _make_asset_record()
+    account_ledger = _make_ledger(asset_record)
+    _fill(account_ledger, 0, 1)
+    _fill(account_ledger, 0, 2)
+    asset_record, changed_times = account_ledger.flush_fills(asset_record)
+    assert asset_record.index.is_unique
+    assert changed_times == [
+        START_TIME + timedelta(milliseconds=1),
+        START_TIME + timedelta(milliseconds=2),
+    ]
+
+
+def test_auto_orders_are_told_apart():
+    asset_record = _make_asset_record()
+    account_ledger = _make_ledger(asset_record)
+    account_ledger.add_auto_order(START_TIME, "BTCUSDT", 7)
+    account_ledger.add_auto_order(START_TIME, "BTCUSDT", 8)
+    _fill(account_ledger, 1, 7)
+    _fill(account_ledger, 2, 9)
+    asset_record, _ = account_ledger.flush_fills(asset_record)
+    assert list(asset_record["Cause"].iloc[1:]) == ["auto_trade", "manual_trade"]
+
+    auto_order_record = account_ledger.flush_auto_orders(_make_auto_order_record())
+    assert list(auto_order_record["Order ID"]) == [7, 8]
+    assert auto_order_record.index.is_unique
+    assert not account_ledger.has_pending()
+
+
+def test_ledger_is_rebuilt_from_records():
+    asset_record = _make_asset_record()
+    account_ledger = _make_ledger(asset_record)
+    account_ledger.add_auto_order(START_TIME, "BTCUSDT", 7)
+    _fill(account_ledger, 1, 7, revenue=5.0)
+    asset_record, _ = account_ledger.flush_fills(asset_record)
+    auto_order_record = account_ledger.flush_auto_orders(_make_auto_order_record())
+
+    rebuilt_ledger = AccountLedger()
+    rebuilt_ledger.rebuild(auto_order_record, asset_record)
+    _fill(rebuilt_ledger, 2, 7, margin_ratio=0.2, revenue=1.0)
+    _fill(rebuilt_ledger, 3, 7, symbol="ETHUSDT")
+    asset_record, _ = rebuilt_ledger.flush_fills(asset_record)
+    assert len(asset_record) == 3
+    assert asset_record["Margin Ratio"].iloc[1] == pytest.approx(0.3)
+    assert asset_record["Cause"].iloc[1] == "auto_trade"
+    # Order IDs are only unique within a symbol
+    assert asset_record["Cause"].iloc[2] == "manual_trade"
+    assert asset_record["Result Asset"].iloc[-1] == pytest.approx(1005.0)
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from solie.definition.api_requester import ApiRequester
+from solie.definition.api_trader import ApiTrader
+from solie.utility import clock
+
+from .stand_in_binance import StandInBinance
+
+
+async def _place_order(websocket_behavior: str) -> tuple[dict, StandInBinance]:
+    server = StandInBinance()
+    server.websocket_behavior = websocket_behavior
+    await server.start()
+    api_requester = ApiRequester()
+    api_requester.futures_url = server.rest_url
+    api_trader = ApiTrader(server.websocket_url, timeout=0.5)
+    try:
+        for _ in range(500):
+            if api_trader.is_connected():
+                break
+            await asyncio.sleep(0.01)
+        payload = {
+            "timestamp": int(clock.now().timestamp() * 1000) - 5000,
+            "symbol": "BTCUSDT",
+            "type": "MARKET",
+            "side": "BUY",
+            "quantity": 0.001,
+        }
+        response = await api_trader.place_order_with_failover(payload, api_requester)
+    finally:
+        await api_trader.close()
+        await ApiRequester.close_sessions()
+        await server.stop()
+    return response, server
+
+
+def test_ack_received():
+    response, server = asyncio.run(_place_order("ack"))
+    assert len(server.placed_orders()) == 1
+    assert response["orderId"] == server.placed_orders()[0]["orderId"]
+    assert [r[:2] for r in server.requests] == [("WEBSOCKET", "order.place")]
+
+
+@pytest.mark.parametrize("websocket_behavior", ["lose_ack", "drop_after_fill"])
+def test_order_filled_before_failure_is_not_placed_again(websocket_behavior):
+    response, server = asyncio.run(_place_order(websocket_behavior))
+    assert len(server.placed_orders()) == 1
+    assert response["orderId"] == server.placed_orders()[0]["orderId"]
+    assert [r[:2] for r in server.requests] == [
+        ("WEBSOCKET", "order.place"),
+        ("GET", "/fapi/v1/order"),
+    ]
+
+
+def test_order_lost_with_socket_is_placed_over_rest():
+    response, server = asyncio.run(_place_order("drop_before_fill"))
+    assert len(server.placed_orders()) == 1
+    assert response["orderId"] == server.placed_orders()[0]["orderId"]
+    assert [r[:2] for r in server.requests] == [
+        ("WEBSOCKET", "order.place"),
+        ("GET", "/fapi/v1/order"),
+        ("POST", "/fapi/v1/order"),
+    ]
+    # The order is stamped again instead of going out with the old timestamp
+    websocket_params = server.requests[0][2]
+    rest_params = server.requests[2][2]
+    assert rest_params["newClientOrderId"] == websocket_params["newClientOrderId"]
+    assert int(rest_params["timestamp"]) > int(websocket_params["timestamp"])
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from solie.definition.candle_assembler import CandleAssembler
+from solie.utility import combine_candle_datas
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "XRPUSDT"]
+COLUMNS = pd.MultiIndex.from_product(
+    [SYMBOLS, ("Open", "High", "Low", "Close", "Volume")]
+)
+START_TIME = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def _make_download(
+    symbol: str, hour: int, generator: np.random.Generator
+) -> pd.DataFrame:
+    # Like a parsed archive, rows are left out where there were no trades
+    index = pd.date_range(
+        START_TIME + timedelta(hours=hour), periods=60 * 6, freq="10S"
+    )
+    index = index[generator.random(len(index)) > 0.2]
+    values = generator.uniform(1, 100, (len(index), 5))
+    columns = pd.MultiIndex.from_product(
+        [[symbol], ("Open", "High", "Low", "Close", "Volume")]
+    )
+    return pd.DataFrame(values, index=index, columns=columns, dtype=np.float32)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_frame_matches_repeated_combining(seed):
+    generator = np.random.default_rng(seed)
+    # Hours of some symbols are missing, like archives that failed to download
+    downloads = [
+        _make_download(symbol, hour, generator)
+        for symbol in SYMBOLS
+        for hour in range(6)
+        if generator.random() > 0.2
+    ]
+    generator.shuffle(downloads)
+
+    combined_df = pd.DataFrame(
+        columns=COLUMNS, dtype=np.float32, index=pd.DatetimeIndex([], tz="UTC")
+    )
+    for new_df in downloads:
+        combined_df = combine_candle_datas.do(new_df, combined_df)
+
+    candle_assembler = CandleAssembler(
+        COLUMNS, START_TIME - timedelta(days=1), START_TIME + timedelta(days=5)
+    )
+    for new_df in downloads:
+        candle_assembler.write(new_df)
+    assembled_df = candle_assembler.to_frame()
+
+    pd.testing.assert_frame_equal(
+        assembled_df, combined_df.reindex(columns=COLUMNS), check_freq=False
+    )
+
+
+def test_later_frames_take_priority():
+    candle_assembler = CandleAssembler(
+        COLUMNS, START_TIME, START_TIME + timedelta(minutes=1)
+    )
+    index = pd.date_range(START_TIME, periods=3, freq="10S")
+    columns = pd.MultiIndex.from_product([["BTCUSDT"], ("Close",)])
+    candle_assembler.write(pd.DataFrame(1.0, index=index, columns=columns))
+    candle_assembler.write(pd.DataFrame(2.0, index=index[1:], columns=columns))
+    assembled_df = candle_assembler.to_frame()
+    assert list(assembled_df[("BTCUSDT", "Close")]) == [1.0, 2.0, 2.0]
+    assert assembled_df[("BTCUSDT", "Open")].isna().all()
+
+
+def test_rows_outside_the_period_are_ignored():
+    candle_assembler = CandleAssembler(
+        COLUMNS, START_TIME, START_TIME + timedelta(minutes=1)
+    )
+    index = pd.date_range(START_TIME - timedelta(seconds=20), periods=12, freq="10S")
+    columns = pd.MultiIndex.from_product([["BTCUSDT"], ("Close",)])
+    candle_assembler.write(pd.DataFrame(1.0, index=index, columns=columns))
+    assembled_df = candle_assembler.to_frame()
+    assert assembled_df.index[0] == START_TIME
+    assert assembled_df.index[-1] == START_TIME + timedelta(seconds=50)
+
+
+def test_nothing_written_gives_an_empty_frame():
+    candle_assembler = CandleAssembler(
+        COLUMNS, START_TIME, START_TIME + timedelta(days=1)
+    )
+    assembled_df = candle_assembler.to_frame()
+    assert len(assembled_df) == 0
+    pd.testing.assert_index_equal(assembled_df.columns, COLUMNS)
@@ -0,0 +1,190 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from solie.definition.candle_pyramid import LEVEL_SECONDS, CandlePyramid
+from solie.utility import prepare_lines
+
+START_TIME = datetime(2024, 1, 1, 0, 0, 30, tzinfo=timezone.utc)
+
+
+def _make_candle_data(row_count: int, seed: int = 0) -> pd.DataFrame:
+    # Some rows are left empty, like blocks that weren't collected
+    generator = np.random.default_rng(seed)
+    index = pd.date_range(START_TIME, periods=row_count, freq="10S")
+    close_prices = 100 + np.cumsum(generator.uniform(-1, 1, row_count))
+    open_prices = close_prices + np.round(generator.uniform(-1, 1, row_count))
+    values = np.column_stack(
+        (
+            open_prices,
+            np.maximum(open_prices, close_prices) + generator.uniform(0, 1, row_count),
+            np.minimum(open_prices, close_prices) - generator.uniform(0, 1, row_count),
+            close_prices,
+            generator.uniform(0, 10, row_count),
+        )
+    )
+    values[generator.random(row_count) < 0.1] = np.nan
+    values[0] = (100, 101, 99, 100, 1)
+    columns = pd.MultiIndex.from_product(
+        [["BTCUSDT"], ("Open", "High", "Low", "Close", "Volume")]
+    )
+    return pd.DataFrame(values, index=index, columns=columns, dtype=np.float32)
+
+
+def _make_lines_before(candle_data: pd.DataFrame, symbol: str) -> dict:
+    # How the charts drew candles directly from candle data, as the reference
+    index_ar = candle_data.index.to_numpy(dtype=np.int64) / 10**9
+    open_ar = candle_data[(symbol, "Open")].to_numpy()
+    close_ar = candle_data[(symbol, "Close")].to_numpy()
+    high_ar = candle_data[(symbol, "High")].to_numpy()
+    low_ar = candle_data[(symbol, "Low")].to_numpy()
+    nan_ar = np.full(len(index_ar), np.nan)
+
+    lines = {}
+    for line_name, is_target in (
+        ("price_rise", close_ar > open_ar),
+        ("price_fall", close_ar < open_ar),
+        ("price_stay", close_ar == open_ar),
+    ):
+        data_x = np.stack(
+            [
+                index_ar[is_target] + 2,
+                index_ar[is_target] + 5,
+                index_ar[is_target],
+                index_ar[is_target] + 5,
+                index_ar[is_target] + 8,
+                index_ar[is_target],
+                index_ar[is_target] + 5,
+                index_ar[is_target] + 5,
+                index_ar[is_target],
+            ],
+            axis=1,
+        ).reshape(-1)
+        data_y = np.stack(
+            [
+                open_ar[is_target],
+                open_ar[is_target],
+                nan_ar[is_target],
+                close_ar[is_target],
+                close_ar[is_target],
+                nan_ar[is_target],
+                high_ar[is_target],
+                low_ar[is_target],
+                nan_ar[is_target],
+            ],
+            axis=1,
+        ).reshape(-1)
+        lines[line_name] = [(data_x, data_y)]
+    lines["wobbles"] = [
+        (index_ar, candle_data[(symbol, "High")].to_numpy(dtype=np.float32)),
+        (index_ar, candle_data[(symbol, "Low")].to_numpy(dtype=np.float32)),
+    ]
+    volume_sr = candle_data[(symbol, "Volume")].fillna(value=0)
+    lines["volume"] = [(index_ar, volume_sr.to_numpy(dtype=np.float32))]
+    return lines
+
+
+def _assert_lines_equal(lines: dict, expected_lines: dict):
+    assert lines.keys() == expected_lines.keys()
+    for line_name, line_datas in lines.items():
+        expected_datas = expected_lines[line_name]
+        assert len(line_datas) == len(expected_datas)
+        for (data_x, data_y), (expected_x, expected_y) in zip(
+            line_datas, expected_datas
+        ):
+            np.testing.assert_allclose(data_x, expected_x)
+            np.testing.assert_allclose(data_y, expected_y, rtol=1e-6)
+
+
+def _make_all_lines(candle_pyramid: CandlePyramid) -> list[dict]:
+    slice_from, slice_until = candle_pyramid.get_range()
+    return [
+        candle_pyramid.make_lines(level_number, slice_from, slice_until)
+        for level_number in range(len(LEVEL_SECONDS))
+    ]
+
+
+def test_finest_level_matches_drawing_candle_data():
+    candle_data = _make_candle_data(5000)
+    picked_data = prepare_lines.pick_candle_data(
+        candle_data, "BTCUSDT", START_TIME, None
+    )
+    candle_pyramid = CandlePyramid(picked_data, "BTCUSDT")
+    slice_from, slice_until = candle_pyramid.get_range()
+    lines = candle_pyramid.make_lines(0, slice_from, slice_until)
+    _assert_lines_equal(lines, _make_lines_before(picked_data, "BTCUSDT"))
+
+
+@pytest.mark.parametrize("level_number", range(1, len(LEVEL_SECONDS)))
+def test_coarser_levels_match_resampling(level_number):
+    candle_data = _make_candle_data(30000)
+    candle_pyramid = CandlePyramid(candle_data, "BTCUSDT")
+    bar_seconds = LEVEL_SECONDS[level_number]
+    slice_from, slice_until = candle_pyramid.get_range()
+    lines = candle_pyramid.make_lines(level_number, slice_from, slice_until)
+
+    symbol_data = candle_data["BTCUSDT"]
+    resampled_data = pd.DataFrame(
+        {
+            "Open": symbol_data["Open"].resample(f"{bar_seconds}s").first(),
+            "High": symbol_data["High"].resample(f"{bar_seconds}s").max(),
+            "Low": symbol_data["Low"].resample(f"{bar_seconds}s").min(),
+            "Close": symbol_data["Close"].resample(f"{bar_seconds}s").last(),
+            "Volume": symbol_data["Volume"].resample(f"{bar_seconds}s").sum(),
+        }
+    )
+    resampled_data.columns = pd.MultiIndex.from_product(
+        [["BTCUSDT"], resampled_data.columns]
+    )
+    expected_lines = _make_lines_before(resampled_data, "BTCUSDT")
+
+    for line_name in ("wobbles", "volume"):
+        _assert_lines_equal(
+            {line_name: lines[line_name]}, {line_name: expected_lines[line_name]}
+        )
+    for line_name in ("price_rise", "price_fall", "price_stay"):
+        data_y = lines[line_name][0][1]
+        expected_y = expected_lines[line_name][0][1]
+        np.testing.assert_allclose(data_y, expected_y, rtol=1e-6)
+
+
+@pytest.mark.parametrize("update_row", [1, 359, 360, 4000, 8639])
+def test_updated_pyramid_matches_a_new_one(update_row):
+    # Updates start from the last written bar, as the chart cache does
+    candle_data = _make_candle_data(9000, seed=update_row)
+    first_data = prepare_lines.pick_candle_data(
+        candle_data.iloc[:update_row], "BTCUSDT", START_TIME, None
+    )
+    candle_pyramid = CandlePyramid(first_data, "BTCUSDT")
+    update_from = candle_data.index[update_row - 1]
+    candle_pyramid.update(
+        prepare_lines.pick_candle_data(candle_data, "BTCUSDT", update_from, None),
+        "BTCUSDT",
+    )
+
+    new_pyramid = CandlePyramid(
+        prepare_lines.pick_candle_data(candle_data, "BTCUSDT", START_TIME, None),
+        "BTCUSDT",
+    )
+    assert candle_pyramid.get_range() == new_pyramid.get_range()
+    for lines, expected_lines in zip(
+        _make_all_lines(candle_pyramid), _make_all_lines(new_pyramid)
+    ):
+        _assert_lines_equal(lines, expected_lines)
+
+
+def test_level_fits_the_view():
+    candle_pyramid = CandlePyramid(_make_candle_data(10), "BTCUSDT")
+    assert candle_pyramid.choose_level(1000 * 10, 1000) == 0
+    assert candle_pyramid.choose_level(1000 * 10 + 1, 1000) == 1
+    assert candle_pyramid.choose_level(1000 * 3600, 1000) == 3
+    assert candle_pyramid.choose_level(10**12, 1000) == len(LEVEL_SECONDS) - 1
+
+
+def test_empty_candle_data_has_no_range():
+    candle_pyramid = CandlePyramid(_make_candle_data(10).iloc[0:0], "BTCUSDT")
+    assert candle_pyramid.get_range() == (0.0, 0.0)
+    lines = candle_pyramid.make_lines(2, 0, 10**10)
+    assert len(lines["price_rise"][0][0]) == 0
@@ -0,0 +1,101 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from solie.utility import clock
+
+
+class _FakeTime:
+    def __init__(self, wall: float, monotonic: float):
+        self.wall = wall
+        self.mono = monotonic
+
+    def time(self) -> float:
+        return self.wall
+
+    def monotonic(self) -> float:
+        return self.mono
+
+    def advance(self, seconds: float):
+        self.wall += seconds
+        self.mono += seconds
+
+
+@pytest.fixture
+def fake_time(monkeypatch) -> _FakeTime:
+    fake_time = _FakeTime(1_700_000_000.0, 100.0)
+    monkeypatch.setattr(
+        clock,
+        "time",
+        SimpleNamespace(time=fake_time.time, monotonic=fake_time.monotonic),
+    )
+    monkeypatch.setattr(clock, "_base_timestamp", fake_time.wall)
+    monkeypatch.setattr(clock, "_base_monotonic", fake_time.mono)
+    monkeypatch.setattr(clock, "_offset_from", 0.0)
+    monkeypatch.setattr(clock, "_offset_to", 0.0)
+    monkeypatch.setattr(clock, "_offset_changed", fake_time.mono)
+    monkeypatch.setattr(clock, "_slew_seconds", 1.0)
+    return fake_time
+
+
+def test_small_wall_clock_adjustments_are_ignored(fake_time):
+    fake_time.advance(10)
+    fake_time.wall -= 0.5
+    assert clock.timestamp() == 1_700_000_010.0
+
+
+def test_wall_clock_steps_are_followed(fake_time):
+    fake_time.advance(10)
+    fake_time.wall += 3600
+    assert clock.timestamp() == 1_700_003_610.0
+    # The new wall time is the base from now on
+    fake_time.advance(1)
+    assert clock.timestamp() == 1_700_003_611.0
+
+
+def test_suspension_is_followed(fake_time):
+    # The monotonic clock doesn't advance while the system is suspended
+    fake_time.wall += 600
+    assert clock.timestamp() == 1_700_000_600.0
+
+
+def test_small_offset_is_slewed(fake_time):
+    clock.set_offset(0.5)
+    assert clock.get_offset() == 0.0
+    fake_time.advance(0.5)
+    assert clock.get_offset() == pytest.approx(0.25)
+    fake_time.advance(0.5)
+    assert clock.get_offset() == 0.5
+
+
+def test_slewed_time_never_goes_back(fake_time):
+    clock.set_offset(-0.9)
+    timestamps = []
+    for _ in range(20):
+        timestamps.append(clock.timestamp())
+        fake_time.advance(0.1)
+    assert timestamps == sorted(timestamps)
+    assert clock.get_offset() == -0.9
+
+
+def test_large_offset_is_stepped(fake_time):
+    clock.set_offset(5.0)
+    assert clock.get_offset() == 5.0
+    assert clock.local_timestamp() == 1_700_000_000.0
+    assert clock.now() == datetime.fromtimestamp(1_700_000_005.0, tz=timezone.utc)
+
+
+def test_scheduled_moment_is_the_interval_it_was_fired_in(fake_time):
+    fake_time.wall = 1_700_000_009.9
+    expected = datetime.fromtimestamp(1_700_000_000, tz=timezone.utc)
+    assert clock.scheduled_moment() == expected
+    fake_time.wall = 1_700_000_005.0
+    assert clock.scheduled_moment() == expected
+    # The server offset isn't applied
+    clock.set_offset(5.0)
+    assert clock.scheduled_moment() == expected
+    fake_time.wall = 1_700_000_020.0
+    assert clock.scheduled_moment(60) == datetime.fromtimestamp(
+        1_699_999_980, tz=timezone.utc
+    )
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from solie.definition.coverage_tracker import CoverageTracker
+
+START_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+
+
+def _make_candle_data(slot_from: int, slot_count: int) -> pd.DataFrame:
+    index = pd.date_range(
+        START_TIME + timedelta(seconds=10 * slot_from),
+        periods=slot_count,
+        freq="10S",
+    )
+    columns = pd.MultiIndex.from_product(
+        [SYMBOLS, ("Open", "High", "Low", "Close", "Volume")]
+    )
+    return pd.DataFrame(1.0, index=index, columns=columns, dtype=np.float32)
+
+
+def _moment(slot: int) -> datetime:
+    return START_TIME + timedelta(seconds=10 * slot)
+
+
+def test_complete_slots_are_counted():
+    coverage_tracker = CoverageTracker(SYMBOLS)
+    candle_data = _make_candle_data(0, 100)
+    candle_data.iloc[10, 3] = np.nan
+    candle_data.iloc[20, 8] = np.nan
+    coverage_tracker.update(candle_data)
+    assert coverage_tracker.count_complete(_moment(0)) == 98
+    assert coverage_tracker.count_complete(_moment(50)) == 50
+
+    # Rows written again later fill the holes
+    coverage_tracker.update(_make_candle_data(10, 11))
+    assert coverage_tracker.count_complete(_moment(0)) == 100
+
+
+def test_missing_ranges_are_found_per_symbol():
+    coverage_tracker = CoverageTracker(SYMBOLS)
+    candle_data = _make_candle_data(0, 100)
+    candle_data.iloc[10:13, 0] = np.nan
+    candle_data.iloc[50, 9] = np.nan
+    candle_data = candle_data.drop(candle_data.index[90:95])
+    coverage_tracker.update(candle_data)
+
+    assert coverage_tracker.find_missing_ranges("BTCUSDT", _moment(0), _moment(99)) == [
+        (_moment(10), _moment(12)),
+        (_moment(90), _moment(94)),
+    ]
+    assert coverage_tracker.find_missing_ranges("ETHUSDT", _moment(0), _moment(99)) == [
+        (_moment(50), _moment(50)),
+        (_moment(90), _moment(94)),
+    ]
+    missing_ranges = coverage_tracker.find_missing_ranges(
+        "ETHUSDT", _moment(60), _moment(99)
+    )
+    assert missing_ranges == [(_moment(90), _moment(94))]
+    # Slots that were never written are missing
+    missing_ranges = coverage_tracker.find_missing_ranges(
+        "BTCUSDT", _moment(95), _moment(110)
+    )
+    assert missing_ranges == [(_moment(100), _moment(110))]
+
+
+def test_old_slots_expire_by_themselves():
+    coverage_tracker = CoverageTracker(SYMBOLS, days=1)
+    slot_count = 24 * 60 * 6
+    candle_data = _make_candle_data(0, 100)
+    candle_data.iloc[0, 0] = np.nan
+    coverage_tracker.update(candle_data)
+    coverage_tracker.update(_make_candle_data(slot_count + 50, 1))
+    # The newest slot took the position of slot 50
+    assert coverage_tracker.count_complete(_moment(0)) == 99
+    assert coverage_tracker.count_complete(_moment(100)) == 1
+    missing_ranges = coverage_tracker.find_missing_ranges(
+        "BTCUSDT", _moment(49), _moment(51)
+    )
+    assert missing_ranges == [(_moment(50), _moment(50))]
+
+    # Rows older than the tracked range are ignored
+    coverage_tracker.update(_make_candle_data(0, 1))
+    assert coverage_tracker.count_complete(_moment(0)) == 99
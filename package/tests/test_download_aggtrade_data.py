@@ -0,0 +1,172 @@
+import os
+import random
+import zipfile
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from solie.definition.structs import DownloadPreset
+from solie.utility import download_aggtrade_data
+
+START_TIMESTAMP = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+CSV_HEADER = (
+    "agg_trade_id,price,quantity,first_trade_id,last_trade_id,"
+    + "transact_time,is_buyer_maker\n"
+)
+
+
+def _read_candles_before(archive_path: str, symbol: str) -> pd.DataFrame:
+    # The implementation that the chunked one replaced, as the reference.
+    # Only the header is detected beforehand instead of by a failed parse.
+    with zipfile.ZipFile(archive_path) as zipped_archive:
+        with zipped_archive.open(zipped_archive.namelist()[0]) as csv_file:
+            has_header = not csv_file.readline().decode()[:1].isdigit()
+    df = pd.concat(
+        pd.read_csv(
+            archive_path,
+            compression="zip",
+            header=None,
+            skiprows=1 if has_header else 0,
+            usecols=[1, 2, 5],
+            dtype={1: np.float32, 2: np.float32, 5: np.int64},
+            chunksize=10**6,
+        )
+    )
+
+    df = df.set_index(5)
+    df.index.name = None
+    df.index = pd.to_datetime(df.index, unit="ms", utc=True)
+
+    temp_sr = pd.Series(0, index=df.index, dtype=np.float32)
+    temp_sr = temp_sr.groupby(temp_sr.index).first()
+    temp_sr = temp_sr.resample("10s").agg("mean")
+    temp_sr = temp_sr.interpolate(limit=60, limit_direction="forward")
+    temp_sr = temp_sr.replace(np.nan, 1)
+    temp_sr = temp_sr.replace(0, np.nan)
+    temp_sr = temp_sr.interpolate(limit=60, limit_direction="backward")
+    temp_sr = temp_sr.replace(np.nan, 0)
+    temp_sr = temp_sr.replace(1, np.nan)
+    temp_sr = temp_sr.dropna()
+    valid_index = temp_sr.index
+
+    close_sr = df[1].resample("10s").agg("last")
+    close_sr = close_sr.reindex(valid_index)
+    close_sr = close_sr.fillna(method="ffill")
+    close_sr = close_sr.astype(np.float32)
+    close_sr.name = (symbol, "Close")
+
+    open_sr = df[1].resample("10s").agg("first")
+    open_sr = open_sr.reindex(valid_index)
+    open_sr = open_sr.fillna(value=close_sr)
+    open_sr = open_sr.astype(np.float32)
+    open_sr.name = (symbol, "Open")
+
+    high_sr = df[1].resample("10s").agg("max")
+    high_sr = high_sr.reindex(valid_index)
+    high_sr = high_sr.fillna(value=close_sr)
+    high_sr = high_sr.astype(np.float32)
+    high_sr.name = (symbol, "High")
+
+    low_sr = df[1].resample("10s").agg("min")
+    low_sr = low_sr.reindex(valid_index)
+    low_sr = low_sr.fillna(value=close_sr)
+    low_sr = low_sr.astype(np.float32)
+    low_sr.name = (symbol, "Low")
+
+    volume_sr = df[2].resample("10s").agg("sum")
+    volume_sr = volume_sr.reindex(valid_index)
+    volume_sr = volume_sr.fillna(value=0)
+    volume_sr = volume_sr.astype(np.float32)
+    volume_sr.name = (symbol, "Volume")
+
+    series_list = [open_sr, high_sr, low_sr, close_sr, volume_sr]
+    return pd.concat(series_list, axis="columns")
+
+
+def _write_archive(archive_path: str, seed: int, has_header: bool) -> int:
+    # Quiet periods both shorter and longer than the filled limit are included
+    generator = random.Random(seed)
+    lines = [CSV_HEADER] if has_header else []
+    trade_time = START_TIMESTAMP + generator.randint(0, 9999)
+    price = 100.0
+    for aggtrade_id in range(5000):
+        if generator.random() < 0.01:
+            trade_time += generator.choice((590_000, 600_000, 610_000, 3_000_000))
+        trade_time += generator.randint(0, 4000)
+        price += generator.uniform(-0.05, 0.05)
+        quantity = generator.uniform(0.001, 2)
+        lines.append(
+            f"{aggtrade_id},{price:.2f},{quantity:.3f},"
+            + f"{aggtrade_id},{aggtrade_id},{trade_time},true\n"
+        )
+    with zipfile.ZipFile(archive_path, "w") as zipped_archive:
+        zipped_archive.writestr("BTCUSDT-aggTrades.csv", "".join(lines))
+    return 5000
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("has_header", [False, True])
+@pytest.mark.parametrize("chunk_size", [10**6, 777])
+def test_candles_match_the_previous_implementation(
+    tmp_path, monkeypatch, seed, has_header, chunk_size
+):
+    # Small chunks make blocks span across them
+    monkeypatch.setattr(download_aggtrade_data, "CHUNK_SIZE", chunk_size)
+    cachepath = str(tmp_path)
+    trade_count = _write_archive(f"{cachepath}/checksum.zip", seed, has_header)
+    download_target = DownloadPreset("BTCUSDT", "daily", 2024, 1, 1)
+
+    new_df, parsed_count = download_aggtrade_data.do(
+        download_target, cachepath, "checksum"
+    )
+    expected = _read_candles_before(f"{cachepath}/checksum.zip", "BTCUSDT")
+
+    assert parsed_count == trade_count
+    assert len(new_df) < len(
+        pd.date_range(new_df.index[0], new_df.index[-1], freq="10s")
+    )
+    pd.testing.assert_frame_equal(new_df, expected, check_freq=False)
+
+
+def test_candles_are_cached_by_checksum(tmp_path):
+    cachepath = str(tmp_path)
+    _write_archive(f"{cachepath}/checksum.zip", 0, True)
+    download_target = DownloadPreset("BTCUSDT", "daily", 2024, 1, 1)
+
+    new_df, _ = download_aggtrade_data.do(download_target, cachepath, "checksum")
+    os.remove(f"{cachepath}/checksum.zip")
+    cached_df, parsed_count = download_aggtrade_data.do(
+        download_target, cachepath, "checksum"
+    )
+    assert parsed_count == 0
+    pd.testing.assert_frame_equal(cached_df, new_df)
+
+
+def test_empty_archive_has_no_candles(tmp_path):
+    cachepath = str(tmp_path)
+    with zipfile.ZipFile(f"{cachepath}/checksum.zip", "w") as zipped_archive:
+        zipped_archive.writestr("BTCUSDT-aggTrades.csv", CSV_HEADER)
+    download_target = DownloadPreset("BTCUSDT", "monthly", 2024, 1)
+    new_df, parsed_count = download_aggtrade_data.do(
+        download_target, cachepath, "checksum"
+    )
+    assert new_df is None
+    assert parsed_count == 0
+    assert not os.path.isfile(f"{cachepath}/checksum.pickle")
+
+
+def test_url_follows_the_unit_size():
+    daily_url = download_aggtrade_data.get_url(
+        DownloadPreset("BTCUSDT", "daily", 2024, 3, 9)
+    )
+    assert daily_url.endswith(
+        "/daily/aggTrades/BTCUSDT/BTCUSDT-aggTrades-2024-03-09.zip"
+    )
+    monthly_url = download_aggtrade_data.get_url(
+        DownloadPreset("BTCUSDT", "monthly", 2024, 3)
+    )
+    assert monthly_url.endswith(
+        "/monthly/aggTrades/BTCUSDT/BTCUSDT-aggTrades-2024-03.zip"
+    )
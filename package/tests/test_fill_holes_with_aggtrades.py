@@ -0,0 +1,145 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from solie.utility import fill_holes_with_aggtrades
+
+START_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+FILL_FROM = START_TIME + timedelta(seconds=60)
+FILL_UNTIL = START_TIME + timedelta(seconds=600)
+
+
+def _fill_holes_before(
+    symbol: str,
+    recent_candle_data: pd.DataFrame,
+    aggtrades: dict[int, dict],
+    moment_to_fill_from: datetime,
+    last_fetched_time: datetime,
+) -> pd.DataFrame:
+    # The implementation that the vectorized one replaced, as the reference
+    fill_moment = moment_to_fill_from
+
+    while fill_moment < last_fetched_time - timedelta(seconds=10):
+        block_start = fill_moment
+        block_end = fill_moment + timedelta(seconds=10)
+
+        aggtrade_prices = []
+        aggtrade_volumes = []
+        for _, aggtrade in sorted(aggtrades.items()):
+            aggtrade_time = datetime.fromtimestamp(
+                aggtrade["T"] / 1000, tz=timezone.utc
+            )
+            if block_start <= aggtrade_time < block_end:
+                aggtrade_prices.append(float(aggtrade["p"]))
+                aggtrade_volumes.append(float(aggtrade["q"]))
+
+        can_write = True
+
+        if len(aggtrade_prices) == 0:
+            inspect_sr = recent_candle_data[(symbol, "Close")]
+            inspect_sr = inspect_sr.sort_index()
+            last_prices = inspect_sr[:fill_moment].dropna()
+            if len(last_prices) == 0:
+                can_write = False
+                last_price = 0
+            else:
+                last_price = last_prices.iloc[-1]
+            open_price = last_price
+            high_price = last_price
+            low_price = last_price
+            close_price = last_price
+            sum_volume = 0
+        else:
+            open_price = aggtrade_prices[0]
+            high_price = max(aggtrade_prices)
+            low_price = min(aggtrade_prices)
+            close_price = aggtrade_prices[-1]
+            sum_volume = sum(aggtrade_volumes)
+
+        if can_write:
+            recent_candle_data.loc[fill_moment, (symbol, "Open")] = open_price
+            recent_candle_data.loc[fill_moment, (symbol, "High")] = high_price
+            recent_candle_data.loc[fill_moment, (symbol, "Low")] = low_price
+            recent_candle_data.loc[fill_moment, (symbol, "Close")] = close_price
+            recent_candle_data.loc[fill_moment, (symbol, "Volume")] = sum_volume
+
+        fill_moment += timedelta(seconds=10)
+
+    recent_candle_data = recent_candle_data.sort_index(axis="index")
+    recent_candle_data = recent_candle_data.sort_index(axis="columns")
+
+    return recent_candle_data
+
+
+def _make_aggtrades(seed: int) -> dict[int, dict]:
+    # Trades are clustered so that some blocks are left without any
+    generator = random.Random(seed)
+    fill_from = int(FILL_FROM.timestamp() * 1000)
+    aggtrades = {}
+    aggtrade_id = 1000
+    trade_time = fill_from - 15000
+    price = 100.0
+    while trade_time < fill_from + 600_000:
+        if generator.random() < 0.1:
+            trade_time += generator.randint(10000, 60000)
+        trade_time += generator.randint(0, 3000)
+        price += generator.uniform(-0.5, 0.5)
+        aggtrades[aggtrade_id] = {
+            "T": trade_time,
+            "p": f"{price:.2f}",
+            "q": f"{generator.uniform(0.001, 2):.3f}",
+        }
+        aggtrade_id += 1
+    return aggtrades
+
+
+def _make_recent_candle_data(last_price: float) -> pd.DataFrame:
+    columns = pd.MultiIndex.from_product(
+        [["BTCUSDT"], ("Close", "High", "Low", "Open", "Volume")]
+    )
+    index = pd.DatetimeIndex([START_TIME + timedelta(seconds=30)])
+    return pd.DataFrame(last_price, index=index, columns=columns, dtype=np.float32)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("last_price", [90.0, np.nan])
+def test_candles_match_the_previous_implementation(seed, last_price):
+    aggtrades = _make_aggtrades(seed)
+    expected = _fill_holes_before(
+        "BTCUSDT",
+        _make_recent_candle_data(last_price),
+        aggtrades,
+        FILL_FROM,
+        FILL_UNTIL + timedelta(seconds=10, milliseconds=1),
+    )
+    expected = expected[FILL_FROM:FILL_UNTIL].dropna()
+
+    filled = fill_holes_with_aggtrades.do(
+        "BTCUSDT", aggtrades, FILL_FROM, FILL_UNTIL, last_price
+    )
+    filled = filled.sort_index(axis="columns")
+
+    assert len(filled) > 0
+    pd.testing.assert_index_equal(filled.index, expected.index, exact=False)
+    pd.testing.assert_index_equal(filled.columns, expected.columns)
+    np.testing.assert_allclose(
+        filled.to_numpy(), expected.to_numpy(np.float32), rtol=1e-6
+    )
+
+
+def test_trades_outside_the_range_are_ignored():
+    aggtrades = {
+        1: {"T": int(FILL_FROM.timestamp() * 1000) - 1, "p": "1", "q": "1"},
+        2: {"T": int(FILL_FROM.timestamp() * 1000), "p": "2", "q": "1"},
+        3: {"T": int(FILL_UNTIL.timestamp() * 1000) + 10000, "p": "3", "q": "1"},
+    }
+    filled = fill_holes_with_aggtrades.do(
+        "BTCUSDT", aggtrades, FILL_FROM, FILL_UNTIL, 5
+    )
+    assert len(filled) == 55
+    assert filled[("BTCUSDT", "Open")].iloc[0] == 2
+    assert filled[("BTCUSDT", "Close")].iloc[-1] == 2
+    assert filled[("BTCUSDT", "Volume")].sum() == 1
@@ -0,0 +1,293 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from solie.utility import prepare_lines, standardize
+
+START_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+
+
+def _assert_lines_equal(lines: dict, expected_lines: dict):
+    assert lines.keys() == expected_lines.keys()
+    for line_name, line_datas in lines.items():
+        expected_datas = expected_lines[line_name]
+        assert len(line_datas) == len(expected_datas)
+        for line_data, expected_data in zip(line_datas, expected_datas):
+            assert len(line_data) == len(expected_data)
+            for values, expected_values in zip(line_data, expected_data):
+                if isinstance(values, str):
+                    assert values == expected_values
+                else:
+                    np.testing.assert_allclose(values, expected_values, rtol=1e-6)
+
+
+# ■■■■■ candle data ■■■■■
+
+
+def _make_candle_data(row_count: int) -> pd.DataFrame:
+    generator = np.random.default_rng(0)
+    index = pd.date_range(START_TIME, periods=row_count, freq="10S")
+    columns = pd.MultiIndex.from_product(
+        [SYMBOLS, ("Open", "High", "Low", "Close", "Volume")]
+    )
+    values = generator.uniform(1, 100, (row_count, len(columns)))
+    values[generator.random(values.shape) < 0.1] = np.nan
+    return pd.DataFrame(values, index=index, columns=columns, dtype=np.float32)
+
+
+@pytest.mark.parametrize(
+    "slice_from, slice_until",
+    [
+        (START_TIME, None),
+        (START_TIME + timedelta(seconds=95), None),
+        (START_TIME + timedelta(seconds=100), START_TIME + timedelta(seconds=555)),
+        (START_TIME - timedelta(days=1), START_TIME + timedelta(days=1)),
+    ],
+)
+def test_picked_candle_data_matches_slicing(slice_from, slice_until):
+    candle_data = _make_candle_data(100)
+    picked_data = prepare_lines.pick_candle_data(
+        candle_data, "ETHUSDT", slice_from, slice_until
+    )
+
+    # How the charts sliced candle data and added the right end before
+    expected = candle_data[slice_from:slice_until][["ETHUSDT"]]
+    new_moment = expected.index[-1] + timedelta(seconds=10)
+    expected = expected.reindex(expected.index.union([new_moment]))
+    pd.testing.assert_frame_equal(picked_data, expected, check_freq=False)
+
+
+def test_nothing_is_picked_outside_candle_data():
+    candle_data = _make_candle_data(100)
+    picked_data = prepare_lines.pick_candle_data(
+        candle_data, "ETHUSDT", START_TIME + timedelta(days=1), None
+    )
+    assert len(picked_data) == 0
+    assert list(picked_data.columns.get_level_values(0).unique()) == ["ETHUSDT"]
+
+
+# ■■■■■ realtime data ■■■■■
+
+
+def _make_recarray(field_names: list[str], row_count: int) -> np.recarray:
+    generator = np.random.default_rng(1)
+    dtype = [("index", "datetime64[ns]")]
+    dtype += [(str((s, f)), np.float32) for s in SYMBOLS for f in field_names]
+    recarray = np.rec.array(np.zeros(row_count, dtype=dtype))
+    recarray["index"] = np.datetime64(START_TIME.replace(tzinfo=None)) + np.arange(
+        row_count
+    ) * np.timedelta64(100, "ms")
+    for name, _ in dtype[1:]:
+        values = generator.uniform(1, 100, row_count)
+        # Zeros are slots that haven't received anything
+        values[generator.random(row_count) < 0.3] = 0
+        recarray[name] = values
+    return recarray
+
+
+def _light_lines_before(realtime_data, aggregate_trades, symbol: str) -> dict:
+    # How the transaction chart drew light lines before, as the reference
+    lines = {}
+    data_x = realtime_data["index"].astype(np.int64) / 10**9
+    data_y = realtime_data[str((symbol, "Mark Price"))]
+    mask = data_y != 0
+    lines["mark_price"] = [(data_x[mask], data_y[mask])]
+
+    data_x = aggregate_trades["index"].astype(np.int64) / 10**9
+    data_y = aggregate_trades[str((symbol, "Price"))]
+    mask = data_y != 0
+    lines["last_price"] = [(data_x[mask], data_y[mask])]
+
+    index_ar = aggregate_trades["index"].astype(np.int64) / 10**9
+    value_ar = aggregate_trades[str((symbol, "Volume"))]
+    mask = value_ar != 0
+    index_ar = index_ar[mask]
+    value_ar = value_ar[mask]
+    length = len(index_ar)
+    zero_ar = np.zeros(length)
+    nan_ar = np.empty(length)
+    nan_ar[:] = np.nan
+    data_x = np.repeat(index_ar, 3)
+    data_y = np.stack([nan_ar, zero_ar, value_ar], axis=1).reshape(-1)
+    lines["last_volume"] = [(data_x, data_y)]
+
+    lines["book_tickers"] = []
+    for field_name in ("Best Bid Price", "Best Ask Price"):
+        data_x = realtime_data["index"].astype(np.int64) / 10**9
+        data_y = realtime_data[str((symbol, field_name))]
+        mask = data_y != 0
+        lines["book_tickers"].append((data_x[mask], data_y[mask]))
+    return lines
+
+
+def test_light_lines_match_the_previous_drawing():
+    realtime_data = _make_recarray(
+        ["Best Bid Price", "Best Ask Price", "Mark Price"], 1000
+    )
+    aggregate_trades = _make_recarray(["Price", "Volume"], 500)
+    lines = prepare_lines.light_lines(realtime_data, aggregate_trades, "ETHUSDT")
+    expected_lines = _light_lines_before(realtime_data, aggregate_trades, "ETHUSDT")
+    _assert_lines_equal(lines, expected_lines)
+
+
+# ■■■■■ asset record ■■■■■
+
+
+def _make_asset_record(row_count: int) -> pd.DataFrame:
+    generator = np.random.default_rng(2)
+    asset_record = standardize.asset_record()
+    milliseconds = np.sort(generator.choice(10**7, row_count, replace=False))
+    for millisecond in milliseconds:
+        record_time = START_TIME + timedelta(milliseconds=int(millisecond))
+        asset_record.loc[record_time, "Cause"] = "auto_trade"
+        asset_record.loc[record_time, "Symbol"] = generator.choice(SYMBOLS)
+        asset_record.loc[record_time, "Side"] = generator.choice(["buy", "sell"])
+        asset_record.loc[record_time, "Fill Price"] = generator.uniform(1, 100)
+        asset_record.loc[record_time, "Result Asset"] = generator.uniform(900, 1100)
+    return asset_record
+
+
+def _make_unrealized_changes(asset_record: pd.DataFrame) -> pd.Series:
+    generator = np.random.default_rng(3)
+    index = pd.date_range(
+        asset_record.index[0].floor("10S"),
+        asset_record.index[-1].floor("10S"),
+        freq="10S",
+    )
+    index = index[generator.random(len(index)) > 0.1]
+    values = generator.uniform(-0.01, 0.01, len(index))
+    return pd.Series(values, index=index, dtype=np.float32)
+
+
+def _asset_lines_before(asset_record, unrealized_changes, symbol: str) -> dict:
+    # How the charts drew the asset record before, as the reference
+    lines = {}
+    data_x = asset_record["Result Asset"].index.to_numpy(dtype=np.int64) / 10**9
+    data_y = asset_record["Result Asset"].to_numpy(dtype=np.float32)
+    lines["asset"] = [(data_x, data_y)]
+
+    sr = asset_record["Result Asset"]
+    if len(sr) >= 2:
+        sr = sr.resample("10S").ffill()
+    unrealized_changes_sr = unrealized_changes.reindex(sr.index)
+    sr = sr * (1 + unrealized_changes_sr)
+    data_x = sr.index.to_numpy(dtype=np.int64) / 10**9 + 5
+    data_y = sr.to_numpy(dtype=np.float32)
+    lines["asset_with_unrealized_profit"] = [(data_x, data_y)]
+
+    for side in ("sell", "buy"):
+        df = asset_record.loc[asset_record["Symbol"] == symbol]
+        df = df[df["Side"] == side]
+        sr = df["Fill Price"]
+        data_x = sr.index.to_numpy(dtype=np.int64) / 10**9
+        data_y = sr.to_numpy(dtype=np.float32)
+        lines[side] = [(data_x, data_y)]
+    return lines
+
+
+@pytest.mark.parametrize("row_count", [0, 1, 2, 300])
+def test_asset_lines_match_the_previous_drawing(row_count):
+    asset_record = _make_asset_record(row_count)
+    if row_count > 0:
+        unrealized_changes = _make_unrealized_changes(asset_record)
+    else:
+        unrealized_changes = standardize.unrealized_changes()
+    lines = prepare_lines.asset_lines(asset_record, unrealized_changes, "BTCUSDT")
+    expected_lines = _asset_lines_before(asset_record, unrealized_changes, "BTCUSDT")
+    _assert_lines_equal(lines, expected_lines)
+
+
+def test_asset_lines_can_be_redrawn_from_the_middle():
+    asset_record = _make_asset_record(300)
+    unrealized_changes = _make_unrealized_changes(asset_record)
+    full_lines = prepare_lines.asset_lines(asset_record, unrealized_changes, "ETHUSDT")
+    redraw_from = START_TIME + timedelta(hours=1)
+    lines = prepare_lines.asset_lines(
+        asset_record, unrealized_changes, "ETHUSDT", redraw_from
+    )
+
+    full_x, full_y = full_lines["asset_with_unrealized_profit"][0]
+    data_x, data_y = lines["asset_with_unrealized_profit"][0]
+    is_redrawn = full_x >= redraw_from.timestamp()
+    np.testing.assert_array_equal(data_x, full_x[is_redrawn])
+    np.testing.assert_array_equal(data_y, full_y[is_redrawn])
+
+
+def _complete_asset_record_before(
+    asset_record, slice_from, last_asset, before_asset, observed_until
+) -> pd.DataFrame:
+    # How the charts added both ends of the asset record before
+    if last_asset is not None:
+        if len(asset_record) == 0 or asset_record.index[-1] < observed_until:
+            if slice_from < observed_until:
+                asset_record.loc[observed_until, "Cause"] = "other"
+                asset_record.loc[observed_until, "Result Asset"] = last_asset
+                if not asset_record.index.is_monotonic_increasing:
+                    asset_record = asset_record.sort_index()
+    if before_asset is not None:
+        asset_record.loc[slice_from, "Cause"] = "other"
+        asset_record.loc[slice_from, "Result Asset"] = before_asset
+        if not asset_record.index.is_monotonic_increasing:
+            asset_record = asset_record.sort_index()
+    return asset_record
+
+
+@pytest.mark.parametrize("last_asset", [None, 1234.0])
+@pytest.mark.parametrize("before_asset", [None, 999.0])
+@pytest.mark.parametrize("observed_hours", [-1, 1, 10])
+def test_completed_asset_record_matches_the_previous_one(
+    last_asset, before_asset, observed_hours
+):
+    full_record = _make_asset_record(50)
+    slice_from = START_TIME + timedelta(minutes=30)
+    asset_record = full_record[slice_from:]
+    observed_until = START_TIME + timedelta(hours=observed_hours)
+    completed_record = prepare_lines.complete_asset_record(
+        asset_record.copy(), slice_from, last_asset, before_asset, observed_until
+    )
+    expected = _complete_asset_record_before(
+        asset_record.copy(), slice_from, last_asset, before_asset, observed_until
+    )
+    pd.testing.assert_frame_equal(completed_record, expected)
+
+
+# ■■■■■ indicators ■■■■■
+
+
+def test_indicator_lines_match_the_previous_drawing():
+    index = pd.date_range(START_TIME, periods=50, freq="10S")
+    column_names = [
+        ("BTCUSDT", "Price", "SMA (#FF0000)"),
+        ("BTCUSDT", "Price", "Blank"),
+        ("BTCUSDT", "Volume", "Volume SMA (#00FF00)"),
+        ("BTCUSDT", "Abstract", "RSI"),
+        ("ETHUSDT", "Price", "SMA (#0000FF)"),
+    ]
+    generator = np.random.default_rng(4)
+    indicators = pd.DataFrame(
+        generator.uniform(1, 100, (len(index), len(column_names))),
+        index=index,
+        columns=pd.MultiIndex.from_tuples(column_names),
+    )
+    lines = prepare_lines.indicator_lines(indicators, "BTCUSDT")
+
+    expected_lines = {}
+    for category, line_name in (
+        ("Price", "price_indicators"),
+        ("Volume", "volume_indicators"),
+        ("Abstract", "abstract_indicators"),
+    ):
+        df = indicators["BTCUSDT"][category]
+        data_x = df.index.to_numpy(dtype=np.int64) / 10**9 + 5
+        expected_lines[line_name] = []
+        for column_name in df.columns:
+            inside_strings = re.findall(r"\(([^)]+)", column_name)
+            color = "#AAAAAA" if len(inside_strings) == 0 else inside_strings[0]
+            data_y = df[column_name].to_numpy(dtype=np.float32)
+            expected_lines[line_name].append((color, data_x, data_y))
+    _assert_lines_equal(lines, expected_lines)
+    assert [line[0] for line in lines["price_indicators"]] == ["#FF0000", "#AAAAAA"]
@@ -0,0 +1,208 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from solie.definition.account_ledger import AccountLedger
+from solie.definition.record_journal import RecordJournal
+from solie.utility import fold_journal, standardize
+
+START_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_records_are_replayed_in_order(tmp_path):
+    filepath = str(tmp_path / "journal.pickle")
+
+    async def write_and_replay() -> list[tuple]:
+        record_journal = RecordJournal(filepath, batch_seconds=0)
+        for turn in range(3):
+            record_journal.append(("unrealized_change", turn, turn * 0.1))
+        await record_journal.flush()
+        record_journal.append(("scribbles", {"memo": "hi"}))
+        await record_journal.flush()
+        return await RecordJournal(filepath).replay()
+
+    assert asyncio.run(write_and_replay()) == [
+        ("unrealized_change", 0, 0.0),
+        ("unrealized_change", 1, 0.1),
+        ("unrealized_change", 2, 0.2),
+        ("scribbles", {"memo": "hi"}),
+    ]
+
+
+def test_records_are_flushed_after_the_batch(tmp_path):
+    filepath = str(tmp_path / "journal.pickle")
+
+    async def append_and_wait():
+        record_journal = RecordJournal(filepath, batch_seconds=0.01)
+        record_journal.append(("scribbles", {}))
+        assert not os.path.isfile(filepath)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(append_and_wait())
+    assert asyncio.run(RecordJournal(filepath).replay()) == [("scribbles", {})]
+
+
+def test_torn_record_is_truncated(tmp_path):
+    filepath = str(tmp_path / "journal.pickle")
+
+    async def write_tear_and_continue() -> list[tuple]:
+        record_journal = RecordJournal(filepath)
+        record_journal.append(("unrealized_change", 0, 0.0))
+        await record_journal.flush()
+        intact_size = os.path.getsize(filepath)
+        record_journal.append(("unrealized_change", 1, 0.1))
+        await record_journal.flush()
+        os.truncate(filepath, intact_size + 5)
+
+        records = await record_journal.replay()
+        assert records == [("unrealized_change", 0, 0.0)]
+        assert os.path.getsize(filepath) == intact_size
+
+        # Records appended after the tear aren't hidden by it
+        record_journal.append(("unrealized_change", 2, 0.2))
+        await record_journal.flush()
+        return await record_journal.replay()
+
+    assert asyncio.run(write_tear_and_continue()) == [
+        ("unrealized_change", 0, 0.0),
+        ("unrealized_change", 2, 0.2),
+    ]
+
+
+def test_rotated_records_are_kept_until_removed(tmp_path):
+    filepath = str(tmp_path / "journal.pickle")
+
+    async def rotate_twice() -> list[tuple]:
+        record_journal = RecordJournal(filepath)
+        for turn in range(3):
+            record_journal.append(("unrealized_change", turn, 0.0))
+            await record_journal.flush()
+            # The snapshot that would remove the rotated file never finishes
+            await record_journal.rotate()
+        record_journal.append(("unrealized_change", 3, 0.0))
+        await record_journal.flush()
+        return await record_journal.replay()
+
+    records = asyncio.run(rotate_twice())
+    assert [record[1] for record in records] == [0, 1, 2, 3]
+
+    RecordJournal(filepath).remove_rotated()
+    records = asyncio.run(RecordJournal(filepath).replay())
+    assert [record[1] for record in records] == [3]
+
+
+# ■■■■■ crash and replay ■■■■■
+
+# Fills as the transactor receives them, with an order filled in two parts
+FILLS = [
+    (START_TIME + timedelta(seconds=1), "BTCUSDT", 1, "BUY", 100.0, False, 0.1, -0.5),
+    (START_TIME + timedelta(seconds=2), "BTCUSDT", 1, "BUY", 100.0, False, 0.2, -1.0),
+    (START_TIME + timedelta(seconds=3), "ETHUSDT", 2, "SELL", 10.0, True, 0.3, 2.0),
+    (START_TIME + timedelta(seconds=4), "BTCUSDT", 3, "SELL", 110.0, True, 0.4, 30.0),
+    (START_TIME + timedelta(seconds=5), "ETHUSDT", 2, "SELL", 10.0, True, 0.1, 1.0),
+]
+# Account ledger is flushed after these fills
+FLUSHED_AFTER = {1, 3}
+
+
+def _make_snapshot() -> pd.DataFrame:
+    asset_record = standardize.asset_record()
+    asset_record.loc[START_TIME, "Cause"] = "other"
+    asset_record.loc[START_TIME, "Result Asset"] = 1000.0
+    return asset_record
+
+
+def _flush_ledger(
+    account_ledger: AccountLedger,
+    asset_record: pd.DataFrame,
+    record_journal: RecordJournal,
+) -> pd.DataFrame:
+    # Same as how the transactor flushes its account ledger
+    asset_record, changed_times = account_ledger.flush_fills(asset_record)
+    asset_rows = []
+    for changed_time in changed_times:
+        asset_rows.append((changed_time, asset_record.loc[changed_time].to_dict()))
+    record_journal.append(("fills_flushed", asset_rows))
+    return asset_record.sort_index()
+
+
+async def _run_session(filepath: str) -> tuple[pd.DataFrame, list[int]]:
+    # Sizes of the journal after each record are returned
+    # so that it can be cut anywhere between or inside them
+    record_journal = RecordJournal(filepath)
+    account_ledger = AccountLedger()
+    asset_record = _make_snapshot()
+    account_ledger.rebuild(pd.DataFrame(columns=["Symbol", "Order ID"]), asset_record)
+    record_sizes = []
+    for turn, fill in enumerate(FILLS):
+        account_ledger.add_fill(*fill)
+        record_journal.append(("fill", *fill))
+        await record_journal.flush()
+        record_sizes.append(os.path.getsize(filepath))
+        if turn in FLUSHED_AFTER:
+            asset_record = _flush_ledger(account_ledger, asset_record, record_journal)
+            await record_journal.flush()
+            record_sizes.append(os.path.getsize(filepath))
+    asset_record = _flush_ledger(account_ledger, asset_record, record_journal)
+    return asset_record, record_sizes
+
+
+async def _recover(filepath: str) -> pd.DataFrame:
+    # Same as how the transactor recovers from its snapshot and journal
+    record_journal = RecordJournal(filepath)
+    folded = fold_journal.do(await record_journal.replay())
+    asset_record = _make_snapshot()
+    asset_rows = folded["asset_rows"]
+    if len(asset_rows) > 0:
+        new_df = pd.DataFrame.from_dict(asset_rows, orient="index")
+        new_df = new_df.reindex(columns=asset_record.columns)
+        new_df.index = pd.DatetimeIndex(new_df.index)
+        kept_data = asset_record.drop(new_df.index, errors="ignore")
+        asset_record = pd.concat([kept_data, new_df]).sort_index()
+    account_ledger = AccountLedger()
+    account_ledger.rebuild(pd.DataFrame(columns=["Symbol", "Order ID"]), asset_record)
+    for unflushed_fill in folded["unflushed_fills"]:
+        account_ledger.add_fill(*unflushed_fill)
+    return _flush_ledger(account_ledger, asset_record, record_journal)
+
+
+def test_journal_survives_a_crash_anywhere(tmp_path):
+    filepath = str(tmp_path / "journal.pickle")
+    full_asset_record, record_sizes = asyncio.run(_run_session(filepath))
+    with open(filepath, "rb") as file:
+        content = file.read()
+
+    fill_sizes = []
+    turn = 0
+    for fill_turn in range(len(FILLS)):
+        fill_sizes.append(record_sizes[turn])
+        turn += 2 if fill_turn in FLUSHED_AFTER else 1
+
+    previous_size = 0
+    for record_size in record_sizes:
+        for cut_size in (record_size, (previous_size + record_size) // 2):
+            with open(filepath, "wb") as file:
+                file.write(content[:cut_size])
+            asset_record = asyncio.run(_recover(filepath))
+
+            fill_count = sum(size <= cut_size for size in fill_sizes)
+            survived_fills = FILLS[:fill_count]
+            revenue = sum(fill[7] for fill in survived_fills)
+            order_ids = {fill[2] for fill in survived_fills}
+            assert len(asset_record) == 1 + len(order_ids)
+            last_asset = asset_record["Result Asset"].iloc[-1]
+            assert last_asset == pytest.approx(1000.0 + revenue)
+            for order_id in order_ids:
+                order_rows = asset_record[asset_record["Order ID"] == order_id]
+                margin_ratio = sum(f[6] for f in survived_fills if f[2] == order_id)
+                assert order_rows["Margin Ratio"].sum() == pytest.approx(margin_ratio)
+        previous_size = record_size
+
+    # Without a crash, recovering gives the same record as the session
+    with open(filepath, "wb") as file:
+        file.write(content)
+    asset_record = asyncio.run(_recover(filepath))
+    pd.testing.assert_frame_equal(asset_record, full_asset_record)
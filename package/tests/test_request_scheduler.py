@@ -0,0 +1,190 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from solie.definition import request_scheduler
+from solie.definition.api_requester import ApiRequester
+from solie.definition.request_scheduler import RequestScheduler
+from solie.utility import clock
+
+from .stand_in_binance import StandInBinance
+
+
+class _FakeClock:
+    # Sleeping advances the clock instead of waiting
+    def __init__(self, now: float):
+        self.now = now
+        self.slept: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock(monkeypatch) -> _FakeClock:
+    fake_clock = _FakeClock(600.0)
+    monkeypatch.setattr(
+        request_scheduler, "time", SimpleNamespace(time=fake_clock.time)
+    )
+    monkeypatch.setattr(
+        request_scheduler, "asyncio", SimpleNamespace(sleep=fake_clock.sleep)
+    )
+    return fake_clock
+
+
+def test_requests_within_the_limit_dont_wait(fake_clock):
+    scheduler = RequestScheduler()
+    for _ in range(100):
+        asyncio.run(scheduler.acquire("GET", "/fapi/v2/account", "account"))
+    assert fake_clock.slept == []
+    assert scheduler.weight_buckets["1M"].used == 500
+
+
+def test_request_waits_for_the_next_window(fake_clock):
+    scheduler = RequestScheduler()
+    fake_clock.now = 615.0
+    scheduler.weight_buckets["1M"].observe(fake_clock.now, 2400 * 0.75)
+    asyncio.run(scheduler.acquire("GET", "/fapi/v1/aggTrades", "backfill"))
+    assert fake_clock.slept == [45.0]
+    assert scheduler.weight_buckets["1M"].used == 20
+
+
+def test_priority_classes_keep_room_for_the_ones_above(fake_clock):
+    scheduler = RequestScheduler()
+    scheduler.weight_buckets["1M"].observe(fake_clock.now, 2400 * 0.75)
+    # Account requests may still use the share that backfill can't
+    asyncio.run(scheduler.acquire("GET", "/fapi/v2/account", "account"))
+    assert fake_clock.slept == []
+    scheduler.weight_buckets["1M"].observe(fake_clock.now, 2400)
+    # Orders are never delayed, even past the limit
+    asyncio.run(scheduler.acquire("POST", "/fapi/v1/batchOrders", "order"))
+    assert fake_clock.slept == []
+    assert scheduler.weight_buckets["1M"].used == 2405
+    assert scheduler.order_buckets["10S"].used == 5
+
+
+def test_requests_without_orders_ignore_full_order_buckets(fake_clock):
+    scheduler = RequestScheduler()
+    scheduler.order_buckets["10S"].observe(fake_clock.now, 300)
+    asyncio.run(scheduler.acquire("GET", "/fapi/v1/openOrders", "account"))
+    assert fake_clock.slept == []
+    assert scheduler.order_buckets["10S"].used == 300
+
+
+def test_usage_reported_by_the_server_is_observed(fake_clock):
+    scheduler = RequestScheduler()
+    asyncio.run(scheduler.acquire("GET", "/fapi/v2/account", "account"))
+    scheduler.observe({"x-mbx-used-weight-1m": "1200", "X-MBX-ORDER-COUNT-10S": "7"})
+    assert scheduler.weight_buckets["1M"].used == 1200
+    assert scheduler.order_buckets["10S"].used == 7
+    # Lower counts don't hide requests that the server hasn't counted yet
+    scheduler.observe({"X-MBX-USED-WEIGHT-1M": "3"})
+    assert scheduler.weight_buckets["1M"].used == 1200
+
+    scheduler.observe_rate_limits(
+        [
+            {
+                "rateLimitType": "REQUEST_WEIGHT",
+                "interval": "MINUTE",
+                "intervalNum": 1,
+                "limit": 2400,
+                "count": 1500,
+            },
+            {
+                "rateLimitType": "ORDERS",
+                "interval": "SECOND",
+                "intervalNum": 10,
+                "limit": 300,
+                "count": 9,
+            },
+        ]
+    )
+    assert scheduler.weight_buckets["1M"].used == 1500
+    assert scheduler.order_buckets["10S"].used == 9
+
+
+def test_usage_is_forgotten_in_a_new_window(fake_clock):
+    scheduler = RequestScheduler()
+    scheduler.observe({"X-MBX-USED-WEIGHT-1M": "2000"})
+    fake_clock.now += 60
+    asyncio.run(scheduler.acquire("GET", "/fapi/v2/account", "account"))
+    assert scheduler.weight_buckets["1M"].used == 5
+
+
+def test_updated_limits_keep_current_usage(fake_clock):
+    scheduler = RequestScheduler()
+    scheduler.observe({"X-MBX-USED-WEIGHT-1M": "100"})
+    scheduler.update_limits(
+        [
+            {
+                "rateLimitType": "REQUEST_WEIGHT",
+                "interval": "MINUTE",
+                "intervalNum": 1,
+                "limit": 6000,
+            },
+            {
+                "rateLimitType": "ORDERS",
+                "interval": "MINUTE",
+                "intervalNum": 1,
+                "limit": 2400,
+            },
+            {
+                "rateLimitType": "RAW_REQUESTS",
+                "interval": "MINUTE",
+                "intervalNum": 5,
+                "limit": 61000,
+            },
+        ]
+    )
+    assert scheduler.weight_buckets["1M"].limit == 6000
+    assert scheduler.weight_buckets["1M"].used == 100
+    assert list(scheduler.order_buckets) == ["1M"]
+    assert scheduler.order_buckets["1M"].limit == 2400
+
+
+def test_priority_is_guessed_from_the_path():
+    scheduler = RequestScheduler()
+    assert scheduler.guess_priority("DELETE", "/fapi/v1/allOpenOrders") == "order"
+    assert scheduler.guess_priority("GET", "/fapi/v1/aggTrades") == "backfill"
+    assert scheduler.guess_priority("GET", "/fapi/v2/account") == "account"
+
+
+class _SlowScheduler(RequestScheduler):
+    async def acquire(self, http_method: str, path: str, priority: str):
+        await asyncio.sleep(0.2)
+
+
+async def _place_order_after_waiting() -> tuple[int, StandInBinance]:
+    server = StandInBinance()
+    await server.start()
+    api_requester = ApiRequester()
+    api_requester.futures_url = server.rest_url
+    timestamp = int(clock.now().timestamp() * 1000)
+    try:
+        await api_requester.binance(
+            http_method="POST",
+            path="/fapi/v1/order",
+            payload={
+                "timestamp": timestamp,
+                "symbol": "BTCUSDT",
+                "type": "MARKET",
+                "side": "BUY",
+                "quantity": 0.001,
+            },
+        )
+    finally:
+        await ApiRequester.close_sessions()
+        await server.stop()
+    return timestamp, server
+
+
+def test_request_is_stamped_after_waiting(monkeypatch):
+    monkeypatch.setattr(ApiRequester, "scheduler", _SlowScheduler())
+    timestamp, server = asyncio.run(_place_order_after_waiting())
+    sent_timestamp = int(server.requests[0][2]["timestamp"])
+    assert sent_timestamp >= timestamp + 200